@@ -3,6 +3,9 @@ import json
 from NGPIris.hcp import HCPHandler
 
 class HCPClient:
+    # Local SQLite index of the bucket listings, kept next to config.json
+    INDEX_PATH = "bucket_index.db"
+
     def __init__(self, credentials_path="credentials.json"):
         self.handler = None
         self.connected = False
@@ -17,7 +20,7 @@ class HCPClient:
             self.credentials_path = credentials_path
             
             # 1. Initialize NGP-Iris Handler
-            self.handler = HCPHandler(credentials_path)
+            self.handler = HCPHandler(credentials_path, index_path=self.INDEX_PATH)
             self.connected = True
             
             # 2. Extract Address (Visual Only - Does not affect connection)
@@ -45,7 +48,10 @@ class HCPClient:
         
         try:
             # DIRECT CALL: Relies on the library's implementation
-            return self.handler.list_buckets()
+            buckets = self.handler.list_buckets(
+                HCPHandler.ListBucketsOutputMode.BUCKET_ONLY
+            )
+            return [bucket["Bucket"] for bucket in buckets]
         except Exception as e:
             print(f"Error calling handler.list_buckets(): {e}")
             return []
@@ -53,41 +59,67 @@ class HCPClient:
     def fetch_files(self, bucket_name):
         if not self.handler: return []
         try:
-            self.handler.mount_bucket(bucket_name)
-            
-            # Use internal client for detailed metadata (Size, Date)
-            s3 = getattr(self.handler, 's3_client', getattr(self.handler, 'client', None))
-            if not s3: return []
+            bucket = self.handler.bucket(bucket_name)
+
+            # Sharded listing into the local index: the bucket is listed with
+            # concurrent requests and the trigram index is kept up to date for
+            # the search box
+            bucket.refresh_index(parallel=16, substring_index=True)
+            objects = bucket.bucket_index.list_objects(bucket_name)
 
             files = []
-            paginator = s3.get_paginator('list_objects_v2')
-            page_iterator = paginator.paginate(Bucket=bucket_name)
-
-            for page in page_iterator:
-                if 'Contents' not in page: continue
-                    
-                for obj in page['Contents']:
-                    raw_key = obj.get('Key', 'Unknown')
-                    
-                    if raw_key.endswith('/') or "Zone.Identifier" in raw_key:
-                        continue
-
-                    raw_size = obj.get('Size', 0)
-                    if raw_size > 1048576: s_str = f"{raw_size/1048576:.2f} MB"
-                    elif raw_size > 1024: s_str = f"{raw_size/1024:.2f} KB"
-                    else: s_str = f"{raw_size} B"
-                    
-                    ftype = raw_key.split('.')[-1].upper() if '.' in raw_key else "File"
-                    date = obj.get('LastModified', '')
-                    
-                    files.append((raw_key, s_str, ftype, str(date), raw_key, raw_size))
+            for obj in objects:
+                raw_key = obj.get('Key', 'Unknown')
+
+                if raw_key.endswith("/"):
+                    continue
+
+                if "Zone.Identifier" in raw_key:
+                    continue
+
+                raw_size = obj.get('Size', 0)
+                if raw_size > 1048576: s_str = f"{raw_size/1048576:.2f} MB"
+                elif raw_size > 1024: s_str = f"{raw_size/1024:.2f} KB"
+                else: s_str = f"{raw_size} B"
+
+                ftype = raw_key.split('.')[-1].upper() if '.' in raw_key else "File"
+                date = obj.get('LastModified', '')
+
+                files.append((raw_key, s_str, ftype, str(date), raw_key, raw_size))
 
             return files
         except Exception as e:
             print(f"Fetch error: {e}")
             return []
 
+    # The trigram index can't narrow down shorter texts than this
+    MIN_INDEX_SEARCH_LENGTH = 3
+
+    def search_keys(self, bucket_name, text):
+        """
+        Returns the keys in the local index whose file name contains `text`,
+        or None if the index can't be used (e.g. the bucket hasn't been read
+        yet, or `text` is too short for the trigram index).
+        Slow on large buckets, so it is meant to be called off the UI thread.
+        """
+        if not self.handler or not self.handler.bucket_index: return None
+        if len(text) < self.MIN_INDEX_SEARCH_LENGTH: return None
+        try:
+            bucket = self.handler.bucket(bucket_name)
+            search_text = text.lower()
+            # The index matches anywhere in the key, the search box only on
+            # the file name
+            return {
+                obj["Key"]
+                for obj in bucket.search_in_bucket(text, use_index=True)
+                if search_text in obj["Key"].rsplit("/", 1)[-1].lower()
+            }
+        except Exception as e:
+            print(f"Search error: {e}")
+            return None
+
     def download_object(self, bucket_name, file_key, destination_folder, flatten=False):
+        if not self.handler: return False
         try:
             if flatten:
                 filename = os.path.basename(file_key)
@@ -99,16 +131,17 @@ class HCPClient:
             full_local_path = os.path.normpath(full_local_path)
             os.makedirs(os.path.dirname(full_local_path), exist_ok=True)
             
-            # New handler instance for thread safety
-            temp_handler = HCPHandler(self.credentials_path)
-            temp_handler.mount_bucket(bucket_name)
-            temp_handler.download_file(file_key, full_local_path, show_progress_bar=False) 
+            # Bucket views are thread-safe and share the connection pool of the handler
+            bucket = self.handler.bucket(bucket_name)
+            # Resumable, so that a retry after e.g. a dropped VPN continues where it stopped
+            bucket.download_file(file_key, full_local_path, show_progress_bar=False, resume=True)
             return True
         except Exception as e:
             print(f"Download failed: {e}")
             return False
 
     def upload_file(self, bucket_name, local_file_path, remote_folder=""):
+        if not self.handler: return False
         try:
             remote_folder = str(remote_folder).strip().replace("\\", "/")
             if remote_folder.startswith("/"): remote_folder = remote_folder.lstrip("/")
@@ -118,14 +151,11 @@ class HCPClient:
             filename = os.path.basename(local_file_path)
             object_key = f"{remote_folder}{filename}"
 
-            temp_handler = HCPHandler(self.credentials_path)
-            temp_handler.mount_bucket(bucket_name)
-            
-            s3_client = getattr(temp_handler, 's3_client', getattr(temp_handler, 'client', None))
-            if not s3_client: return False
+            # Bucket views are thread-safe and share the connection pool of the handler
+            bucket = self.handler.bucket(bucket_name)
 
             with open(local_file_path, 'rb') as data:
-                s3_client.put_object(Bucket=bucket_name, Key=object_key, Body=data)
+                bucket.s3_client.put_object(Bucket=bucket_name, Key=object_key, Body=data)
             
             return True
         except Exception as e:
@@ -135,13 +165,13 @@ class HCPClient:
     def get_existing_folders(self, bucket_name):
         if not self.handler: return []
         try:
-            self.handler.mount_bucket(bucket_name)
+            bucket = self.handler.bucket(bucket_name)
             folders = set()
             
             # Using handler's list_objects if available
             items = []
-            if hasattr(self.handler, 'list_objects'):
-                items = self.handler.list_objects()
+            if hasattr(bucket, 'list_objects'):
+                items = bucket.list_objects()
 
             for obj in items:
                 # Handle dict or object
@@ -2,17 +2,24 @@ import sys
 import os
 import time
 import ctypes
+import threading
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QComboBox, QPushButton, QLabel, 
                              QStatusBar, QProgressBar, QFileDialog, QInputDialog, QLineEdit,
                              QTreeWidget, QMessageBox)
 from PyQt6.QtGui import (QFont, QIcon)
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 
 # Import our modular classes
 from config_manager import ConfigManager
 from hcp_client import HCPClient
 from ui_components import FileBrowserTree
 
+class SearchSignals(QObject):
+    """ Hands the index search results from the worker thread to the UI thread. """
+    finished = pyqtSignal(str, str, object) # bucket, text, matching keys
+
+
 class MainWindow(QMainWindow):
     """ The main application controller. Connects UI, Logic, and Config. """
     def __init__(self):
@@ -68,6 +75,14 @@ class MainWindow(QMainWindow):
         self.search_input.textChanged.connect(self.on_search_text_changed)
         self.layout.addWidget(self.search_input)
 
+        # Index searches wait for a pause in the typing and run in a worker thread
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.on_search_timeout)
+        self.search_signals = SearchSignals()
+        self.search_signals.finished.connect(self.on_search_finished)
+
         # E. File Table (Imported Component)
         self.file_browser = FileBrowserTree()
         self.layout.addWidget(self.file_browser)
@@ -184,7 +199,27 @@ class MainWindow(QMainWindow):
         self.status.showMessage(f"Loaded {len(files)} files.", 3000)
 
     def on_search_text_changed(self, text):
-        self.file_browser.filter_items(text)
+        # Texts too short for the trigram index are matched on the names directly
+        if len(text) < self.client.MIN_INDEX_SEARCH_LENGTH:
+            self.search_timer.stop()
+            self.file_browser.filter_items(text)
+        else:
+            self.search_timer.start()
+
+    def on_search_timeout(self):
+        bucket = self.bucket_combo.currentText()
+        text = self.search_input.text()
+        threading.Thread(target=self._search_index, args=(bucket, text), daemon=True).start()
+
+    def _search_index(self, bucket, text):
+        # Runs in the worker thread, so the UI is only touched through the signal
+        self.search_signals.finished.emit(bucket, text, self.client.search_keys(bucket, text))
+
+    def on_search_finished(self, bucket, text, matching_keys):
+        # Skip results that were overtaken by more typing or another bucket
+        if text != self.search_input.text() or bucket != self.bucket_combo.currentText():
+            return
+        self.file_browser.filter_items(text, matching_keys)
 
     def on_upload(self):
         # 1. Check Bucket
@@ -1,5 +1,6 @@
 import sys
 from collections.abc import Generator
+from datetime import UTC, datetime, timedelta
 from json import dump
 from pathlib import Path
 from typing import Any
@@ -15,8 +16,14 @@ from NGPIris.cli.helpers import (
     create_HCPHandler,
     download_file,
     download_folder,
+    echo_copy_results,
+    echo_deletion_result,
     ensure_destination_dir,
     object_is_folder,
+    parse_byte_range,
+    parse_size,
+    upload_stdin,
+    write_to_stdout,
 )
 from NGPIris.cli.sections import SectionedGroup
 from NGPIris.hcp.exceptions import IsFolderObjectError, ObjectDoesNotExistError
@@ -38,13 +45,83 @@ from NGPIris.hcp.exceptions import IsFolderObjectError, ObjectDoesNotExistError
     "--transfer_config",
     help="Path for using a custom transfer config for uploads or downloads",
 )
+@click.option(
+    "-mc",
+    "--mapi_cache",
+    help=(
+        "Path to a JSON file for caching MAPI responses between commands. "
+        "Can also be set with the NGPIRIS_MAPI_CACHE_PATH environment variable"
+    ),
+    envvar="NGPIRIS_MAPI_CACHE_PATH",
+)
+@click.option(
+    "-nmc",
+    "--no_mapi_cache",
+    help="Always make fresh MAPI requests instead of using cached responses",
+    is_flag=True,
+)
+@click.option(
+    "-i",
+    "--index",
+    help=(
+        "Path to an SQLite file with a local index of the objects in the "
+        "buckets. Can also be set with the NGPIRIS_INDEX_PATH environment "
+        "variable"
+    ),
+    envvar="NGPIRIS_INDEX_PATH",
+)
+@click.option(
+    "-at",
+    "--autotune",
+    help=(
+        "Tune the concurrency and the chunk size of uploads and downloads to "
+        "the throughput of the endpoint while transferring"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-atp",
+    "--autotune_path",
+    help=(
+        "Path to a JSON file where the tuned settings of every endpoint are "
+        "kept between commands. Can also be set with the "
+        "NGPIRIS_AUTOTUNE_PATH environment variable"
+    ),
+    envvar="NGPIRIS_AUTOTUNE_PATH",
+)
+@click.option(
+    "-mb",
+    "--max_bandwidth",
+    help=(
+        "The most bytes per second that all uploads and downloads may use "
+        'together, such as "50MB" or "1GiB". Defaults to no limit'
+    ),
+    callback=parse_size,
+)
+@click.option(
+    "-mi",
+    "--max_inflight",
+    help=(
+        "The most bytes that all transfers may have in flight at a time, such "
+        'as "500MB". Defaults to no limit'
+    ),
+    callback=parse_size,
+)
 @click.version_option(package_name="NGPIris")
 @click.pass_context
-def cli(
+def cli(  # noqa: PLR0913
     context: Context,
     credentials: str,
     debug: bool,
     transfer_config: str,
+    *,
+    mapi_cache: str,
+    no_mapi_cache: bool,
+    index: str,
+    autotune: bool,
+    autotune_path: str,
+    max_bandwidth: int | None,
+    max_inflight: int | None,
 ) -> None:
     """
     NGP Intelligence and Repository Interface Software, IRIS.
@@ -54,6 +131,83 @@ def cli(
 # ---------------------------- Object commands ----------------------------
 
 
+@cli.command(
+    section="Object commands",
+    short_help="Write an object in a bucket/namespace on the HCP to stdout.",
+)
+@click.argument("bucket")
+@click.argument("key")
+@click.option(
+    "-br",
+    "--byte_range",
+    help=(
+        'Only write the bytes FIRST-LAST of the object, such as "0-1023". '
+        'LAST can be left out to write the rest of the object, such as "1024-"'
+    ),
+    callback=parse_byte_range,
+)
+@click.option(
+    "-ps",
+    "--part_size",
+    help=(
+        'The size of the byte ranges that are requested, such as "16MB". '
+        "Defaults to the multipart chunk size"
+    ),
+    callback=parse_size,
+)
+@click.option(
+    "-pf",
+    "--prefetch",
+    help=(
+        "The number of byte ranges that are downloaded ahead of what is being "
+        "written. Default value is 2"
+    ),
+    type=click.IntRange(min=0),
+    default=2,
+)
+@click.option(
+    "-d",
+    "--decompress",
+    help=(
+        "Decompress the object if it was uploaded with --compression. Can not "
+        "be combined with --byte_range"
+    ),
+    is_flag=True,
+)
+@click.pass_context
+def cat(  # noqa: PLR0913
+    context: Context,
+    bucket: str,
+    key: str,
+    *,
+    byte_range: tuple[int, int | None] | None,
+    part_size: int | None,
+    prefetch: int,
+    decompress: bool,
+) -> None:
+    """
+    Write an object in a bucket/namespace on the HCP to stdout, without
+    downloading it to disk first, such as `iris cat BUCKET KEY | zcat`.
+
+    BUCKET is the name of the bucket where the object is.
+
+    KEY is the name of the object.
+    """
+    hcp_h: HCPHandler = create_HCPHandler(context)
+    hcp_h.mount_bucket(bucket)
+    first_byte, last_byte = byte_range or (0, None)
+    write_to_stdout(
+        hcp_h.stream_object(
+            key,
+            first_byte,
+            last_byte,
+            part_size=part_size or 0,
+            prefetch=prefetch,
+            decompress=decompress,
+        ),
+    )
+
+
 @cli.command(
     section="Object commands",
     short_help="Copy objects in a bucket/namespace on the HCP.",
@@ -76,33 +230,70 @@ def cli(
     ),
     is_flag=True,
 )
+@click.option(
+    "-m",
+    "--mode",
+    type=click.Choice(
+        ["file", "folder"],
+        case_sensitive=False,
+    ),
+    default="file",
+    help=(
+        "Allows for selection of between two modes: `file` or `folder`. "
+        "`file` is for copying a single file, while `folder` is for copying a "
+        "folder with all of its subfolders. `file` is default mode"
+    ),
+)
 @click.pass_context
 def copy(  # noqa: PLR0913
     context: Context,
     bucket: str,
     source: str,
     destination: str,
+    *,
     destination_bucket: str,
     dry_run: bool,
+    mode: str,
 ) -> None:
     """
     Copy objects in a bucket/namespace on the HCP.
 
     BUCKET is the bucket where SOURCE is.
 
-    SOURCE is the object to be copied.
+    SOURCE is the object, or the folder when using `-m folder`, to be copied.
 
     DESTINATION is the destination path (the path where the object will be
     copied to).
     """
     hcp_h: HCPHandler = create_HCPHandler(context)
     hcp_h.mount_bucket(bucket)
-    if not dry_run:
-        hcp_h.copy_file(source, destination, destination_bucket)
-    else:
-        click.echo(
-            'This command would have copied the file object "' + source + '"',
-        )
+    match mode:
+        case "file" if not dry_run:
+            hcp_h.copy_file(source, destination, destination_bucket)
+        case "file":
+            click.echo(
+                'This command would have copied the file object "'
+                + source
+                + '"',
+            )
+        case "folder" if not dry_run:
+            echo_copy_results(
+                hcp_h.copy_folder(source, destination, destination_bucket),
+                "copied",
+            )
+        case "folder":
+            click.echo(
+                'By copying "'
+                + source
+                + '", the following objects would have been copied:',
+            )
+            lt.stream(
+                hcp_h.list_objects_parallel(
+                    add_trailing_slash(source),
+                    sort_output=True,
+                ),
+                headers="keys",
+            )
 
 
 @cli.command(
@@ -127,33 +318,70 @@ def copy(  # noqa: PLR0913
     ),
     is_flag=True,
 )
+@click.option(
+    "-m",
+    "--mode",
+    type=click.Choice(
+        ["file", "folder"],
+        case_sensitive=False,
+    ),
+    default="file",
+    help=(
+        "Allows for selection of between two modes: `file` or `folder`. "
+        "`file` is for moving a single file, while `folder` is for moving a "
+        "folder with all of its subfolders. `file` is default mode"
+    ),
+)
 @click.pass_context
 def move(  # noqa: PLR0913
     context: Context,
     bucket: str,
     source: str,
     destination: str,
+    *,
     destination_bucket: str,
     dry_run: bool,
+    mode: str,
 ) -> None:
     """
     Move objects in a bucket/namespace on the HCP.
 
     BUCKET is the bucket where SOURCE is.
 
-    SOURCE is the object to be moved.
+    SOURCE is the object, or the folder when using `-m folder`, to be moved.
 
     DESTINATION is the destination path (the path where the object will be
     moved to).
     """
     hcp_h: HCPHandler = create_HCPHandler(context)
     hcp_h.mount_bucket(bucket)
-    if not dry_run:
-        hcp_h.move_file(source, destination, destination_bucket)
-    else:
-        click.echo(
-            'This command would have moved the file object "' + source + '"',
-        )
+    match mode:
+        case "file" if not dry_run:
+            hcp_h.move_file(source, destination, destination_bucket)
+        case "file":
+            click.echo(
+                'This command would have moved the file object "'
+                + source
+                + '"',
+            )
+        case "folder" if not dry_run:
+            echo_copy_results(
+                hcp_h.move_folder(source, destination, destination_bucket),
+                "moved",
+            )
+        case "folder":
+            click.echo(
+                'By moving "'
+                + source
+                + '", the following objects would have been moved:',
+            )
+            lt.stream(
+                hcp_h.list_objects_parallel(
+                    add_trailing_slash(source),
+                    sort_output=True,
+                ),
+                headers="keys",
+            )
 
 
 @cli.command(
@@ -185,13 +413,22 @@ def move(  # noqa: PLR0913
         "deleting a folder. `folder` is default mode"
     ),
 )
+@click.option(
+    "-r",
+    "--recursive",
+    help="Also delete every subfolder when using `-m folder`",
+    default=False,
+    is_flag=True,
+)
 @click.pass_context
-def delete(
+def delete(  # noqa: PLR0913
     context: Context,
     bucket: str,
     hcp_object: str,
+    *,
     dry_run: bool,
     mode: str,
+    recursive: bool,
 ) -> None:
     """
     Delete objects in a bucket/namespace on the HCP.
@@ -204,9 +441,9 @@ def delete(
     hcp_h.mount_bucket(bucket)
     if not dry_run:
         match mode:
-            case "files":
+            case "file":
                 try:
-                    click.echo(hcp_h.delete_object(hcp_object))
+                    echo_deletion_result(hcp_h.delete_object(hcp_object))
                 except IsFolderObjectError:
                     click.echo(
                         'The object "'
@@ -218,7 +455,9 @@ def delete(
                     sys.exit(1)
             case "folder":
                 try:
-                    click.echo(hcp_h.delete_folder(hcp_object))
+                    echo_deletion_result(
+                        hcp_h.delete_folder(hcp_object, recursive=recursive),
+                    )
                 except ObjectDoesNotExistError:
                     click.echo(
                         'The object "'
@@ -231,12 +470,25 @@ def delete(
                     sys.exit(1)
     else:
         match mode:
-            case "files":
+            case "file":
                 click.echo(
                     'This command would have deleted the file object "'
                     + hcp_object
                     + '"',
                 )
+            case "folder" if recursive:
+                click.echo(
+                    'By deleting "'
+                    + hcp_object
+                    + '", the following objects would have been deleted:',
+                )
+                lt.stream(
+                    hcp_h.list_objects_parallel(
+                        add_trailing_slash(hcp_object),
+                        sort_output=True,
+                    ),
+                    headers="keys",
+                )
             case "folder":
                 click.echo(
                     'By deleting "'
@@ -283,15 +535,90 @@ def delete(
     ),
     is_flag=True,
 )
+@click.option(
+    "-r",
+    "--resume",
+    help=(
+        "Download in byte ranges that are recorded next to the file, so that "
+        "an interrupted download continues where it stopped when the command "
+        "is run again"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-p",
+    "--parallel",
+    help=(
+        "Download in byte ranges that are written straight into a "
+        "preallocated file, which is faster for large objects on links with "
+        "high latency (single file download only)"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-ps",
+    "--part_size",
+    help=(
+        'The size of the byte ranges of a parallel download, such as "64MB". '
+        "Defaults to the multipart chunk size"
+    ),
+    callback=parse_size,
+)
+@click.option(
+    "-mw",
+    "--max_workers",
+    help=(
+        "The maximum number of byte ranges that are downloaded at the same "
+        "time with --resume or --parallel. Default value is 10"
+    ),
+    type=click.IntRange(min=1),
+    default=10,
+)
+@click.option(
+    "-kc",
+    "--keep_compressed",
+    help=(
+        "Do not decompress objects that were uploaded with --compression. "
+        "Otherwise, downloading a folder makes one extra request per object "
+        "to find out if it is compressed"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-v",
+    "--verify",
+    help=(
+        "Hash the file while it is downloaded and compare the checksums with "
+        "the ETag of the object (single file download only)"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-mf",
+    "--manifest",
+    help=(
+        "Write the MD5 and the SHA-256 of the file to a manifest next to it, "
+        "which implies --verify (single file download only)"
+    ),
+    is_flag=True,
+)
 @click.pass_context
 def download(  # noqa: PLR0913
     context: Context,
     bucket: str,
     source: str,
     destination: str,
+    *,
     force: bool,
     ignore_warning: bool,
     dry_run: bool,
+    resume: bool,
+    parallel: bool,
+    part_size: int | None,
+    max_workers: int,
+    keep_compressed: bool,
+    verify: bool,
+    manifest: bool,
 ) -> None:
     """
     Download a file or folder from a bucket/namespace from the HCP.
@@ -332,9 +659,29 @@ def download(  # noqa: PLR0913
         return
 
     if is_folder:
-        download_folder(source, destination_path, ignore_warning, hcp_h)
+        download_folder(
+            source,
+            destination_path,
+            ignore_warning,
+            hcp_h,
+            resume=resume,
+            decompress=not keep_compressed,
+        )
     else:
-        download_file(source, destination_path, ignore_warning, force, hcp_h)
+        download_file(
+            source,
+            destination_path,
+            ignore_warning,
+            force,
+            hcp_h,
+            resume=resume,
+            parallel=parallel,
+            part_size=part_size or 0,
+            max_workers=max_workers,
+            decompress=not keep_compressed,
+            verify=verify,
+            manifest=manifest,
+        )
 
 
 @cli.command(
@@ -364,14 +711,44 @@ def download(  # noqa: PLR0913
     default=False,
     is_flag=True,
 )
+@click.option(
+    "-pa",
+    "--parallel",
+    help=(
+        "List every object under PATH, including the objects in subfolders, "
+        "using the given number of concurrent requests"
+    ),
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "-s",
+    "--sort",
+    help="Sort the output by key when using --parallel",
+    default=False,
+    is_flag=True,
+)
+@click.option(
+    "-ui",
+    "--use_index",
+    help=(
+        "List the objects from the local index given by --index instead of "
+        "making requests to the HCP"
+    ),
+    default=False,
+    is_flag=True,
+)
 @click.pass_context
 def list_objects(  # noqa: PLR0913
     context: Context,
     bucket: str,
     path: str,
+    *,
     pagination: bool,
     files_only: bool,
     extended_information: bool,
+    parallel: int | None,
+    sort: bool,
+    use_index: bool,
 ) -> None:
     """
     List the objects in a certain bucket/namespace on the HCP.
@@ -382,24 +759,20 @@ def list_objects(  # noqa: PLR0913
     """
 
     def list_objects_generator(
-        hcp_h: HCPHandler,
-        path: str,
-        files_only: bool,
-        output_mode: HCPHandler.ListObjectsOutputMode,
+        objects: Generator[dict[str, Any], Any, None],
     ) -> Generator[str, Any, None]:
         """
         Handle object list as a paginator that `click` can handle.
         It works slightly different from `list_objects` in `hcp.py` in order to
         make the output printable in a terminal
         """  # noqa: D415, D400
-        objects = hcp_h.list_objects(
-            path,
-            output_mode=output_mode,
-            files_only=files_only,
-        )
         for obj in objects:
             yield str(obj) + "\n"
 
+    if sort and not parallel:
+        msg = "--sort can only be used together with --parallel"
+        raise click.UsageError(msg, context)
+
     hcp_h: HCPHandler = create_HCPHandler(context)
     hcp_h.mount_bucket(bucket)
     output_mode = (
@@ -411,28 +784,39 @@ def list_objects(  # noqa: PLR0913
     if path:
         path_with_slash = add_trailing_slash(path)
 
-        if not hcp_h.object_exists(path_with_slash):
+        if not use_index and not hcp_h.object_exists(path_with_slash):
             msg = path_with_slash + " does not exist"
             raise ObjectDoesNotExistError(msg)
     else:
         path_with_slash = ""
 
-    if pagination:
-        click.echo_via_pager(
-            list_objects_generator(
-                hcp_h,
-                path_with_slash,
-                files_only,
-                output_mode,
-            ),
+    if use_index:
+        objects = hcp_h.list_objects(
+            path_with_slash,
+            output_mode=output_mode,
+            files_only=files_only,
+            use_index=True,
+        )
+    elif parallel:
+        objects = hcp_h.list_objects_parallel(
+            path_with_slash,
+            output_mode=output_mode,
+            files_only=files_only,
+            parallel=parallel,
+            sort_output=sort,
+        )
+    else:
+        objects = hcp_h.list_objects(
+            path_with_slash,
+            output_mode=output_mode,
+            files_only=files_only,
         )
+
+    if pagination:
+        click.echo_via_pager(list_objects_generator(objects))
     else:
         lt.stream(
-            hcp_h.list_objects(
-                path_with_slash,
-                output_mode=output_mode,
-                files_only=files_only,
-            ),
+            objects,
             headers="keys",
         )
 
@@ -476,24 +860,72 @@ def list_objects(  # noqa: PLR0913
     type=int,
     default=5,
 )
+@click.option(
+    "-r",
+    "--resume",
+    help=(
+        "Upload large files in parts that are recorded next to the file, so "
+        "that an interrupted upload continues where it stopped when the "
+        "command is run again"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-c",
+    "--compression",
+    help=(
+        "Compress the files while they are uploaded. The objects are "
+        "decompressed when they are downloaded. zstd requires the optional "
+        "dependency zstandard. --upload_mode and --resume are then ignored"
+    ),
+    type=click.Choice(
+        ["gzip", "zstd"],
+        case_sensitive=False,
+    ),
+)
+@click.option(
+    "-v",
+    "--verify",
+    help=(
+        "Hash the file while it is uploaded and compare the checksums with "
+        "the ETag of the object (single file upload only)"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-mf",
+    "--manifest",
+    help=(
+        "Write the MD5 and the SHA-256 of the file to a manifest next to it, "
+        "which implies --verify (single file upload only)"
+    ),
+    is_flag=True,
+)
 @click.pass_context
 def upload(  # noqa: PLR0913
     context: Context,
     bucket: str,
     source: str,
     destination: str,
+    *,
     dry_run: bool,
     upload_mode: str,
     equal_parts: int,
+    resume: bool,
+    compression: str | None,
+    verify: bool,
+    manifest: bool,
 ) -> None:
     """
     Upload files to a bucket/namespace on the HCP.
 
     BUCKET is the name of the upload destination bucket.
 
-    SOURCE is the path to the file or folder of files to be uploaded.
+    SOURCE is the path to the file or folder of files to be uploaded, or - to
+    upload what is piped to stdin.
 
-    DESTINATION is the destination path on the HCP.
+    DESTINATION is the destination path on the HCP. When SOURCE is -, it is the
+    name of the new object.
     """
     if equal_parts <= 0:
         click.echo(
@@ -503,9 +935,15 @@ def upload(  # noqa: PLR0913
         sys.exit(1)
 
     upload_mode_choice = HCPHandler.UploadMode(upload_mode.lower())
+    compression_choice = (
+        HCPHandler.Compression(compression.lower()) if compression else None
+    )
 
     hcp_h: HCPHandler = create_HCPHandler(context)
     hcp_h.mount_bucket(bucket)
+    if source == "-":
+        upload_stdin(destination, dry_run, hcp_h, compression_choice)
+        return
     destination = add_trailing_slash(destination)
     if Path(source).is_dir():
         source = add_trailing_slash(source)
@@ -518,12 +956,35 @@ def upload(  # noqa: PLR0913
                 + '"',
             )
         else:
-            hcp_h.upload_folder(
+            upload_results = hcp_h.upload_folder(
                 source,
                 destination,
                 upload_mode=upload_mode_choice,
                 equal_parts=equal_parts,
+                resume=resume,
+                compression=compression_choice,
+            )
+            not_uploaded = [
+                result | {"Status": result["Status"].value}
+                for result in upload_results
+                if result["Status"] != HCPHandler.UploadStatus.UPLOADED
+            ]
+            click.echo(
+                str(len(upload_results) - len(not_uploaded))
+                + " of "
+                + str(len(upload_results))
+                + " files were uploaded",
             )
+            if not_uploaded:
+                click.echo(
+                    tabulate(not_uploaded, headers="keys"),
+                    err=True,
+                )
+                if any(
+                    result["Status"] == HCPHandler.UploadStatus.FAILED.value
+                    for result in not_uploaded
+                ):
+                    sys.exit(1)
     else:
         file_name = Path(source).name
         destination += file_name
@@ -541,9 +1002,189 @@ def upload(  # noqa: PLR0913
                 destination,
                 upload_mode=upload_mode_choice,
                 equal_parts=equal_parts,
+                resume=resume,
+                compression=compression_choice,
+                verify=verify,
+                manifest=manifest,
             )
 
 
+@cli.command(
+    section="Object commands",
+    short_help="Synchronise a local folder with a folder on the HCP.",
+)
+@click.argument("bucket")
+@click.argument("local_path")
+@click.argument("path", required=False, default="")
+@click.option(
+    "-d",
+    "--direction",
+    type=click.Choice(
+        ["upload", "download"],
+        case_sensitive=False,
+    ),
+    required=True,
+    help=(
+        "`upload` transfers new and changed local files to the HCP, while "
+        "`download` transfers new and changed objects to the local folder"
+    ),
+)
+@click.option(
+    "-dr",
+    "--dry_run",
+    help=(
+        "Simulate the command execution without making actual changes. "
+        "Useful for testing and verification"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-del",
+    "--delete",
+    help=(
+        "Also delete the files or objects at the destination that do not "
+        "exist at the source"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-cs",
+    "--checksum",
+    help=(
+        "Compare the ETags of files and objects of the same size, even if "
+        "their modification times show that they are unchanged"
+    ),
+    is_flag=True,
+)
+@click.pass_context
+def sync(  # noqa: PLR0913
+    context: Context,
+    bucket: str,
+    local_path: str,
+    path: str,
+    *,
+    direction: str,
+    dry_run: bool,
+    delete: bool,
+    checksum: bool,
+) -> None:
+    """
+    Synchronise a local folder with a folder in a bucket/namespace on the HCP.
+    Only new or changed files are transferred.
+
+    BUCKET is the name of the bucket.
+
+    LOCAL_PATH is the path to the local folder.
+
+    PATH is an optional folder in the bucket. Defaults to the root of the
+    bucket.
+    """
+    hcp_h: HCPHandler = create_HCPHandler(context)
+    hcp_h.mount_bucket(bucket)
+    plan = hcp_h.sync(
+        local_path,
+        path,
+        direction=HCPHandler.SyncDirection(direction.lower()),
+        delete=delete,
+        checksum=checksum,
+        dry_run=dry_run,
+    )
+    if not plan:
+        click.echo("Everything is up to date")
+        return
+
+    rows = [
+        {
+            "Action": entry["Action"].value,
+            "Path": entry["Path"],
+            "Key": entry["Key"],
+            "Reason": entry["Reason"],
+        }
+        for entry in plan
+    ]
+    if dry_run:
+        click.echo("This command would have taken the following actions:")
+        click.echo(tabulate(rows, headers="keys"))
+        return
+
+    failed = [
+        row | {"Error": entry["Error"]}
+        for row, entry in zip(rows, plan, strict=True)
+        if entry["Error"]
+    ]
+    click.echo(
+        str(len(plan) - len(failed))
+        + " of "
+        + str(len(plan))
+        + " actions were carried out",
+    )
+    if failed:
+        click.echo(tabulate(failed, headers="keys"), err=True)
+        sys.exit(1)
+
+
+@cli.command(
+    section="Object commands",
+    short_help="Verify a local folder against a folder on the HCP.",
+)
+@click.argument("bucket")
+@click.argument("local_path")
+@click.argument("path", required=False, default="")
+@click.option(
+    "-mw",
+    "--max_workers",
+    help=(
+        "The maximum number of files that are hashed at the same time. "
+        "Defaults to the number of CPU cores"
+    ),
+    type=click.IntRange(min=1),
+)
+@click.pass_context
+def verify(
+    context: Context,
+    bucket: str,
+    local_path: str,
+    path: str,
+    *,
+    max_workers: int | None,
+) -> None:
+    """
+    Verify that the files in a local folder match the objects in a folder in
+    a bucket/namespace on the HCP, by comparing local checksums with the ETags
+    of the objects. Nothing is downloaded.
+
+    BUCKET is the name of the bucket.
+
+    LOCAL_PATH is the path to the local folder.
+
+    PATH is an optional folder in the bucket. Defaults to the root of the
+    bucket.
+    """
+    hcp_h: HCPHandler = create_HCPHandler(context)
+    hcp_h.mount_bucket(bucket)
+    results = hcp_h.verify(local_path, path, max_workers=max_workers)
+    mismatches = [
+        {
+            "Status": result["Status"].value,
+            "Path": result["Path"],
+            "Key": result["Key"],
+            "Size": result["Size"],
+            "LocalSize": result["LocalSize"],
+        }
+        for result in results
+        if result["Status"] != HCPHandler.VerifyStatus.MATCHED
+    ]
+    click.echo(
+        str(len(results) - len(mismatches))
+        + " of "
+        + str(len(results))
+        + " files match",
+    )
+    if mismatches:
+        click.echo(tabulate(mismatches, headers="keys"), err=True)
+        sys.exit(1)
+
+
 # ---------------------------- Bucket commands ----------------------------
 
 
@@ -629,9 +1270,18 @@ def delete_bucket(
     ),
     default=HCPHandler.ListBucketsOutputMode.SIMPLE,
 )
+@click.option(
+    "-mw",
+    "--max_workers",
+    help="The maximum number of concurrent requests. Default value is 10",
+    type=click.IntRange(min=1),
+    default=10,
+)
 @click.pass_context
 def list_buckets(
-    context: Context, output_mode: HCPHandler.ListBucketsOutputMode
+    context: Context,
+    output_mode: HCPHandler.ListBucketsOutputMode,
+    max_workers: int,
 ) -> None:
     """
     List the available buckets/namespaces on the HCP.
@@ -639,13 +1289,202 @@ def list_buckets(
     hcp_h: HCPHandler = create_HCPHandler(context)
     click.echo(
         tabulate(
-            hcp_h.list_buckets(output_mode),
+            hcp_h.list_buckets(output_mode, max_workers=max_workers),
             headers="keys",
             disable_numparse=True,
         )
     )
 
 
+@cli.command(
+    section="Bucket commands",
+    short_help="Refresh the local index of a bucket/namespace on the HCP.",
+)
+@click.argument("bucket")
+@click.argument("path", required=False, default="")
+@click.option(
+    "-pa",
+    "--parallel",
+    help="The number of concurrent listing requests. Default value is 10",
+    type=click.IntRange(min=1),
+    default=10,
+)
+@click.option(
+    "-si",
+    "--substring_index",
+    help=(
+        "Also build a trigram index of the keys, which makes simple-search "
+        "with --use_index fast"
+    ),
+    default=False,
+    is_flag=True,
+)
+@click.pass_context
+def refresh_index(
+    context: Context,
+    bucket: str,
+    path: str,
+    parallel: int,
+    substring_index: bool,
+) -> None:
+    """
+    Refresh the local index of a bucket/namespace on the HCP, given by
+    --index.
+
+    BUCKET is the name of the bucket to be indexed.
+
+    PATH is an optional argument for only refreshing the objects in a folder
+    """
+    hcp_h: HCPHandler = create_HCPHandler(context)
+    hcp_h.mount_bucket(bucket)
+    changes = hcp_h.refresh_index(
+        add_trailing_slash(path) if path else "",
+        parallel=parallel,
+        substring_index=substring_index,
+    )
+    click.echo(
+        str(changes["Added"])
+        + " added, "
+        + str(changes["Changed"])
+        + " changed and "
+        + str(changes["Removed"])
+        + " removed objects",
+    )
+
+
+@cli.command(
+    section="Bucket commands",
+    short_help="Get the size of a folder from the local index.",
+)
+@click.argument("bucket")
+@click.argument("path", required=False, default="")
+@click.option(
+    "-sf",
+    "--subfolders",
+    help="Output the size of every subfolder directly under PATH",
+    default=False,
+    is_flag=True,
+)
+@click.pass_context
+def folder_size(
+    context: Context,
+    bucket: str,
+    path: str,
+    subfolders: bool,
+) -> None:
+    """
+    Get the total size and number of objects in a folder, including every
+    subfolder, from the local index given by --index.
+
+    BUCKET is the name of the bucket where the folder is.
+
+    PATH is an optional argument for the folder. Defaults to the whole bucket
+    """
+    hcp_h: HCPHandler = create_HCPHandler(context)
+    hcp_h.mount_bucket(bucket)
+    path_with_slash = add_trailing_slash(path) if path else ""
+    if subfolders:
+        sizes = hcp_h.get_subfolder_sizes(path_with_slash)
+    else:
+        sizes = {path_with_slash: hcp_h.get_folder_size(path_with_slash)}
+    click.echo(
+        tabulate(
+            [
+                {
+                    "Key": key,
+                    "Size (Bytes)": folder["Size"],
+                    "Object count": folder["ObjectCount"],
+                }
+                for key, folder in sizes.items()
+            ],
+            headers="keys",
+            disable_numparse=True,
+        ),
+    )
+
+
+@cli.command(
+    section="Bucket commands",
+    short_help="List or abort unfinished multipart uploads in a bucket.",
+)
+@click.argument("bucket")
+@click.argument("path", required=False, default="")
+@click.option(
+    "-a",
+    "--abort",
+    help=(
+        "Abort the uploads, which frees the space that their parts take up on "
+        "the bucket/namespace"
+    ),
+    is_flag=True,
+)
+@click.option(
+    "-ot",
+    "--older_than",
+    help=(
+        "Only abort the uploads that were started more than this many hours "
+        "ago, so that running uploads are left alone. Defaults to 24"
+    ),
+    type=click.FloatRange(min=0),
+    default=24,
+)
+@click.option(
+    "-dr",
+    "--dry_run",
+    help=(
+        "Simulate the command execution without making actual changes. "
+        "Useful for testing and verification"
+    ),
+    is_flag=True,
+)
+@click.pass_context
+def multipart(  # noqa: PLR0913
+    context: Context,
+    bucket: str,
+    path: str,
+    *,
+    abort: bool,
+    older_than: float,
+    dry_run: bool,
+) -> None:
+    """
+    List the multipart uploads in a bucket/namespace on the HCP that were
+    started but never completed, or abort them with --abort.
+
+    BUCKET is the name of the bucket.
+
+    PATH is an optional filter for the keys of the uploads. Defaults to the
+    whole bucket
+    """
+    hcp_h: HCPHandler = create_HCPHandler(context)
+    hcp_h.mount_bucket(bucket)
+    if not abort:
+        click.echo(tabulate(hcp_h.list_multipart_uploads(path), headers="keys"))
+        return
+
+    initiated_before = datetime.now(UTC) - timedelta(hours=older_than)
+    if dry_run:
+        click.echo("This command would have aborted the following uploads:")
+        click.echo(
+            tabulate(
+                [
+                    upload
+                    for upload in hcp_h.list_multipart_uploads(path)
+                    if upload["Initiated"] < initiated_before
+                ],
+                headers="keys",
+            ),
+        )
+        return
+
+    aborted = hcp_h.abort_multipart_uploads(path, initiated_before)
+    failed = [upload for upload in aborted if upload["Error"]]
+    click.echo(str(len(aborted) - len(failed)) + " uploads were aborted")
+    if failed:
+        click.echo(tabulate(failed, headers="keys"), err=True)
+        sys.exit(1)
+
+
 # ---------------------------- Search commands ----------------------------
 
 
@@ -665,12 +1504,31 @@ def list_buckets(
     default=False,
     is_flag=True,
 )
+@click.option(
+    "-p",
+    "--path",
+    help="Only search among the objects under this folder",
+    default="",
+)
+@click.option(
+    "-ui",
+    "--use_index",
+    help=(
+        "Search among the objects in the local index given by --index instead "
+        "of listing the bucket"
+    ),
+    default=False,
+    is_flag=True,
+)
 @click.pass_context
-def simple_search(
+def simple_search(  # noqa: PLR0913
     context: Context,
     bucket: str,
     search_string: str,
     case_sensitive: bool,
+    *,
+    path: str,
+    use_index: bool,
 ) -> None:
     """
     Make a simple search using substrings in a bucket/namespace on the HCP.
@@ -687,6 +1545,8 @@ def simple_search(
     list_of_results = hcp_h.search_in_bucket(
         search_string,
         case_sensitive=case_sensitive,
+        path_key=add_trailing_slash(path) if path else "",
+        use_index=use_index,
     )
     click.echo("Search results:")
     lt.stream(
@@ -717,13 +1577,39 @@ def simple_search(
     help="Set the threshold for the fuzzy search score. Default value is 80",
     default=80,
 )
+@click.option(
+    "-p",
+    "--path",
+    help="Only search among the objects under this folder",
+    default="",
+)
+@click.option(
+    "-k",
+    "--top_k",
+    help="Only output the given number of best matches, best match first",
+    type=click.IntRange(min=1),
+)
+@click.option(
+    "-ui",
+    "--use_index",
+    help=(
+        "Search among the objects in the local index given by --index instead "
+        "of listing the bucket"
+    ),
+    default=False,
+    is_flag=True,
+)
 @click.pass_context
-def fuzzy_search(
+def fuzzy_search(  # noqa: PLR0913
     context: Context,
     bucket: str,
     search_string: str,
     case_sensitive: bool,
     threshold: int,
+    *,
+    path: str,
+    top_k: int | None,
+    use_index: bool,
 ) -> None:
     """
     Make a fuzzy search using a search string in a bucket/namespace on the HCP.
@@ -742,6 +1628,9 @@ def fuzzy_search(
         search_string,
         case_sensitive=case_sensitive,
         threshold=threshold,
+        path_key=add_trailing_slash(path) if path else "",
+        top_k=top_k or 0,
+        use_index=use_index,
     )
     click.echo("Search results:")
     lt.stream(
@@ -1,14 +1,21 @@
 import os
 import sys
+from collections.abc import Iterable
+from contextlib import suppress
+from functools import partial
 from pathlib import Path
 
 import click
-from bitmath import Byte, TiB
+from bitmath import Byte, TiB, parse_string_unsafe
 from boto3 import set_stream_logger
 from click.core import Context
+from tabulate import tabulate
 
 from NGPIris import HCPHandler
 
+# The number of bytes that are read from stdin at a time
+_STDIN_CHUNK_SIZE = 1024 * 1024
+
 
 def add_trailing_slash(path: str) -> str:
     """
@@ -25,6 +32,30 @@ def add_trailing_slash(path: str) -> str:
     return path
 
 
+def parse_size(
+    context: Context,  # noqa: ARG001
+    parameter: click.Parameter,
+    value: str | None,
+) -> int | None:
+    """
+    Callback for options that take a number of bytes, such as `"50MB"`,
+    `"1GiB"` or `"1000"`.
+
+    :return: The number of bytes, or None if the option was not given
+    :rtype: int | None
+    """
+    if value is None:
+        return None
+    try:
+        size = int(parse_string_unsafe(value).bytes)
+    except ValueError:
+        size = -1
+    if size < 0:
+        msg = '"' + value + '" is not a valid size'
+        raise click.BadParameter(msg, param=parameter)
+    return size
+
+
 def create_HCPHandler(context: Context) -> HCPHandler:
     """
     Returns a `HCPHandler` based on the given command `context`.
@@ -77,14 +108,29 @@ def create_HCPHandler(context: Context) -> HCPHandler:
 
     debug: bool | None = parent_context.params.get("debug")
     transfer_config: str | None = parent_context.params.get("transfer_config")
-    if transfer_config:
-        hcp_h = HCPHandler(hcp_credentials, custom_config_path=transfer_config)
-    else:
-        hcp_h = HCPHandler(hcp_credentials)
+    mapi_cache: str | None = parent_context.params.get("mapi_cache")
+    no_mapi_cache: bool | None = parent_context.params.get("no_mapi_cache")
+    index: str | None = parent_context.params.get("index")
+    autotune: bool | None = parent_context.params.get("autotune")
+    autotune_path: str | None = parent_context.params.get("autotune_path")
+    max_bandwidth: int | None = parent_context.params.get("max_bandwidth")
+    max_inflight: int | None = parent_context.params.get("max_inflight")
+    hcp_h = HCPHandler(
+        hcp_credentials,
+        custom_config_path=transfer_config or "",
+        mapi_cache_path=mapi_cache or "",
+        use_mapi_cache=not no_mapi_cache,
+        index_path=index or "",
+        autotune=bool(autotune),
+        autotune_path=autotune_path or "",
+        max_bandwidth=max_bandwidth,
+        max_inflight=max_inflight,
+    )
 
     if debug:
         set_stream_logger(name="")
         click.echo(hcp_h.transfer_config.__dict__)
+        click.echo(hcp_h.transfer_limiter.get_limits())
 
     return hcp_h
 
@@ -94,7 +140,7 @@ def object_is_folder(object_path: str, hcp_h: HCPHandler) -> bool:
     Predicate for checking if an HCP object is a folder or not.
     """
     return (object_path.endswith("/")) and (
-        hcp_h.get_object(object_path)["ContentLength"] == 0
+        hcp_h.stat(object_path)["Size"] == 0
     )
 
 
@@ -118,8 +164,14 @@ def prompt_large_download() -> None:
         sys.exit("\nAborting download")
 
 
-def download_folder(
-    source: str, destination_path: Path, ignore_warning: bool, hcp_h: HCPHandler
+def download_folder(  # noqa: PLR0913
+    source: str,
+    destination_path: Path,
+    ignore_warning: bool,
+    hcp_h: HCPHandler,
+    *,
+    resume: bool = False,
+    decompress: bool = False,
 ) -> None:
     """
     Helper function to `download` for downloading a folder.
@@ -135,21 +187,34 @@ def download_folder(
             if cumulative_download_size >= TiB(1):
                 prompt_large_download()
 
-    hcp_h.download_folder(prefix, destination_path.as_posix())
+    hcp_h.download_folder(
+        prefix,
+        destination_path.as_posix(),
+        resume=resume,
+        decompress=decompress,
+    )
 
 
-def download_file(
+def download_file(  # noqa: PLR0913
     source: str,
     destination_path: Path,
     ignore_warning: bool,
     force: bool,
     hcp_h: HCPHandler,
+    *,
+    resume: bool = False,
+    parallel: bool = False,
+    part_size: int = 0,
+    max_workers: int = 10,
+    decompress: bool = True,
+    verify: bool = False,
+    manifest: bool = False,
 ) -> None:
     """
     Helper function to `download` for downloading a file.
     """
     check_size_and_ignore_warning_flag = (
-        Byte(hcp_h.get_object(source)["ContentLength"]) >= TiB(1)
+        Byte(hcp_h.stat(source)["Size"]) >= TiB(1)
     ) and (not ignore_warning)
     if check_size_and_ignore_warning_flag:
         prompt_large_download()
@@ -160,4 +225,132 @@ def download_file(
             "Object already exists. If you wish to overwrite the existing file,"
             " use the -f / --force option"
         )
-    hcp_h.download_file(source, downloaded_source.as_posix())
+    hcp_h.download_file(
+        source,
+        downloaded_source.as_posix(),
+        resume=resume,
+        max_workers=max_workers,
+        parallel=parallel,
+        part_size=part_size,
+        decompress=decompress,
+        verify=verify,
+        manifest=manifest,
+    )
+
+
+def parse_byte_range(
+    context: Context,  # noqa: ARG001
+    parameter: click.Parameter,
+    value: str | None,
+) -> tuple[int, int | None] | None:
+    """
+    Callback for options that take an inclusive byte range, such as
+    `"0-1023"`, or `"1024-"` for everything from byte 1024.
+
+    :return:
+        The first and the last byte, where the last byte is None for the end
+        of the object, or None if the option was not given
+    :rtype: tuple[int, int | None] | None
+    """
+    if value is None:
+        return None
+    first_byte, separator, last_byte = value.partition("-")
+    try:
+        byte_range = (
+            int(first_byte),
+            int(last_byte) if last_byte else None,
+        )
+    except ValueError:
+        byte_range = None
+    if (
+        not separator
+        or byte_range is None
+        or byte_range[0] < 0
+        or (byte_range[1] is not None and byte_range[1] < byte_range[0])
+    ):
+        msg = '"' + value + '" is not a valid byte range'
+        raise click.BadParameter(msg, param=parameter)
+    return byte_range
+
+
+def write_to_stdout(chunks: Iterable[bytes]) -> None:
+    """
+    Helper function to `cat` for writing chunks of bytes to stdout. If the
+    reader of the pipe stops early, such as `head`, the command exits quietly.
+    """
+    stdout = click.get_binary_stream("stdout")
+    try:
+        for chunk in chunks:
+            stdout.write(chunk)
+        stdout.flush()
+    except BrokenPipeError:
+        # Python flushes stdout again when exiting, which would fail as well
+        with suppress(OSError, ValueError):
+            os.dup2(os.open(os.devnull, os.O_WRONLY), stdout.fileno())
+        sys.exit(1)
+
+
+def upload_stdin(
+    destination: str,
+    dry_run: bool,
+    hcp_h: HCPHandler,
+    compression: HCPHandler.Compression | None = None,
+) -> None:
+    """
+    Helper function to `upload` for uploading what is piped to stdin to the
+    object `destination`.
+    """
+    if not destination or destination.endswith("/"):
+        sys.exit(
+            "DESTINATION must be the name of the new object when SOURCE is -",
+        )
+    if dry_run:
+        click.echo(
+            'This command would have uploaded stdin to "' + destination + '"',
+        )
+        return
+    stdin = click.get_binary_stream("stdin")
+    hcp_h.upload_stream(
+        iter(partial(stdin.read, _STDIN_CHUNK_SIZE), b""),
+        destination,
+        compression=compression,
+    )
+
+
+def echo_deletion_result(result: dict) -> None:
+    """
+    Print the result of a deletion, see `HCPHandler.delete_objects`. The keys
+    that could not be deleted are printed to stderr, in which case the command
+    exits with an error.
+    """
+    click.echo(str(result["DeletedCount"]) + " objects were deleted")
+    if result["Errors"]:
+        click.echo(
+            str(result["ErrorCount"]) + " objects could not be deleted:",
+            err=True,
+        )
+        click.echo(tabulate(result["Errors"], headers="keys"), err=True)
+        sys.exit(1)
+
+
+def echo_copy_results(results: list[dict], verb: str) -> None:
+    """
+    Print the results of copying or moving a folder, see
+    `HCPHandler.copy_folder`. The objects that were not `verb` are printed to
+    stderr, in which case the command exits with an error.
+    """
+    not_done = [
+        result | {"Status": result["Status"].value}
+        for result in results
+        if result["Status"].value != verb
+    ]
+    click.echo(
+        str(len(results) - len(not_done))
+        + " of "
+        + str(len(results))
+        + " objects were "
+        + verb,
+    )
+    if not_done:
+        click.echo(tabulate(not_done, headers="keys"), err=True)
+        sys.exit(1)
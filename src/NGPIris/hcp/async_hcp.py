@@ -0,0 +1,1238 @@
+import asyncio
+import os
+from collections.abc import AsyncGenerator, Awaitable, Iterable
+from contextlib import AsyncExitStack, suppress
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Self, TypeVar
+
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from NGPIris.hcp.cache import MAPICache, get_endpoint_class
+from NGPIris.hcp.exceptions import (
+    BucketForbiddenError,
+    BucketNotFoundError,
+    IsFolderObjectError,
+    NoBucketMountedError,
+    NotFoundError,
+    NotSufficientPermissionsError,
+    ObjectAlreadyExistError,
+    ObjectDoesNotExistError,
+    SubfolderError,
+    UnallowedCharacterError,
+)
+from NGPIris.hcp.hcp import HCPHandler
+from NGPIris.hcp.helpers import (
+    check_mounted,
+    get_tenant,
+    parse_credentials,
+    raise_path_error,
+    walk_files,
+)
+from NGPIris.utils import md5_hashing
+
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+    from aiohttp import ClientSession, ClientTimeout, TCPConnector
+except ImportError as e:  # pragma: no cover
+    msg = (
+        "AsyncHCPHandler requires aiobotocore, which is installed with "
+        '`pip install "NGPIris[async]"`'
+    )
+    raise ImportError(msg) from e
+
+T = TypeVar("T")
+
+_KB = 1024
+_MB = _KB * _KB
+
+# The number of connections in each of the pools for the S3 API and the MAPI.
+# Requests beyond this wait for a free connection
+_DEFAULT_MAX_CONNECTIONS = 100
+
+# The number of objects that bulk methods work on at the same time
+_DEFAULT_MAX_CONCURRENCY = 100
+
+# The most keys that one DeleteObjects request can hold
+_DELETE_BATCH_SIZE = 1000
+
+# The most parts that one multipart upload can consist of
+_MAX_PARTS = 10_000
+
+
+async def _gather_or_cancel(awaitables: Iterable[Awaitable[T]]) -> list[T]:
+    """
+    Run `awaitables` concurrently and return their results in order. If one
+    of them fails, the rest are cancelled before the exception is raised.
+    """
+    tasks = [asyncio.ensure_future(awaitable) for awaitable in awaitables]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def _read_part(local_file_path: str, offset: int, part_size: int) -> bytes:
+    """
+    Read `part_size` bytes from `offset` in a local file.
+    """
+    with Path(local_file_path).open("rb") as local_file:
+        local_file.seek(offset)
+        return local_file.read(part_size)
+
+
+class AsyncHCPHandler:
+    """
+    Class for handling HCP requests with asyncio, which mirrors
+    :py:class:`NGPIris.hcp.hcp.HCPHandler` with coroutines and async
+    generators.
+
+    Every S3 request goes through one aiobotocore client, and every MAPI
+    request through one aiohttp session, each with a shared pool of
+    connections. This lets a single event loop drive thousands of concurrent
+    operations on small objects, without a thread per operation. The handler
+    is used as an async context manager, which opens and closes the
+    connections::
+
+        async with AsyncHCPHandler(credentials) as hcp_h:
+            await hcp_h.mount_bucket("bucket")
+            async for hcp_object in hcp_h.list_objects("folder/"):
+                ...
+
+    Requires the optional dependency aiobotocore, which is installed with
+    `pip install "NGPIris[async]"`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        credentials: str | dict[str, str],
+        use_ssl: bool = False,
+        *,
+        max_connections: int = _DEFAULT_MAX_CONNECTIONS,
+        mapi_cache_path: str = "",
+        use_mapi_cache: bool = True,
+        endpoint_url: str = "",
+    ) -> None:
+        """
+        Constructor for the `AsyncHCPHandler` class. No connections are made
+        until the handler is opened, see :py:meth:`open`.
+
+        :param credentials:
+            If `credentials` is a `str`, then it will be interpreted as a path
+            to the JSON credentials file. If `credentials` is a `dict`, then a
+            dictionary with the appropriate HCP credentials is expected, see
+            :py:class:`NGPIris.hcp.hcp.HCPHandler`
+        :type credentials: str | dict[str, str]
+
+        :param use_ssl: Boolean choice between using SSL, defaults to False
+        :type use_ssl: bool, optional
+
+        :param max_connections:
+            The number of connections in each of the pools for the S3 API and
+            the MAPI. Defaults to 100
+        :type max_connections: int, optional
+
+        :param mapi_cache_path:
+            Path to a JSON file where MAPI responses are cached between
+            sessions. Defaults to the empty string, which means that MAPI
+            responses are only cached in memory
+        :type mapi_cache_path: str, optional
+
+        :param use_mapi_cache:
+            Boolean choice of caching MAPI responses at all. Defaults to True
+        :type use_mapi_cache: bool, optional
+
+        :param endpoint_url:
+            URL of the S3 API to use instead of the endpoint in the
+            credentials, such as a local S3 stand-in for testing. Defaults to
+            the empty string, which means the endpoint in the credentials
+        :type endpoint_url: str, optional
+
+        :raise NotAValidTenantError:
+            If the tenant in the specified endpoint is not valid
+
+        :raise UnableToParseEndpointError: The endpoint could not be parsed
+        """
+        self.endpoint, self.username, self.password = parse_credentials(
+            credentials,
+        )
+        self.tenant = get_tenant(self.endpoint)
+        self.base_request_url = (
+            self.endpoint + ":9090/mapi/tenants/" + self.tenant
+        )
+        self.token = self.username + ":" + self.password
+        self.bucket_name: str | None = None
+        self.use_ssl = use_ssl
+        self.max_connections = max_connections
+        self.endpoint_url = endpoint_url or self.endpoint
+        self.mapi_cache = MAPICache(mapi_cache_path, enabled=use_mapi_cache)
+
+        # The same defaults as `HCPHandler`
+        self.transfer_config = TransferConfig(
+            multipart_threshold=10 * _MB,
+            max_concurrency=30,
+            multipart_chunksize=40 * _MB,
+        )
+
+        self.s3_client: Any = None
+        self.mapi_session: ClientSession | None = None
+        self._exit_stack: AsyncExitStack | None = None
+
+    async def open(self) -> None:
+        """
+        Open the S3 client and the MAPI session. Called when entering the
+        handler as an async context manager.
+        """
+        if self._exit_stack is not None:
+            return
+        exit_stack = AsyncExitStack()
+        s3_config = AioConfig(
+            s3={
+                "addressing_style": "path",
+                "payload_signing_enabled": True,
+            },
+            signature_version="s3v4",
+            max_pool_connections=self.max_connections,
+        )
+        self.s3_client = await exit_stack.enter_async_context(
+            get_session().create_client(
+                "s3",
+                aws_access_key_id=self.username,
+                aws_secret_access_key=self.password,
+                endpoint_url=self.endpoint_url,
+                verify=self.use_ssl,
+                config=s3_config,
+            ),
+        )
+        self.mapi_session = await exit_stack.enter_async_context(
+            ClientSession(
+                connector=TCPConnector(
+                    limit=self.max_connections,
+                    ssl=None if self.use_ssl else False,
+                ),
+                headers={
+                    "Authorization": "HCP " + self.token,
+                    "Cookie": "hcp-ns-auth=" + self.token,
+                    "Accept": "application/json",
+                },
+                timeout=ClientTimeout(total=60),
+            ),
+        )
+        self._exit_stack = exit_stack
+
+    async def close(self) -> None:
+        """
+        Close the S3 client and the MAPI session. Called when exiting the
+        handler as an async context manager.
+        """
+        if self._exit_stack is None:
+            return
+        exit_stack, self._exit_stack = self._exit_stack, None
+        await exit_stack.aclose()
+        self.s3_client = None
+        self.mapi_session = None
+
+    async def __aenter__(self) -> Self:
+        """
+        Open the handler, see :py:meth:`open`.
+        """
+        await self.open()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Close the handler, see :py:meth:`close`.
+        """
+        await self.close()
+
+    # ---------------------------- MAPI methods ----------------------------
+
+    def _get_MAPI_cache_key(self, path_extension: str = "") -> str:
+        """
+        Get the cache key of a MAPI request, which is shared with
+        `HCPHandler`.
+        """
+        return (
+            md5_hashing(self.username)
+            + "@"
+            + self.base_request_url
+            + path_extension
+        )
+
+    async def get_MAPI_request(
+        self,
+        path_extension: str = "",
+        use_cache: bool = True,
+    ) -> dict:
+        """
+        Make a GET request to the HCP in order to use the builtin MAPI, see
+        :py:meth:`NGPIris.hcp.hcp.HCPHandler.get_MAPI_request`.
+
+        :param path_extension:
+            Extension for the base request URL, defaults to the empty string
+        :type path_extension: str, optional
+
+        :param use_cache:
+            Boolean choice of using a cached response if there is one. A fresh
+            response is cached either way. Defaults to True
+        :type use_cache: bool, optional
+
+        :return: The response as a dictionary
+        :rtype: dict
+        """
+        cache_key = self._get_MAPI_cache_key(path_extension)
+        if use_cache:
+            cached_response = self.mapi_cache.get(cache_key)
+            if cached_response is not None:
+                return dict(cached_response)
+
+        if self.mapi_session is None:
+            await self.open()
+        url = self.base_request_url + path_extension
+        async with self.mapi_session.get(url) as response:  # pyright: ignore[reportOptionalMemberAccess]
+            if response.status == 403:  # noqa: PLR2004
+                msg = (
+                    "You lack the sufficient permissions needed for your "
+                    "request"
+                )
+                raise NotSufficientPermissionsError(msg)
+            if response.status == 404:  # noqa: PLR2004
+                msg = "The request URL " + str(url) + " could not be found"
+                raise NotFoundError(msg)
+            response.raise_for_status()
+            response_dict = dict(await response.json(content_type=None))
+
+        self.mapi_cache.set(
+            cache_key,
+            response_dict,
+            get_endpoint_class(path_extension),
+        )
+        return response_dict
+
+    def invalidate_MAPI_cache(self, path_extension: str = "") -> None:
+        """
+        Remove cached MAPI responses for every path that starts with
+        `path_extension`.
+
+        :param path_extension:
+            Extension for the base request URL. Defaults to the empty string,
+            which removes every cached response for this tenant
+        :type path_extension: str, optional
+        """
+        self.mapi_cache.invalidate(self._get_MAPI_cache_key(path_extension))
+
+    async def get_users(self, use_cache: bool = True) -> list[str]:
+        """
+        Get a list of users on the tenant.
+
+        :param use_cache:
+            Boolean choice of using a cached MAPI response. Defaults to True
+        :type use_cache: bool, optional
+
+        :return: List of users on the tenant
+        :rtype: list[str]
+        """
+        return (await self.get_MAPI_request("/userAccounts", use_cache)).get(
+            "username",
+            [],
+        )
+
+    async def get_user_roles(
+        self,
+        username: str,
+        use_cache: bool = True,
+    ) -> list[str]:
+        """
+        Get the user roles for a given user on the tenant.
+
+        :param username: A username on the tenant
+        :type username: str
+
+        :param use_cache:
+            Boolean choice of using a cached MAPI response. Defaults to True
+        :type use_cache: bool, optional
+
+        :return: List of roles the user has
+        :rtype: list[str]
+        """
+        response = await self.get_MAPI_request(
+            "/userAccounts/" + username,
+            use_cache,
+        )
+        return response.get("roles", {}).get("role")
+
+    async def is_user_admin(
+        self,
+        username: str,
+        use_cache: bool = True,
+    ) -> bool:
+        """
+        Predicate for checking if a given user has the admin role.
+
+        :param username: The user name
+        :type username: str
+
+        :param use_cache:
+            Boolean choice of using a cached MAPI response. Defaults to True
+        :type use_cache: bool, optional
+
+        :rtype: bool
+        """
+        return "ADMINISTRATOR" in await self.get_user_roles(
+            username,
+            use_cache,
+        )
+
+    # ---------------------------- Bucket methods ----------------------------
+
+    async def test_connection(self, bucket_name: str = "") -> dict:
+        """
+        Test the connection to the mounted bucket or another bucket which is
+        supplied as the argument :py:obj:`bucket_name`.
+
+        :param bucket_name:
+            The name of the bucket to be mounted. Defaults to the empty string
+        :type bucket_name: str, optional
+
+        :raises NoBucketMountedError: If no bucket is selected
+        :raises BucketNotFoundError: If no bucket of that name was found
+        :raises BucketForbiddenError: If the bucket can not be accessed
+
+        :return: A dictionary of the response
+        :rtype: dict
+        """
+        bucket_name = bucket_name or self.bucket_name or ""
+        if not bucket_name:
+            msg = (
+                "No bucket selected. Either use `mount_bucket` first or "
+                "supply the optional `bucket_name` parameter for "
+                "`test_connection`"
+            )
+            raise NoBucketMountedError(msg)
+
+        if self.s3_client is None:
+            await self.open()
+        try:
+            return dict(await self.s3_client.head_bucket(Bucket=bucket_name))
+        except ClientError as e:
+            status_code = e.response["ResponseMetadata"].get(
+                "HTTPStatusCode",
+                -1,
+            )
+            match status_code:
+                case 404:
+                    raise BucketNotFoundError(
+                        'Bucket "' + bucket_name + '" was not found',
+                    ) from e
+                case 403:
+                    raise BucketForbiddenError(
+                        'Bucket "'
+                        + bucket_name
+                        + '" could not be accessed due to lack of permissions',
+                    ) from e
+            raise
+
+    async def mount_bucket(self, bucket_name: str) -> None:
+        """
+        Mount bucket that is to be used. This method needs to executed in order
+        for most of the other methods to work.
+
+        :param bucket_name: The name of the bucket to be mounted
+        :type bucket_name: str
+        """
+        await self.test_connection(bucket_name=bucket_name)
+        self.bucket_name = bucket_name
+
+    async def list_buckets(
+        self,
+        output_mode: HCPHandler.ListBucketsOutputMode = (
+            HCPHandler.ListBucketsOutputMode.EXTENDED
+        ),
+        use_cache: bool = True,
+    ) -> list[dict[str, Any]]:
+        """
+        List all available buckets at endpoint along with statistics for each
+        bucket, see :py:meth:`NGPIris.hcp.hcp.HCPHandler.list_buckets`. The
+        MAPI requests of every bucket are made concurrently.
+
+        :param output_mode:
+            How much information to include for each bucket. Defaults to
+            EXTENDED
+        :type output_mode: HCPHandler.ListBucketsOutputMode, optional
+
+        :param use_cache:
+            Boolean choice of using cached MAPI responses. Defaults to True
+        :type use_cache: bool, optional
+
+        :return: A list of buckets and their statistics
+        :rtype: list[dict[str, Any]]
+        """
+        response = await self.get_MAPI_request("/namespaces", use_cache)
+        buckets: list[str] = response["name"]
+        if output_mode == HCPHandler.ListBucketsOutputMode.BUCKET_ONLY:
+            return [{"Bucket": bucket} for bucket in buckets]
+
+        all_stats, all_bucket_information = await asyncio.gather(
+            _gather_or_cancel(
+                self.get_MAPI_request(
+                    "/namespaces/" + bucket + "/statistics",
+                    use_cache,
+                )
+                for bucket in buckets
+            ),
+            _gather_or_cancel(
+                self.get_MAPI_request("/namespaces/" + bucket, use_cache)
+                for bucket in buckets
+            ),
+        )
+        return [
+            HCPHandler._format_bucket_dictionary(  # noqa: SLF001
+                bucket,
+                raw_stats,
+                raw_bucket_information,
+                output_mode,
+            )
+            for bucket, raw_stats, raw_bucket_information in zip(
+                buckets,
+                all_stats,
+                all_bucket_information,
+                strict=True,
+            )
+        ]
+
+    # ---------------------------- Object methods ----------------------------
+
+    @check_mounted
+    async def list_objects(
+        self,
+        path_key: str = "",
+        output_mode: HCPHandler.ListObjectsOutputMode = (
+            HCPHandler.ListObjectsOutputMode.EXTENDED
+        ),
+        files_only: bool = False,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        List the objects in one folder level of the mounted bucket as an async
+        generator, see :py:meth:`NGPIris.hcp.hcp.HCPHandler.list_objects`.
+
+        :param path_key:
+            Filter string for which keys to list, specifically for finding
+            objects in certain folders. Defaults to the root of the bucket
+        :type path_key: str, optional
+
+        :param output_mode: How much information to include for each object
+        :type output_mode: HCPHandler.ListObjectsOutputMode, optional
+
+        :param files_only: If True, only yield file objects. Defaults to False
+        :type files_only: bool, optional
+
+        :yield: The objects in the folder, folders first on every page
+        :rtype: AsyncGenerator[dict[str, Any], None]
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=path_key,
+            Delimiter="/",
+        ):
+            if not files_only:
+                folder_keys = [
+                    folder_object["Prefix"]
+                    for folder_object in page.get("CommonPrefixes", [])
+                ]
+                # Only look up folder metadata when it is part of the output
+                folder_stats = (
+                    await self.stat_many(folder_keys)
+                    if output_mode != HCPHandler.ListObjectsOutputMode.MINIMAL
+                    else {}
+                )
+                for key in folder_keys:
+                    folder_stat = folder_stats.get(key) or {}
+                    yield HCPHandler._format_object_dictionary(  # noqa: SLF001
+                        key,
+                        {
+                            "LastModified": folder_stat.get("LastModified", ""),
+                            "ETag": folder_stat.get("ETag", ""),
+                        },
+                        False,
+                        output_mode,
+                    )
+
+            for file_object_metadata in page.get("Contents", []):
+                key = file_object_metadata["Key"]
+                if key != path_key:
+                    yield HCPHandler._format_object_dictionary(  # noqa: SLF001
+                        key,
+                        file_object_metadata,
+                        True,
+                        output_mode,
+                    )
+
+    async def _list_all_objects(
+        self,
+        path_key: str,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        List every object under `path_key` in the mounted bucket, including
+        the objects in subfolders, as they are returned by the HCP.
+        """
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        async for page in paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=path_key,
+        ):
+            for hcp_object in page.get("Contents", []):
+                yield hcp_object
+
+    @check_mounted
+    async def get_object(self, key: str) -> dict:
+        """
+        Retrieve an object along with its metadata. Note that this opens a
+        stream to the object body, which has to be read or closed, use
+        :py:meth:`stat` if only the metadata is needed.
+
+        :param key: The object name
+        :type key: str
+
+        :return: A dictionary containing the object metadata
+        :rtype: dict
+        """
+        return dict(
+            await self.s3_client.get_object(Bucket=self.bucket_name, Key=key),
+        )
+
+    @check_mounted
+    async def stat(self, key: str) -> dict[str, Any]:
+        """
+        Retrieve the metadata of an object without fetching the object body.
+
+        :param key: The object name
+        :type key: str
+
+        :raises ObjectDoesNotExistError:
+            If the object does not exist in the bucket
+
+        :return:
+            A dictionary with the keys `"Key"`, `"Size"`, `"ETag"`,
+            `"LastModified"` and `"ContentType"`
+        :rtype: dict[str, Any]
+        """
+        try:
+            response = await self.s3_client.head_object(
+                Bucket=self.bucket_name,
+                Key=key,
+            )
+        except ClientError as e:
+            status_code = e.response["ResponseMetadata"].get(
+                "HTTPStatusCode",
+                -1,
+            )
+            if status_code == 404:  # noqa: PLR2004
+                msg = (
+                    'Could not find object "'
+                    + key
+                    + '" in bucket "'
+                    + str(self.bucket_name)
+                    + '"'
+                )
+                raise ObjectDoesNotExistError(msg) from None
+            raise
+
+        return {
+            "Key": key,
+            "Size": response["ContentLength"],
+            "ETag": response["ETag"],
+            "LastModified": response["LastModified"],
+            "ContentType": response.get("ContentType", ""),
+        }
+
+    @check_mounted
+    async def stat_many(
+        self,
+        keys: list[str],
+        max_concurrency: int = _DEFAULT_MAX_CONCURRENCY,
+    ) -> dict[str, dict[str, Any] | None]:
+        """
+        Retrieve the metadata of several objects concurrently, see
+        :py:meth:`stat`.
+
+        :param keys: The object names
+        :type keys: list[str]
+
+        :param max_concurrency:
+            The maximum number of requests that are running at the same time.
+            Defaults to 100
+        :type max_concurrency: int, optional
+
+        :return:
+            A dictionary from each key to its metadata, or to `None` if the
+            object does not exist. The keys are in the same order as `keys`
+        :rtype: dict[str, dict[str, Any] | None]
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _stat_or_none(key: str) -> dict[str, Any] | None:
+            async with semaphore:
+                try:
+                    return await self.stat(key)
+                except ObjectDoesNotExistError:
+                    return None
+
+        return dict(
+            zip(
+                keys,
+                await _gather_or_cancel(_stat_or_none(key) for key in keys),
+                strict=True,
+            ),
+        )
+
+    @check_mounted
+    async def object_exists(self, key: str) -> bool:
+        """
+        Check if a given object is in the mounted bucket.
+
+        :param key: The object name
+        :type key: str
+
+        :return: True if the object exist, otherwise False
+        :rtype: bool
+        """
+        try:
+            await self.stat(key)
+        except ObjectDoesNotExistError:
+            return False
+        return True
+
+    # ---------------------------- Transfer methods ----------------------------
+
+    @check_mounted
+    async def download_file(self, key: str, local_file_path: str) -> None:
+        """
+        Download one object file from the mounted bucket. Objects above the
+        multipart threshold are downloaded in byte ranges concurrently, and
+        every range is requested with `If-Match`, so that an object that
+        changes during the download is not mixed with the previous version.
+
+        :param key: Name of the object
+        :type key: str
+
+        :param local_file_path:
+            Path to a file on your local system where the contents of the
+            object file can be put
+        :type local_file_path: str
+
+        :raises ObjectDoesNotExistError:
+            If the object does not exist in the bucket
+        """
+        await self._download_file(await self.stat(key), local_file_path)
+
+    async def _download_file(
+        self,
+        hcp_object: dict[str, Any],
+        local_file_path: str,
+    ) -> None:
+        """
+        Download an object, given its metadata, to `local_file_path`.
+        """
+        size: int = hcp_object["Size"]
+        part_size = (
+            self.transfer_config.multipart_chunksize
+            if size >= self.transfer_config.multipart_threshold
+            else max(size, 1)
+        )
+        semaphore = asyncio.Semaphore(self.transfer_config.max_concurrency)
+        file_descriptor = await asyncio.to_thread(
+            os.open,
+            local_file_path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+            0o644,
+        )
+
+        async def _download_range(first_byte: int) -> None:
+            last_byte = min(first_byte + part_size, size) - 1
+            async with semaphore:
+                response = await self.s3_client.get_object(
+                    Bucket=self.bucket_name,
+                    Key=hcp_object["Key"],
+                    Range="bytes=" + str(first_byte) + "-" + str(last_byte),
+                    IfMatch=hcp_object["ETag"],
+                )
+                offset = first_byte
+                body = response["Body"]
+                async with body:
+                    async for chunk in body.iter_chunks(_MB):
+                        await asyncio.to_thread(
+                            os.pwrite,
+                            file_descriptor,
+                            chunk,
+                            offset,
+                        )
+                        offset += len(chunk)
+
+        try:
+            await _gather_or_cancel(
+                _download_range(first_byte)
+                for first_byte in range(0, size, part_size)
+            )
+        finally:
+            os.close(file_descriptor)
+
+    @check_mounted
+    async def download_folder(
+        self,
+        folder_key: str,
+        local_folder_path: str,
+        max_concurrency: int = _DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        """
+        Download every object in a folder of the mounted bucket, including
+        the objects in its subfolders. The objects are downloaded while the
+        folder is still being listed.
+
+        :param folder_key: Name of the folder
+        :type folder_key: str
+
+        :param local_folder_path:
+            Path to a folder on your local system where the contents of the
+            objects can be put
+        :type local_folder_path: str
+
+        :param max_concurrency:
+            The maximum number of objects that are downloaded at the same
+            time. Defaults to 100
+        :type max_concurrency: int, optional
+
+        :raises ObjectDoesNotExistError:
+            If the object does not exist in the bucket
+
+        :raises NotADirectoryError: If local_folder_path is not a directory
+        """
+        await self.stat(folder_key)
+        if not await asyncio.to_thread(Path(local_folder_path).is_dir):
+            raise NotADirectoryError(
+                local_folder_path + " is not a directory",
+            )
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _download(hcp_object: dict[str, Any]) -> None:
+            try:
+                local_file_path = Path(local_folder_path) / hcp_object["Key"]
+                local_file_path.parent.mkdir(parents=True, exist_ok=True)
+                await self._download_file(
+                    {
+                        "Key": hcp_object["Key"],
+                        "Size": hcp_object["Size"],
+                        "ETag": hcp_object["ETag"],
+                    },
+                    local_file_path.as_posix(),
+                )
+            finally:
+                semaphore.release()
+
+        tasks: list[asyncio.Task] = []
+        try:
+            async for hcp_object in self._list_all_objects(folder_key):
+                if hcp_object["Key"].endswith("/"):
+                    (Path(local_folder_path) / hcp_object["Key"]).mkdir(
+                        parents=True,
+                        exist_ok=True,
+                    )
+                    continue
+                # Listing waits for a free slot, which keeps the number of
+                # pending downloads bounded
+                await semaphore.acquire()
+                tasks.append(asyncio.create_task(_download(hcp_object)))
+            await _gather_or_cancel(tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    @check_mounted
+    async def upload_file(self, local_file_path: str, key: str = "") -> None:
+        r"""
+        Upload one file to the mounted bucket. Files above the multipart
+        threshold are uploaded in parts concurrently.
+
+        :param local_file_path: Path to the file to be uploaded
+        :type local_file_path: str
+
+        :param key:
+            An optional new name for the file object on the bucket. Defaults to
+            the same name as the file
+        :type key: str, optional
+
+        :raises FileNotFoundError: If `local_file_path` does not exist
+        :raises UnallowedCharacterError: If the path contains "\\"
+        :raises ObjectAlreadyExistError: If the object already exists
+        """
+        raise_path_error(local_file_path)
+        if not key:
+            key = Path(local_file_path).name
+        if "\\" in local_file_path:
+            msg = 'The "\\" character is not allowed in the file path'
+            raise UnallowedCharacterError(msg)
+        if await self.object_exists(key):
+            msg = 'The object "' + key + '" already exist in the mounted bucket'
+            raise ObjectAlreadyExistError(msg)
+        await self._upload_file(
+            local_file_path,
+            key,
+            (await asyncio.to_thread(Path(local_file_path).stat)).st_size,
+        )
+
+    async def _upload_file(
+        self,
+        local_file_path: str,
+        key: str,
+        size: int,
+        *,
+        part_semaphore: asyncio.Semaphore | None = None,
+    ) -> None:
+        """
+        Upload a local file of `size` bytes to `key`, with a multipart upload
+        above the multipart threshold. A failed multipart upload is aborted.
+
+        Every part, or the whole file below the multipart threshold, is read
+        into memory while it holds `part_semaphore`. Uploads that share it are
+        thereby bounded together in memory. Defaults to a semaphore of
+        `transfer_config.max_concurrency` for this file only.
+        """
+        if part_semaphore is None:
+            part_semaphore = asyncio.Semaphore(
+                self.transfer_config.max_concurrency,
+            )
+        if size < self.transfer_config.multipart_threshold:
+            async with part_semaphore:
+                body = await asyncio.to_thread(
+                    Path(local_file_path).read_bytes,
+                )
+                await self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Body=body,
+                )
+            return
+
+        part_size = max(
+            self.transfer_config.multipart_chunksize,
+            -(-size // _MAX_PARTS),  # Ceiling
+        )
+        upload_id: str = (
+            await self.s3_client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+            )
+        )["UploadId"]
+
+        async def _upload_part(part_number: int) -> dict[str, Any]:
+            async with part_semaphore:
+                body = await asyncio.to_thread(
+                    _read_part,
+                    local_file_path,
+                    (part_number - 1) * part_size,
+                    part_size,
+                )
+                response = await self.s3_client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+
+        try:
+            parts = await _gather_or_cancel(
+                _upload_part(part_number)
+                for part_number in range(1, -(-size // part_size) + 1)
+            )
+            await self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except BaseException:
+            # The parts would otherwise keep taking up space on the namespace
+            with suppress(ClientError):
+                await self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    UploadId=upload_id,
+                )
+            raise
+
+    @check_mounted
+    async def upload_folder(
+        self,
+        local_folder_path: str,
+        key: str = "",
+        max_concurrency: int = _DEFAULT_MAX_CONCURRENCY,
+    ) -> list[dict[str, Any]]:
+        """
+        Upload the contents of a folder, including all of its subfolders, to
+        the mounted bucket, see
+        :py:meth:`NGPIris.hcp.hcp.HCPHandler.upload_folder`. Objects that
+        already exist are not overwritten, and a file that can not be uploaded
+        does not stop the rest of the upload.
+
+        :param local_folder_path: Path to the folder to be uploaded
+        :type local_folder_path: str
+
+        :param key:
+            An optional new name for the folder path on the bucket. Defaults to
+            the same name as the local folder path
+        :type key: str, optional
+
+        :param max_concurrency:
+            The maximum number of files that are uploaded at the same time.
+            Their parts share `transfer_config.max_concurrency` slots, which
+            bounds how much of the files is in memory at once. Defaults to 100
+        :type max_concurrency: int, optional
+
+        :raises FileNotFoundError: If `local_folder_path` does not exist
+
+        :return:
+            One dictionary per file with the keys `"Path"`, `"Key"`, `"Status"`
+            and `"Error"`, where `"Status"` is a `HCPHandler.UploadStatus`
+        :rtype: list[dict[str, Any]]
+        """
+        raise_path_error(local_folder_path)
+        if not key:
+            key = local_folder_path
+        existing_keys = {
+            hcp_object["Key"]
+            async for hcp_object in self._list_all_objects(key)
+        }
+        local_files = await asyncio.to_thread(
+            list,
+            walk_files(local_folder_path),
+        )
+        semaphore = asyncio.Semaphore(max_concurrency)
+        part_semaphore = asyncio.Semaphore(self.transfer_config.max_concurrency)
+
+        async def _upload(
+            local_file_path: str,
+            file_key: str,
+            file_size: int,
+        ) -> dict[str, Any]:
+            result = {
+                "Path": local_file_path,
+                "Key": file_key,
+                "Status": HCPHandler.UploadStatus.UPLOADED,
+                "Error": "",
+            }
+            if file_key in existing_keys:
+                return result | {
+                    "Status": HCPHandler.UploadStatus.ALREADY_EXISTS,
+                }
+            async with semaphore:
+                try:
+                    if "\\" in local_file_path:
+                        msg = (
+                            'The "\\" character is not allowed in the file path'
+                        )
+                        raise UnallowedCharacterError(msg)  # noqa: TRY301
+                    await self._upload_file(
+                        local_file_path,
+                        file_key,
+                        file_size,
+                        part_semaphore=part_semaphore,
+                    )
+                except Exception as e:  # noqa: BLE001
+                    return result | {
+                        "Status": HCPHandler.UploadStatus.FAILED,
+                        "Error": str(e),
+                    }
+            return result
+
+        return await _gather_or_cancel(
+            _upload(local_file_path, key + relative_path, file_size)
+            for local_file_path, relative_path, file_size in local_files
+        )
+
+    # ---------------------------- Delete methods ----------------------------
+
+    @check_mounted
+    async def delete_objects(
+        self,
+        keys: list[str],
+        max_concurrency: int = _DEFAULT_MAX_CONCURRENCY,
+    ) -> dict[str, Any]:
+        """
+        Delete a list of objects on the mounted bucket, in concurrent batches
+        of 1000, see :py:meth:`NGPIris.hcp.hcp.HCPHandler.delete_objects`.
+
+        :param keys: List of object names to be deleted
+        :type keys: list[str]
+
+        :param max_concurrency:
+            The maximum number of requests that are running at the same time.
+            Defaults to 100
+        :type max_concurrency: int, optional
+
+        :raises IsFolderObjectError: If the provided object is a folder object
+
+        :return:
+            A dictionary with the keys `"Deleted"`, `"Errors"`,
+            `"DeletedCount"` and `"ErrorCount"`
+        :rtype: dict[str, Any]
+        """
+        for key in keys:
+            if key.endswith("/"):
+                raise IsFolderObjectError(
+                    'The object "'
+                    + key
+                    + '" is a folder object. Please use the `delete_folder`'
+                    + "method for this object",
+                )
+        return await self._delete_keys(keys, max_concurrency)
+
+    async def _delete_keys(
+        self,
+        keys: list[str],
+        max_concurrency: int,
+    ) -> dict[str, Any]:
+        """
+        Delete `keys` from the mounted bucket in concurrent batches, without
+        checking them first.
+
+        :return: See :py:meth:`delete_objects`
+        :rtype: dict[str, Any]
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _delete_batch(
+            batch: list[str],
+        ) -> tuple[list[str], list[dict[str, str]]]:
+            try:
+                async with semaphore:
+                    response = await self.s3_client.delete_objects(
+                        Bucket=self.bucket_name,
+                        Delete={
+                            "Objects": [{"Key": key} for key in batch],
+                            "Quiet": False,
+                        },
+                    )
+            except ClientError as e:
+                # The whole batch failed, for example because of permissions
+                error = e.response.get("Error", {})
+                return [], [
+                    {
+                        "Key": key,
+                        "Code": error.get("Code", ""),
+                        "Message": error.get("Message", str(e)),
+                    }
+                    for key in batch
+                ]
+            return [
+                deleted_object["Key"]
+                for deleted_object in response.get("Deleted", [])
+            ], [
+                {
+                    "Key": error["Key"],
+                    "Code": error.get("Code", ""),
+                    "Message": error.get("Message", ""),
+                }
+                for error in response.get("Errors", [])
+            ]
+
+        deleted: list[str] = []
+        errors: list[dict[str, str]] = []
+        for batch_deleted, batch_errors in await _gather_or_cancel(
+            _delete_batch(keys[i : i + _DELETE_BATCH_SIZE])
+            for i in range(0, len(keys), _DELETE_BATCH_SIZE)
+        ):
+            deleted.extend(batch_deleted)
+            errors.extend(batch_errors)
+        return {
+            "Deleted": deleted,
+            "Errors": errors,
+            "DeletedCount": len(deleted),
+            "ErrorCount": len(errors),
+        }
+
+    @check_mounted
+    async def delete_object(self, key: str) -> dict[str, Any]:
+        """
+        Delete a single object in the mounted bucket.
+
+        :param key: The object to be deleted
+        :type key: str
+
+        :raises IsFolderObjectError: If the provided object is a folder object
+
+        :return: The result of the deletion, see :py:meth:`delete_objects`
+        :rtype: dict[str, Any]
+        """
+        return await self.delete_objects([key])
+
+    @check_mounted
+    async def delete_folder(
+        self,
+        key: str,
+        recursive: bool = False,
+        max_concurrency: int = _DEFAULT_MAX_CONCURRENCY,
+    ) -> dict[str, Any]:
+        """
+        Delete a folder of objects in the mounted bucket, see
+        :py:meth:`NGPIris.hcp.hcp.HCPHandler.delete_folder`. If there are
+        subfolders and `recursive` is False, a `SubfolderError` is raised.
+
+        :param key: The folder of objects to be deleted
+        :type key: str
+
+        :param recursive:
+            Boolean choice of also deleting every subfolder and the objects in
+            them. Defaults to False
+        :type recursive: bool, optional
+
+        :param max_concurrency:
+            The maximum number of requests that are running at the same time.
+            Defaults to 100
+        :type max_concurrency: int, optional
+
+        :raises ObjectDoesNotExistError: If the folder does not exist
+
+        :raises SubfolderError: If there are subfolders
+
+        :return:
+            The result of the deletion, including the folder object itself,
+            see :py:meth:`delete_objects`
+        :rtype: dict[str, Any]
+        """
+        if not key.endswith("/"):
+            key += "/"
+
+        keys = [
+            hcp_object["Key"]
+            async for hcp_object in self._list_all_objects(key)
+            if hcp_object["Key"] != key
+        ]
+        if not keys and not await self.object_exists(key):
+            raise ObjectDoesNotExistError('"' + key + '"' + " does not exist")
+        if not recursive:
+            for object_key in keys:
+                if "/" in object_key.removeprefix(key):
+                    raise SubfolderError(
+                        'There is at least one subfolder in "'
+                        + key
+                        + '". Please remove all subfolders before deleting "'
+                        + key
+                        + '" itself, or use `recursive=True`',
+                    )
+
+        # The folder object itself is deleted along with the file objects
+        return await self._delete_keys([*keys, key], max_concurrency)
@@ -0,0 +1,247 @@
+from json import JSONDecodeError, dump, load
+from os import getpid
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+
+from boto3.s3.transfer import TransferConfig
+
+_MB = 1024 * 1024
+
+# The bounds of the tuned settings. Parts must be at least 5 MiB, apart from
+# the last one, and a single part is capped to keep retries cheap
+MIN_CHUNKSIZE = 5 * _MB
+MAX_CHUNKSIZE = 512 * _MB
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 64
+
+# The number of seconds of transfer that each adjustment is based on
+_WINDOW_SECONDS = 2.0
+
+# The number of seconds that one part should take, which the chunk size is
+# steered towards
+_TARGET_PART_SECONDS = 4.0
+
+# The additive increase of the chunk size
+_CHUNKSIZE_STEP = 8 * _MB
+
+# The relative change in throughput between two windows that is considered
+# noise rather than an effect of the previous adjustment
+_TOLERANCE = 0.05
+
+# The multiplicative decrease of the concurrency when the throughput drops,
+# and when a request fails
+_DECREASE_FACTOR = 0.75
+_ERROR_DECREASE_FACTOR = 0.5
+
+
+class TransferTuner:
+    """
+    Class for tuning the concurrency and the chunk size of transfers while
+    they run, with additive increase and multiplicative decrease (AIMD).
+
+    The throughput of all transfers together is measured in windows of a few
+    seconds. The concurrency is increased by one for as long as the throughput
+    keeps improving, and decreased by a factor when it drops or when a request
+    fails. The chunk size is steered towards parts that take a few seconds
+    each, based on the time that the parts take. The settings are kept per
+    endpoint, optionally in a JSON file, so that later sessions start near
+    the settings that earlier sessions converged on.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        tuning_path: str = "",
+        transfer_config: TransferConfig | None = None,
+    ) -> None:
+        """
+        Constructor for the `TransferTuner` class.
+
+        :param endpoint: The endpoint that the settings are tuned for
+        :type endpoint: str
+
+        :param tuning_path:
+            Path to a JSON file where the tuned settings of every endpoint are
+            kept between sessions. Defaults to the empty string, which means
+            that the settings are kept in memory only
+        :type tuning_path: str, optional
+
+        :param transfer_config:
+            The transfer config to start from when there are no earlier
+            settings for `endpoint`. Defaults to the default of boto3
+        :type transfer_config: TransferConfig | None, optional
+        """
+        self.endpoint = endpoint
+        self.tuning_path = tuning_path
+        base_config = transfer_config or TransferConfig()
+        self.multipart_threshold: int = base_config.multipart_threshold
+        self.use_threads: bool = base_config.use_threads
+        self.concurrency: int = base_config.max_concurrency
+        self.chunksize: int = base_config.multipart_chunksize
+        self._lock = Lock()
+        self._previous_throughput = 0.0
+        self._window_start = monotonic()
+        self._last_record = self._window_start
+        self._window_bytes = 0
+        self._part_bytes = 0
+        self._part_seconds = 0.0
+        self._load()
+        self.concurrency, self.chunksize = self._clamp(
+            self.concurrency,
+            self.chunksize,
+        )
+
+    @staticmethod
+    def _clamp(concurrency: int, chunksize: int) -> tuple[int, int]:
+        """
+        Keep the settings within bounds, with chunk sizes in whole MiB.
+        """
+        return (
+            min(max(concurrency, MIN_CONCURRENCY), MAX_CONCURRENCY),
+            min(max(chunksize // _MB * _MB, MIN_CHUNKSIZE), MAX_CHUNKSIZE),
+        )
+
+    def _load(self) -> None:
+        """
+        Start from the settings that were saved for the endpoint, if any.
+        """
+        if not self.tuning_path or not Path(self.tuning_path).is_file():
+            return
+        try:
+            with Path(self.tuning_path).open() as f:
+                settings = load(f).get(self.endpoint, {})
+            self.concurrency = int(
+                settings.get("max_concurrency", self.concurrency),
+            )
+            self.chunksize = int(
+                settings.get("multipart_chunksize", self.chunksize),
+            )
+        except (OSError, JSONDecodeError, ValueError, AttributeError):
+            # A broken file is treated as a file without settings
+            return
+
+    def _save(self) -> None:
+        """
+        Write the settings of the endpoint to the JSON file, if there is one,
+        keeping the settings of other endpoints. Must be called while holding
+        the lock.
+        """
+        if not self.tuning_path:
+            return
+        path = Path(self.tuning_path)
+        try:
+            with path.open() as f:
+                all_settings = load(f)
+            if not isinstance(all_settings, dict):
+                all_settings = {}
+        except (OSError, JSONDecodeError):
+            all_settings = {}
+        all_settings[self.endpoint] = {
+            "max_concurrency": self.concurrency,
+            "multipart_chunksize": self.chunksize,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(
+            path.name + "." + str(getpid()) + ".tmp",
+        )
+        with temporary_path.open("w") as f:
+            dump(all_settings, f)
+        temporary_path.replace(path)
+
+    def get_transfer_config(self) -> TransferConfig:
+        """
+        Get a transfer config with the current settings.
+
+        :return: The transfer config for the next transfer
+        :rtype: TransferConfig
+        """
+        with self._lock:
+            return TransferConfig(
+                multipart_threshold=self.multipart_threshold,
+                max_concurrency=self.concurrency,
+                multipart_chunksize=self.chunksize,
+                use_threads=self.use_threads,
+            )
+
+    def record(self, bytes_transferred: int) -> None:
+        """
+        Record bytes that have been transferred, such as from the progress
+        callback of a transfer. The settings are adjusted at the end of every
+        window. A pause between transfers starts a new window, so that idle
+        time is not taken for a drop in throughput.
+
+        :param bytes_transferred: The number of bytes
+        :type bytes_transferred: int
+        """
+        with self._lock:
+            now = monotonic()
+            if now - self._last_record > _WINDOW_SECONDS:
+                self._window_start = now
+                self._window_bytes = 0
+            self._last_record = now
+            self._window_bytes += bytes_transferred
+            elapsed = now - self._window_start
+            if elapsed >= _WINDOW_SECONDS:
+                self._adjust(self._window_bytes / elapsed)
+
+    def record_part(self, part_bytes: int, seconds: float) -> None:
+        """
+        Record the time that one part took, from sending the request to
+        receiving the last byte.
+
+        :param part_bytes: The size of the part in bytes
+        :type part_bytes: int
+
+        :param seconds: The number of seconds that the part took
+        :type seconds: float
+        """
+        with self._lock:
+            self._part_bytes += part_bytes
+            self._part_seconds += seconds
+
+    def record_error(self) -> None:
+        """
+        Record a failed request, which decreases the concurrency right away.
+        """
+        with self._lock:
+            self.concurrency, self.chunksize = self._clamp(
+                max(1, int(self.concurrency * _ERROR_DECREASE_FACTOR)),
+                self.chunksize,
+            )
+            self._previous_throughput = 0.0
+            self._save()
+
+    def _adjust(self, throughput: float) -> None:
+        """
+        Adjust the settings based on the throughput of the last window. Must be
+        called while holding the lock.
+        """
+        concurrency, chunksize = self.concurrency, self.chunksize
+        if throughput > self._previous_throughput * (1 + _TOLERANCE):
+            concurrency += 1
+        elif throughput < self._previous_throughput * (1 - _TOLERANCE):
+            concurrency = max(1, int(concurrency * _DECREASE_FACTOR))
+
+        # The throughput of a single part, measured if there were any timed
+        # parts and otherwise estimated
+        part_throughput = (
+            self._part_bytes / self._part_seconds
+            if self._part_seconds
+            else throughput / concurrency
+        )
+        part_seconds = chunksize / part_throughput if part_throughput else 0
+        if part_seconds < _TARGET_PART_SECONDS / 2:
+            chunksize += _CHUNKSIZE_STEP
+        elif part_seconds > _TARGET_PART_SECONDS * 2:
+            chunksize //= 2
+
+        self._previous_throughput = throughput
+        self._window_start = monotonic()
+        self._window_bytes = 0
+        self._part_bytes = 0
+        self._part_seconds = 0.0
+        concurrency, chunksize = self._clamp(concurrency, chunksize)
+        if (concurrency, chunksize) != (self.concurrency, self.chunksize):
+            self.concurrency, self.chunksize = concurrency, chunksize
+            self._save()
@@ -0,0 +1,233 @@
+import re
+import sys
+from collections.abc import Generator
+from contextlib import contextmanager
+from json import JSONDecodeError, dump, load
+from os import getpid
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+# The MAPI endpoint classes and the paths that belong to them
+_ENDPOINT_CLASSES = [
+    (re.compile(r"^/namespaces$"), "namespaces"),
+    (re.compile(r"^/namespaces/[^/]+$"), "namespace_settings"),
+    (re.compile(r"^/namespaces/[^/]+/statistics$"), "statistics"),
+    (re.compile(r"^/userAccounts$"), "users"),
+    (re.compile(r"^/userAccounts/[^/]+$"), "user_roles"),
+]
+
+# Time to live in seconds for each endpoint class
+DEFAULT_TTLS: dict[str, float] = {
+    "namespaces": 300,
+    "namespace_settings": 300,
+    "statistics": 60,
+    "users": 600,
+    "user_roles": 600,
+    "other": 60,
+}
+
+
+def get_endpoint_class(path_extension: str) -> str:
+    """
+    Get the endpoint class of a MAPI path, which decides how long a response
+    from that path is cached.
+
+    :param path_extension: Extension for the base MAPI request URL
+    :type path_extension: str
+
+    :return: The endpoint class, or `"other"` if the path is not recognised
+    :rtype: str
+    """
+    for pattern, endpoint_class in _ENDPOINT_CLASSES:
+        if pattern.match(path_extension):
+            return endpoint_class
+    return "other"
+
+
+@contextmanager
+def _lock_file(lock_path: Path) -> Generator[None, None, None]:
+    """
+    Hold an exclusive lock on `lock_path` across processes, waiting for any
+    other process that holds it.
+    """
+    with lock_path.open("a+b") as lock_file:
+        if sys.platform == "win32":
+            # Locks the first byte, retrying for up to 10 seconds
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class MAPICache:
+    """
+    Class for caching MAPI responses with a time to live per endpoint class.
+    The cache is kept in memory and, optionally, in a JSON file so that it can
+    be shared between processes. Every write re-reads the file and applies
+    only its own change to it while holding a lock file next to it, so that
+    processes using the same file do not drop the entries of each other.
+    """
+
+    def __init__(
+        self,
+        cache_path: str = "",
+        ttls: dict[str, float] | None = None,
+        enabled: bool = True,
+    ) -> None:
+        """
+        Constructor for the `MAPICache` class.
+
+        :param cache_path:
+            Path to a JSON file used as a backing store for the cache. Defaults
+            to the empty string, which means that the cache is kept in memory
+            only
+        :type cache_path: str, optional
+
+        :param ttls:
+            Time to live in seconds for each endpoint class. Classes that are
+            not given fall back on `DEFAULT_TTLS`
+        :type ttls: dict[str, float] | None, optional
+
+        :param enabled:
+            Boolean choice of using the cache at all. Defaults to True
+        :type enabled: bool, optional
+        """
+        self.cache_path = cache_path
+        self.ttls = DEFAULT_TTLS | (ttls or {})
+        self.enabled = enabled
+        self._lock = Lock()
+        self._entries = self._read()
+
+    def get(self, key: str) -> Any:  # noqa: ANN401
+        """
+        Get a cached value that has not yet expired.
+
+        :param key: The cache key
+        :type key: str
+
+        :return: The cached value, or `None` if there is none
+        :rtype: Any
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: str, value: Any, endpoint_class: str) -> None:  # noqa: ANN401
+        """
+        Cache a value for the time to live of its endpoint class.
+
+        :param key: The cache key
+        :type key: str
+
+        :param value: The value to be cached. Must be JSON serialisable
+        :type value: Any
+
+        :param endpoint_class: The endpoint class of the cached response
+        :type endpoint_class: str
+        """
+        ttl = self.ttls.get(endpoint_class, self.ttls["other"])
+        if not self.enabled or ttl <= 0:
+            return
+        with self._lock:
+            self._save({key: (time() + ttl, value)})
+
+    def invalidate(self, key_prefix: str = "") -> None:
+        """
+        Remove every cached value with a key that starts with `key_prefix`.
+
+        :param key_prefix:
+            The prefix of the keys to be removed. Defaults to the empty string,
+            which clears the whole cache
+        :type key_prefix: str, optional
+        """
+        with self._lock:
+            self._save({}, key_prefix)
+
+    def _read(self) -> dict[str, tuple[float, Any]]:
+        """
+        Read the entries in the backing store, if there is one.
+        """
+        if not self.cache_path or not Path(self.cache_path).is_file():
+            return {}
+        try:
+            with Path(self.cache_path).open() as f:
+                return {
+                    key: (expires_at, value)
+                    for key, (expires_at, value) in load(f).items()
+                }
+        except (OSError, JSONDecodeError, ValueError):
+            # A broken cache file is treated as an empty cache
+            return {}
+
+    def _save(
+        self,
+        updated_entries: dict[str, tuple[float, Any]],
+        invalidated_prefix: str | None = None,
+    ) -> None:
+        """
+        Apply a change to the cache and to the backing store, if there is one.
+        The backing store is read again under the lock file, so that the
+        entries that other processes have written since are kept, and the
+        cache in memory is replaced with the result. Expired entries are
+        dropped. Must be called while holding the lock.
+
+        :param updated_entries: The entries that were set
+        :type updated_entries: dict[str, tuple[float, Any]]
+
+        :param invalidated_prefix:
+            The prefix of the keys to be removed. Defaults to None, which
+            removes nothing
+        :type invalidated_prefix: str | None, optional
+        """
+
+        def _apply(
+            entries: dict[str, tuple[float, Any]],
+        ) -> dict[str, tuple[float, Any]]:
+            now = time()
+            return {
+                key: entry
+                for key, entry in (entries | updated_entries).items()
+                if entry[0] > now
+                and (
+                    invalidated_prefix is None
+                    or not key.startswith(invalidated_prefix)
+                )
+            }
+
+        if not self.cache_path:
+            self._entries = _apply(self._entries)
+            return
+        path = Path(self.cache_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _lock_file(path.with_name(path.name + ".lock")):
+            self._entries = _apply(self._read())
+            temporary_path = path.with_name(
+                path.name + "." + str(getpid()) + ".tmp",
+            )
+            with temporary_path.open("w") as f:
+                dump(self._entries, f)
+            temporary_path.replace(path)
@@ -0,0 +1,300 @@
+from abc import ABC, abstractmethod
+from json import JSONDecodeError, dumps, loads
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+# The suffixes of the partial file and its checkpoint next to a download
+PART_SUFFIX = ".part"
+CHECKPOINT_SUFFIX = ".checkpoint"
+
+# The suffix of the checkpoint next to a file that is uploaded
+UPLOAD_SUFFIX = ".upload"
+
+
+class Checkpoint(ABC):
+    """
+    Base class for the sidecar files that keep track of interrupted transfers.
+
+    The first line of a checkpoint is a JSON header describing the transfer,
+    and every following line records one completed piece of it. Lines are only
+    appended, and a line that was cut off by a crash is ignored when the
+    checkpoint is read.
+    """
+
+    def __init__(self, checkpoint_path: str) -> None:
+        """
+        Constructor for the `Checkpoint` class. An existing checkpoint at
+        `checkpoint_path` is read.
+
+        :param checkpoint_path: Path to the checkpoint file
+        :type checkpoint_path: str
+        """
+        self.checkpoint_path = Path(checkpoint_path)
+        self.header: dict[str, Any] = {}
+        self._lock = Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """
+        Read the header and the completed pieces of an existing checkpoint.
+        Unreadable checkpoints are treated as missing.
+        """
+        try:
+            lines = self.checkpoint_path.read_text().split("\n")
+            header = loads(lines[0])
+        except (OSError, JSONDecodeError):
+            return
+        if not isinstance(header, dict):
+            return
+        self.header = header
+        # The last element is whatever followed the last newline, which is
+        # either empty or a line that was never finished
+        for line in lines[1:-1]:
+            self._parse_line(line)
+
+    @abstractmethod
+    def _parse_line(self, line: str) -> None:
+        """
+        Record the completed piece that `line` describes.
+        """
+
+    def _write_header(self, header: dict[str, Any]) -> None:
+        """
+        Start the checkpoint over with `header` and nothing completed.
+        """
+        self.header = header
+        self.checkpoint_path.write_text(dumps(header) + "\n")
+
+    def _append(self, line: str) -> None:
+        """
+        Append one completed piece to the checkpoint.
+        """
+        with self.checkpoint_path.open("a") as checkpoint_file:
+            checkpoint_file.write(line + "\n")
+
+    def remove(self) -> None:
+        """
+        Remove the checkpoint file.
+        """
+        self.checkpoint_path.unlink(missing_ok=True)
+
+
+class DownloadCheckpoint(Checkpoint):
+    """
+    Class for keeping track of the byte ranges of a download that have been
+    written to its partial file, so that an interrupted download can be
+    resumed. Every line after the header is the first byte of a completed
+    range.
+    """
+
+    def __init__(self, checkpoint_path: str) -> None:
+        """
+        Constructor for the `DownloadCheckpoint` class. An existing checkpoint
+        at `checkpoint_path` is read.
+
+        :param checkpoint_path: Path to the checkpoint file
+        :type checkpoint_path: str
+        """
+        self.completed: set[int] = set()
+        super().__init__(checkpoint_path)
+
+    def _parse_line(self, line: str) -> None:
+        if line.isdigit():
+            self.completed.add(int(line))
+
+    def matches(self, key: str, etag: str, size: int) -> bool:
+        """
+        Check if the checkpoint belongs to the current version of an object.
+
+        :param key: The key of the object
+        :type key: str
+
+        :param etag: The current ETag of the object
+        :type etag: str
+
+        :param size: The current size of the object in bytes
+        :type size: int
+
+        :return: True if the partial file can be resumed
+        :rtype: bool
+        """
+        return (
+            self.header.get("Key") == key
+            and self.header.get("ETag") == etag
+            and self.header.get("Size") == size
+            and self.header.get("PartSize", 0) > 0
+        )
+
+    def reset(self, key: str, etag: str, size: int, part_size: int) -> None:
+        """
+        Start a new checkpoint without any completed ranges.
+
+        :param key: The key of the object
+        :type key: str
+
+        :param etag: The ETag of the object
+        :type etag: str
+
+        :param size: The size of the object in bytes
+        :type size: int
+
+        :param part_size: The size of each range in bytes
+        :type part_size: int
+        """
+        with self._lock:
+            self._write_header(
+                {
+                    "Key": key,
+                    "ETag": etag,
+                    "Size": size,
+                    "PartSize": part_size,
+                },
+            )
+            self.completed = set()
+
+    def get_missing_ranges(self) -> list[tuple[int, int]]:
+        """
+        Get the byte ranges that have not been completed yet.
+
+        :return: The first and the last byte of every missing range, in order
+        :rtype: list[tuple[int, int]]
+        """
+        size: int = self.header["Size"]
+        part_size: int = self.header["PartSize"]
+        return [
+            (first_byte, min(first_byte + part_size, size) - 1)
+            for first_byte in range(0, size, part_size)
+            if first_byte not in self.completed
+        ]
+
+    def add(self, first_byte: int) -> None:
+        """
+        Record that the range starting at `first_byte` has been written to the
+        partial file.
+
+        :param first_byte: The first byte of the completed range
+        :type first_byte: int
+        """
+        with self._lock:
+            self._append(str(first_byte))
+            self.completed.add(first_byte)
+
+
+class UploadCheckpoint(Checkpoint):
+    """
+    Class for keeping track of a multipart upload of a local file, so that an
+    interrupted upload can be resumed by another process. The header holds
+    the upload ID, and every line after it is the number and the ETag of a
+    completed part.
+    """
+
+    def __init__(self, checkpoint_path: str) -> None:
+        """
+        Constructor for the `UploadCheckpoint` class. An existing checkpoint
+        at `checkpoint_path` is read.
+
+        :param checkpoint_path: Path to the checkpoint file
+        :type checkpoint_path: str
+        """
+        self.parts: dict[int, str] = {}
+        super().__init__(checkpoint_path)
+
+    def _parse_line(self, line: str) -> None:
+        part_number, _, etag = line.partition(" ")
+        if part_number.isdigit() and etag:
+            self.parts[int(part_number)] = etag
+
+    def matches(
+        self,
+        bucket: str,
+        key: str,
+        size: int,
+        modified_ns: int,
+    ) -> bool:
+        """
+        Check if the checkpoint belongs to an upload of the current version of
+        a local file to the same object.
+
+        :param bucket: The bucket of the object
+        :type bucket: str
+
+        :param key: The key of the object
+        :type key: str
+
+        :param size: The current size of the file in bytes
+        :type size: int
+
+        :param modified_ns: The current modification time of the file in ns
+        :type modified_ns: int
+
+        :return: True if the upload can be resumed
+        :rtype: bool
+        """
+        return (
+            self.header.get("Bucket") == bucket
+            and self.header.get("Key") == key
+            and self.header.get("Size") == size
+            and self.header.get("ModifiedNs") == modified_ns
+            and self.header.get("PartSize", 0) > 0
+            and bool(self.header.get("UploadId"))
+        )
+
+    def reset(  # noqa: PLR0913
+        self,
+        bucket: str,
+        key: str,
+        *,
+        size: int,
+        modified_ns: int,
+        part_size: int,
+        upload_id: str,
+    ) -> None:
+        """
+        Start a new checkpoint for the multipart upload `upload_id`, without
+        any completed parts.
+
+        :param bucket: The bucket of the object
+        :type bucket: str
+
+        :param key: The key of the object
+        :type key: str
+
+        :param size: The size of the file in bytes
+        :type size: int
+
+        :param modified_ns: The modification time of the file in ns
+        :type modified_ns: int
+
+        :param part_size: The size of each part in bytes
+        :type part_size: int
+
+        :param upload_id: The ID of the multipart upload
+        :type upload_id: str
+        """
+        with self._lock:
+            self._write_header(
+                {
+                    "Bucket": bucket,
+                    "Key": key,
+                    "Size": size,
+                    "ModifiedNs": modified_ns,
+                    "PartSize": part_size,
+                    "UploadId": upload_id,
+                },
+            )
+            self.parts = {}
+
+    def add(self, part_number: int, etag: str) -> None:
+        """
+        Record that part `part_number` has been uploaded.
+
+        :param part_number: The number of the part, starting from 1
+        :type part_number: int
+
+        :param etag: The ETag that the HCP gave the part
+        :type etag: str
+        """
+        with self._lock:
+            self._append(str(part_number) + " " + etag)
+            self.parts[part_number] = etag
@@ -0,0 +1,464 @@
+import io
+import mmap
+from collections.abc import Iterable
+from hashlib import md5, sha256
+from json import dumps
+from pathlib import Path
+from queue import Queue
+from threading import Thread
+from types import TracebackType
+from typing import Any, BinaryIO, Self
+
+from NGPIris.hcp.helpers import get_part_size_candidates
+
+# The suffix of the checksum manifest next to a transferred file
+MANIFEST_SUFFIX = ".checksums"
+
+# The number of chunks that are queued for hashing before the transfer waits
+_QUEUE_DEPTH = 8
+
+# The number of bytes of a memory mapped file that are hashed at a time, so
+# that every part size candidate hashes a block while it is in the page cache
+_MAP_BLOCK_SIZE = 8 * 1024 * 1024
+
+
+class Checksums:
+    """
+    Class for calculating the checksums of a stream of bytes incrementally:
+    the multipart ETags that the HCP gives the bytes when they are uploaded in
+    parts of any of `part_sizes`, and optionally the MD5 and the SHA-256.
+    """
+
+    def __init__(
+        self,
+        part_sizes: Iterable[int] = (),
+        include_md5: bool = True,
+        include_sha256: bool = False,
+    ) -> None:
+        """
+        Constructor for the `Checksums` class.
+
+        :param part_sizes:
+            The part sizes in bytes to calculate multipart ETags for. Defaults
+            to none, which means that only single part ETags can be matched
+        :type part_sizes: Iterable[int], optional
+
+        :param include_md5:
+            Boolean choice of calculating the MD5 of the whole stream, which
+            single part ETags are matched with. Without it, only multipart
+            ETags can be matched. Defaults to True
+        :type include_md5: bool, optional
+
+        :param include_sha256:
+            Boolean choice of also calculating the SHA-256. Defaults to False
+        :type include_sha256: bool, optional
+        """
+        self.size = 0
+        self._md5 = md5() if include_md5 else None  # noqa: S324
+        self._sha256 = sha256() if include_sha256 else None
+        self._part_hashes = {
+            part_size: md5()  # noqa: S324
+            for part_size in part_sizes
+            if part_size > 0
+        }
+        self._part_digests: dict[int, list[bytes]] = {
+            part_size: [] for part_size in self._part_hashes
+        }
+
+    def update(self, data: bytes) -> None:
+        """
+        Hash the next bytes of the stream.
+
+        :param data: The bytes that follow the bytes hashed so far
+        :type data: bytes
+        """
+        view = memoryview(data)
+        for part_size, part_digests in self._part_digests.items():
+            offset = 0
+            while offset < len(view):
+                position = self.size + offset
+                n = min(len(view) - offset, part_size - position % part_size)
+                if position < part_size and self._md5 is not None:
+                    # The first part is the start of the stream, so its MD5 is
+                    # taken from the MD5 of the stream rather than calculated
+                    # twice, which makes single part candidates free
+                    if position + n == part_size:
+                        first_part_hash = self._md5.copy()
+                        first_part_hash.update(view[:n])
+                        part_digests.append(first_part_hash.digest())
+                else:
+                    self._part_hashes[part_size].update(
+                        view[offset : offset + n],
+                    )
+                    if (position + n) % part_size == 0:
+                        part_digests.append(
+                            self._part_hashes[part_size].digest(),
+                        )
+                        self._part_hashes[part_size] = md5()  # noqa: S324
+                offset += n
+        if self._md5 is not None:
+            self._md5.update(view)
+        if self._sha256 is not None:
+            self._sha256.update(view)
+        self.size += len(view)
+
+    @property
+    def md5(self) -> str | None:
+        """
+        The MD5 of the bytes hashed so far, as a hexadecimal string, or None
+        if it is not calculated.
+        """
+        return None if self._md5 is None else self._md5.hexdigest()
+
+    @property
+    def sha256(self) -> str | None:
+        """
+        The SHA-256 of the bytes hashed so far, as a hexadecimal string, or
+        None if it is not calculated.
+        """
+        return None if self._sha256 is None else self._sha256.hexdigest()
+
+    def get_etag(self, part_size: int = 0) -> str:
+        """
+        Get the ETag that the HCP gives the bytes hashed so far when they are
+        uploaded in parts of `part_size` bytes. That is the MD5 of the bytes
+        for a single part upload, and otherwise the MD5 of the concatenated
+        MD5s of the parts followed by "-" and the number of parts.
+
+        :param part_size:
+            The size of the parts in bytes, which must be one of `part_sizes`.
+            Defaults to 0, which means a single part upload
+        :type part_size: int, optional
+
+        :raises KeyError: If the ETag was not calculated
+
+        :return: The ETag without surrounding quotes
+        :rtype: str
+        """
+        if not part_size:
+            if self._md5 is None:
+                msg = "The MD5 is not calculated"
+                raise KeyError(msg)
+            return self._md5.hexdigest()
+        part_digests = self._part_digests[part_size]
+        if self.size <= part_size and self._md5 is not None:
+            part_digests = [self._md5.digest()]
+        elif self.size % part_size or not part_digests:
+            # The last part is partial, or the stream is empty
+            part_digests = [
+                *part_digests,
+                self._part_hashes[part_size].digest(),
+            ]
+        return (
+            md5(b"".join(part_digests)).hexdigest()  # noqa: S324
+            + "-"
+            + str(len(part_digests))
+        )
+
+    def matches(self, etag: str) -> bool:
+        """
+        Check if the bytes hashed so far have the content that `etag`
+        describes.
+
+        :param etag: The ETag of an object, with or without surrounding quotes
+        :type etag: str
+
+        :return:
+            True if the ETag is a single part ETag that equals the MD5, or a
+            multipart ETag that equals the ETag of any of the part sizes
+        :rtype: bool
+        """
+        etag = etag.strip('"')
+        if "-" not in etag:
+            return self.md5 is not None and self.md5 == etag
+        return any(
+            self.get_etag(part_size) == etag for part_size in self._part_digests
+        )
+
+
+def get_etag_part_sizes(
+    etag: str,
+    size: int,
+    part_sizes: Iterable[int],
+) -> list[int]:
+    """
+    Get the part sizes that the multipart ETags of an object have to be
+    calculated for in order to match its ETag, see
+    :py:func:`NGPIris.hcp.helpers.get_part_size_candidates`.
+
+    :param etag: The ETag of the object, with or without surrounding quotes
+    :type etag: str
+
+    :param size: The size of the object in bytes
+    :type size: int
+
+    :param part_sizes: Part sizes to try first, such as transfer configs
+    :type part_sizes: Iterable[int]
+
+    :return: The part size candidates, or none for a single part ETag
+    :rtype: list[int]
+    """
+    etag = etag.strip('"')
+    if "-" not in etag:
+        return []
+    part_count = int(etag.rsplit("-", 1)[1])
+    return get_part_size_candidates(size, part_count, part_sizes)
+
+
+def verify_file(path: str, etag: str, part_sizes: list[int]) -> bool | None:
+    """
+    Check if the local file `path` has the content that `etag` describes. The
+    file is memory mapped and hashed once for all of the part size candidates
+    of the ETag, see :py:func:`get_etag_part_sizes`. The function is run in
+    worker processes, so it only takes and returns values that can be pickled.
+
+    :param path: Local system path to a file
+    :type path: str
+
+    :param etag: The ETag of an object, with or without surrounding quotes
+    :type etag: str
+
+    :param part_sizes: Part sizes to try first, such as transfer configs
+    :type part_sizes: list[int]
+
+    :return:
+        True if the file matches `etag` and False if it does not, or None if
+        `etag` is a multipart ETag that no part size candidate can result in
+    :rtype: bool | None
+    """
+    size = Path(path).stat().st_size
+    candidates = get_etag_part_sizes(etag, size, part_sizes)
+    if "-" in etag and not candidates:
+        return None
+    checksums = Checksums(candidates, include_md5=not candidates)
+    if size:  # Empty files can not be memory mapped
+        with (
+            Path(path).open("rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped,
+        ):
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            for offset in range(0, len(mapped), _MAP_BLOCK_SIZE):
+                with memoryview(mapped)[
+                    offset : offset + _MAP_BLOCK_SIZE
+                ] as block:
+                    checksums.update(block)
+    return checksums.matches(etag)
+
+
+class TransferHasher:
+    """
+    Class for calculating :py:class:`Checksums` of the bytes of a transfer
+    while they are transferred, rather than by reading them again afterwards.
+
+    The bytes are hashed in order on a worker thread, so that hashing runs
+    alongside the network I/O instead of in its path. At most a few chunks are
+    queued, which means that a transfer only waits for the hashing if it is
+    faster than the hashing. The hasher is a context manager, and the
+    checksums are complete once it is closed.
+    """
+
+    def __init__(
+        self,
+        checksums: Checksums,
+        depth: int = _QUEUE_DEPTH,
+    ) -> None:
+        """
+        Constructor for the `TransferHasher` class, which starts the worker
+        thread.
+
+        :param checksums: The checksums to update with the transferred bytes
+        :type checksums: Checksums
+
+        :param depth:
+            The number of chunks that are queued for hashing. Defaults to 8
+        :type depth: int, optional
+        """
+        self.checksums = checksums
+        self._chunks: Queue[bytes | None] = Queue(maxsize=max(depth, 1))
+        self._closed = False
+        self._worker = Thread(
+            target=self._hash,
+            name="TransferHasher",
+            daemon=True,
+        )
+        self._worker.start()
+
+    def update(self, data: bytes) -> None:
+        """
+        Queue the next bytes of the transfer for hashing, waiting while the
+        queue is full.
+
+        :param data: The bytes that follow the bytes queued so far
+        :type data: bytes
+
+        :raises ValueError: If the hasher is closed
+        """
+        if self._closed:
+            msg = "The hasher is closed"
+            raise ValueError(msg)
+        self._chunks.put(data)
+
+    def close(self) -> None:
+        """
+        Wait for the queued bytes to be hashed and stop the worker thread.
+        """
+        if not self._closed:
+            self._closed = True
+            self._chunks.put(None)
+            self._worker.join()
+
+    def __enter__(self) -> Self:
+        """
+        :return: The hasher itself
+        :rtype: Self
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Close the hasher, see :py:meth:`close`.
+        """
+        self.close()
+
+    def _hash(self) -> None:
+        """
+        Hash the queued chunks in order until the hasher is closed.
+        """
+        while (chunk := self._chunks.get()) is not None:
+            self.checksums.update(chunk)
+
+
+class HashingFile(io.RawIOBase):
+    """
+    Class for wrapping a binary file so that every byte that is read from or
+    written to it is passed to a :py:class:`TransferHasher`.
+
+    The wrapper can not seek, which makes boto3 read an upload source and
+    write a download target exactly once and in order, with retries served
+    from memory instead of by reading the file again.
+    """
+
+    def __init__(self, file: BinaryIO, hasher: TransferHasher) -> None:
+        """
+        Constructor for the `HashingFile` class.
+
+        :param file: The binary file to wrap, which is not closed by the wrapper
+        :type file: BinaryIO
+
+        :param hasher: The hasher that the bytes are passed to
+        :type hasher: TransferHasher
+        """
+        super().__init__()
+        self._file = file
+        self._hasher = hasher
+
+    def readable(self) -> bool:
+        """
+        :return: True if the wrapped file is readable
+        :rtype: bool
+        """
+        return self._file.readable()
+
+    def writable(self) -> bool:
+        """
+        :return: True if the wrapped file is writable
+        :rtype: bool
+        """
+        return self._file.writable()
+
+    def seekable(self) -> bool:
+        """
+        :return: False, so that the file is read or written in order
+        :rtype: bool
+        """
+        return False
+
+    def read(self, size: int = -1) -> bytes:
+        """
+        Read up to `size` bytes from the wrapped file and hash them.
+
+        :param size:
+            The most bytes to read. Defaults to -1, which means the rest of
+            the file
+        :type size: int, optional
+
+        :return: The bytes read, which are empty at the end of the file
+        :rtype: bytes
+        """
+        data = self._file.read(size)
+        if data:
+            self._hasher.update(data)
+        return data
+
+    def readinto(self, buffer: Any) -> int:  # noqa: ANN401
+        """
+        Read bytes from the wrapped file into `buffer` and hash them.
+
+        :param buffer: The writable bytes-like object to read into
+        :type buffer: Any
+
+        :return: The number of bytes read, which is 0 at the end of the file
+        :rtype: int
+        """
+        view = memoryview(buffer).cast("B")
+        n = self._file.readinto(view)  # type: ignore[attr-defined]
+        if n:
+            self._hasher.update(bytes(view[:n]))
+        return n
+
+    def write(self, data: Any) -> int:  # noqa: ANN401
+        """
+        Write `data` to the wrapped file and hash it.
+
+        :param data: The bytes-like object to write
+        :type data: Any
+
+        :return: The number of bytes written
+        :rtype: int
+        """
+        n = self._file.write(data)
+        # Bytes are immutable, so only other buffers have to be copied
+        self._hasher.update(
+            data
+            if type(data) is bytes and n == len(data)
+            else bytes(
+                memoryview(data).cast("B")[:n],
+            ),
+        )
+        return n
+
+
+def write_manifest(
+    local_file_path: str,
+    hcp_object: dict[str, Any],
+    checksums: Checksums,
+) -> None:
+    """
+    Write the checksums of a transferred file to a JSON manifest next to it,
+    at `local_file_path` followed by `MANIFEST_SUFFIX`.
+
+    :param local_file_path: Path to the local file
+    :type local_file_path: str
+
+    :param hcp_object:
+        The metadata of the object, see
+        :py:meth:`NGPIris.hcp.hcp.HCPHandler.stat`
+    :type hcp_object: dict[str, Any]
+
+    :param checksums: The checksums of the transferred bytes
+    :type checksums: Checksums
+    """
+    manifest = {
+        "Key": hcp_object["Key"],
+        "ETag": hcp_object["ETag"].strip('"'),
+        "Size": checksums.size,
+        "MD5": checksums.md5,
+        "SHA256": checksums.sha256,
+    }
+    Path(local_file_path + MANIFEST_SUFFIX).write_text(dumps(manifest) + "\n")
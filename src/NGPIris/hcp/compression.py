@@ -0,0 +1,126 @@
+import zlib
+from collections.abc import Generator, Iterable
+from importlib.util import find_spec
+from typing import Any
+
+# zstd needs the optional dependency zstandard, while gzip is in the standard
+# library
+_HAS_ZSTANDARD = find_spec("zstandard") is not None
+
+# The metadata keys that compressed objects are tagged with. They are prefixed,
+# so that objects that other tools tag with a generic "compression" key are
+# not taken for objects that were compressed by this library
+COMPRESSION_METADATA_KEY = "ngpiris-compression"
+UNCOMPRESSED_SIZE_METADATA_KEY = "ngpiris-uncompressed-size"
+
+# The compression levels, which favour speed since compression runs alongside
+# the transfer
+_GZIP_LEVEL = 6
+_ZSTD_LEVEL = 3
+
+# zlib window bits for the gzip format
+_GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+SUPPORTED_COMPRESSIONS = ("gzip", "zstd")
+
+
+def _check_compression(compression: str) -> None:
+    """
+    Raise an error if `compression` is not supported, or if its dependency is
+    not installed.
+
+    :raises ValueError: If `compression` is not supported
+    :raises ImportError: If `compression` is "zstd" without zstandard
+    """
+    if compression not in SUPPORTED_COMPRESSIONS:
+        msg = 'Unsupported compression "' + compression + '"'
+        raise ValueError(msg)
+    if compression == "zstd" and not _HAS_ZSTANDARD:
+        msg = (
+            "zstd compression requires zstandard, which is installed with "
+            '`pip install "NGPIris[zstd]"`'
+        )
+        raise ImportError(msg)
+
+
+def _get_compressor(compression: str) -> Any:  # noqa: ANN401
+    """
+    Get a streaming compressor with `compress` and `flush` methods.
+    """
+    _check_compression(compression)
+    if compression == "gzip":
+        return zlib.compressobj(_GZIP_LEVEL, zlib.DEFLATED, _GZIP_WBITS)
+    import zstandard  # noqa: PLC0415
+
+    return zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compressobj()
+
+
+def _get_decompressor(compression: str) -> Any:  # noqa: ANN401
+    """
+    Get a streaming decompressor with a `decompress` method.
+    """
+    _check_compression(compression)
+    if compression == "gzip":
+        return zlib.decompressobj(_GZIP_WBITS)
+    import zstandard  # noqa: PLC0415
+
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def compress_chunks(
+    chunks: Iterable[bytes],
+    compression: str,
+) -> Generator[bytes, None, None]:
+    """
+    Compress a stream of chunks.
+
+    :param chunks: The uncompressed chunks
+    :type chunks: Iterable[bytes]
+
+    :param compression: "gzip" or "zstd"
+    :type compression: str
+
+    :raises ValueError: If `compression` is not supported
+    :raises ImportError: If `compression` is "zstd" without zstandard
+
+    :yield: The compressed chunks, skipping empty ones
+    :rtype: Generator[bytes, None, None]
+    """
+    compressor = _get_compressor(compression)
+    for chunk in chunks:
+        compressed_chunk = compressor.compress(chunk)
+        if compressed_chunk:
+            yield compressed_chunk
+    yield compressor.flush()
+
+
+def decompress_chunks(
+    chunks: Iterable[bytes],
+    compression: str,
+) -> Generator[bytes, None, None]:
+    """
+    Decompress a stream of chunks that were compressed with
+    :py:func:`compress_chunks`.
+
+    :param chunks: The compressed chunks
+    :type chunks: Iterable[bytes]
+
+    :param compression: "gzip" or "zstd"
+    :type compression: str
+
+    :raises ValueError:
+        If `compression` is not supported, or if the chunks end before the
+        compressed data does
+    :raises ImportError: If `compression` is "zstd" without zstandard
+
+    :yield: The decompressed chunks, skipping empty ones
+    :rtype: Generator[bytes, None, None]
+    """
+    decompressor = _get_decompressor(compression)
+    for chunk in chunks:
+        decompressed_chunk = decompressor.decompress(chunk)
+        if decompressed_chunk:
+            yield decompressed_chunk
+    if not decompressor.eof:
+        msg = "The " + compression + " compressed data is truncated"
+        raise ValueError(msg)
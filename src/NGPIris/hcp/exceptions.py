@@ -70,6 +70,12 @@ class SubfolderError(Exception):
     """
 
 
+class SourceIsDestinationError(Exception):
+    """
+    The source and the destination of a copy or a move are the same.
+    """
+
+
 class DownloadLimitReachedError(Exception):
     """
     Download limit was reached while downloading file objects from the
@@ -77,6 +83,13 @@ class DownloadLimitReachedError(Exception):
     """
 
 
+class ChecksumMismatchError(Exception):
+    """
+    The checksum of the transferred bytes does not match the ETag of the
+    object on the mounted bucket.
+    """
+
+
 # -------------- File system exceptions --------------
 
 
@@ -84,3 +97,12 @@ class UnallowedCharacterError(Exception):
     """
     A character that is not allowed was used.
     """
+
+
+# -------------- Bucket index exceptions --------------
+
+
+class NoBucketIndexError(Exception):
+    """
+    No bucket index has been opened before using a method that require it.
+    """
@@ -1,8 +1,28 @@
+import os
 import re
-from collections.abc import Generator
+from base64 import b64encode
+from collections import deque
+from collections.abc import Callable, Generator, Iterable
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from configparser import ConfigParser
+from contextlib import AbstractContextManager, closing, nullcontext, suppress
+from copy import copy
+from datetime import datetime
 from enum import Enum
+from functools import partial
+from hashlib import md5
+from heapq import merge, nlargest
+from itertools import chain, islice
 from pathlib import Path
+from threading import Lock
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
 from bitmath import Byte, TiB
@@ -11,35 +31,80 @@ from boto3 import client
 from boto3.s3.transfer import TransferConfig
 from botocore.client import Config
 from botocore.exceptions import ClientError, EndpointConnectionError
-from more_itertools import peekable
-from parse import Result, parse
-from rapidfuzz import fuzz, process, utils
-from requests import get
+from more_itertools import chunked, peekable
+from rapidfuzz import utils
+from requests import Session
+from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 from tqdm import tqdm
 from urllib3 import disable_warnings
 
+from NGPIris.hcp.autotune import MAX_CONCURRENCY, TransferTuner
+from NGPIris.hcp.cache import MAPICache, get_endpoint_class
+from NGPIris.hcp.checkpoint import (
+    CHECKPOINT_SUFFIX,
+    PART_SUFFIX,
+    UPLOAD_SUFFIX,
+    DownloadCheckpoint,
+    UploadCheckpoint,
+)
+from NGPIris.hcp.checksum import (
+    MANIFEST_SUFFIX,
+    Checksums,
+    HashingFile,
+    TransferHasher,
+    get_etag_part_sizes,
+    verify_file,
+    write_manifest,
+)
+from NGPIris.hcp.compression import (
+    COMPRESSION_METADATA_KEY,
+    UNCOMPRESSED_SIZE_METADATA_KEY,
+    compress_chunks,
+    decompress_chunks,
+)
 from NGPIris.hcp.exceptions import (
     BucketForbiddenError,
     BucketNotFoundError,
+    ChecksumMismatchError,
     DownloadLimitReachedError,
     IsFolderObjectError,
+    NoBucketIndexError,
     NoBucketMountedError,
-    NotAValidTenantError,
     NotFoundError,
     NotSufficientPermissionsError,
     ObjectAlreadyExistError,
     ObjectDoesNotExistError,
+    SourceIsDestinationError,
     SubfolderError,
-    UnableToParseEndpointError,
     UnallowedCharacterError,
 )
 from NGPIris.hcp.helpers import (
     check_mounted,
     create_access_control_policy,
+    get_tenant,
+    iterate_in_thread,
+    parse_credentials,
+    preallocate_file,
     raise_path_error,
+    score_keys,
+    split_key_range,
+    walk_files,
 )
-from NGPIris.parse_credentials import CredentialsHandler
+from NGPIris.hcp.index import BucketIndex
+from NGPIris.hcp.limits import TransferLimiter, transfer_limiter
+from NGPIris.hcp.reader import (
+    DEFAULT_BLOCK_SIZE,
+    DEFAULT_CACHE_BLOCKS,
+    DEFAULT_PREFETCH,
+    ObjectReader,
+)
+from NGPIris.hcp.writer import (
+    DEFAULT_MAX_BUFFERS,
+    MIN_PART_SIZE,
+    ObjectWriter,
+)
+from NGPIris.utils import md5_hashing
 
 if TYPE_CHECKING:
     from botocore.paginate import PageIterator, Paginator
@@ -47,17 +112,66 @@ if TYPE_CHECKING:
 _KB = 1024
 _MB = _KB * _KB
 
+# Matches the default connection pool size of botocore
+_DEFAULT_MAX_WORKERS = 10
+
+# The number of keep-alive connections to the MAPI
+_MAPI_POOL_SIZE = 32
+
+# The number of folder levels that are listed in order to discover the key
+# space before listing in parallel
+_MAX_PROBE_DEPTH = 3
+
+# The number of keys that are scored at a time when searching
+_SEARCH_BATCH_SIZE = 100_000
+
+# The most keys that one DeleteObjects request can hold
+_DELETE_BATCH_SIZE = 1000
+
+# The most parts that one multipart upload can consist of
+_MAX_PARTS = 10_000
+
+
+def _update_progress(
+    chunks: Iterable[bytes],
+    pbar: tqdm | None,
+    hasher: TransferHasher | None = None,
+) -> Generator[bytes, None, None]:
+    """
+    Update `pbar` with the size of every chunk that passes through, and pass
+    the chunk on to `hasher`.
+    """
+    for chunk in chunks:
+        if pbar is not None:
+            pbar.update(len(chunk))
+        if hasher is not None:
+            hasher.update(chunk)
+        yield chunk
+
 
 class HCPHandler:
     """
     Class for handling HCP requests.
     """
 
-    def __init__(
+    # The bandwidth limit and the in-flight byte budget are shared by every
+    # handler in the process
+    transfer_limiter: TransferLimiter = transfer_limiter
+
+    def __init__(  # noqa: PLR0913
         self,
         credentials: str | dict[str, str],
         use_ssl: bool = False,
         custom_config_path: str = "",
+        *,
+        mapi_cache_path: str = "",
+        use_mapi_cache: bool = True,
+        index_path: str = "",
+        autotune: bool = False,
+        autotune_path: str = "",
+        max_bandwidth: int | None = None,
+        max_inflight: int | None = None,
+        max_pool_connections: int | None = None,
     ) -> None:
         """
         Constructor for the `HCPHandler` class.
@@ -83,89 +197,65 @@ class HCPHandler:
             upload
         :type custom_config_path: str, optional
 
+        :param mapi_cache_path:
+            Path to a JSON file where MAPI responses are cached between
+            sessions. Defaults to the empty string, which means that MAPI
+            responses are only cached in memory
+        :type mapi_cache_path: str, optional
+
+        :param use_mapi_cache:
+            Boolean choice of caching MAPI responses at all. Defaults to True
+        :type use_mapi_cache: bool, optional
+
+        :param index_path:
+            Path to an SQLite file with a local index of the objects in the
+            buckets, see :py:meth:`refresh_index`. Defaults to the empty string,
+            which means that no index is used
+        :type index_path: str, optional
+
+        :param autotune:
+            Boolean choice of tuning the concurrency and the chunk size of
+            transfers to the throughput of the endpoint while transferring,
+            see :py:class:`NGPIris.hcp.autotune.TransferTuner`. The transfer
+            config is used as the starting point. Defaults to False
+        :type autotune: bool, optional
+
+        :param autotune_path:
+            Path to a JSON file where the tuned settings of every endpoint are
+            kept between sessions. Defaults to the empty string, which means
+            that the tuned settings are kept in memory only
+        :type autotune_path: str, optional
+
+        :param max_bandwidth:
+            The most bytes per second that are uploaded and downloaded, or 0
+            for no limit, see :py:meth:`set_transfer_limits`. Defaults to None,
+            which leaves the limit of the process as it is, unless the .ini
+            file sets `max_bandwidth`
+        :type max_bandwidth: int | None, optional
+
+        :param max_inflight:
+            The most bytes that are in flight at a time, or 0 for no limit, see
+            :py:meth:`set_transfer_limits`. Defaults to None, which leaves the
+            limit of the process as it is, unless the .ini file sets
+            `max_inflight`
+        :type max_inflight: int | None, optional
+
+        :param max_pool_connections:
+            The number of connections in the pool of the S3 client, which is
+            shared by every transfer of the handler and of its bucket views,
+            see :py:meth:`bucket`. Defaults to None, which sizes the pool for
+            10 transfers running at the max concurrency of the transfer config
+        :type max_pool_connections: int | None, optional
+
         :raise NotAValidTenantError:
             If the tenant in the specified endpoint is not valid
 
         :raise UnableToParseEndpointError: The endpoint could not be parsed
         """
-        # Determine type of `credentials`
-        if type(credentials) is str:
-            parsed_credentials = CredentialsHandler(credentials).hcp
-
-            self.endpoint = "https://" + parsed_credentials["endpoint"]
-            self.username = (
-                parsed_credentials["username"]
-                if parsed_credentials.get("username")
-                else parsed_credentials["aws_access_key_id"]
-            )
-            self.password = (
-                parsed_credentials["password"]
-                if parsed_credentials.get("password")
-                else parsed_credentials["aws_secret_access_key"]
-            )
-        elif type(credentials) is dict:
-            self.endpoint = "https://" + credentials["endpoint"]
-            self.username = (
-                credentials["username"]
-                if credentials.get("username")
-                else credentials["aws_access_key_id"]
-            )
-            self.password = (
-                credentials["password"]
-                if credentials.get("password")
-                else credentials["aws_secret_access_key"]
-            )
-
-        # A lookup table for GMC names to HCP tenant names
-        gmc_tenant_map = {
-            "gmc-joint": "vgtn0008",
-            "gmc-west": "vgtn0012",
-            "gmc-southeast": "vgtn0014",
-            "gmc-south": "vgtn0015",
-            "gmc-orebro": "vgtn0016",
-            "gmc-karolinska": "vgtn0017",
-            "gmc-north": "vgtn0018",
-            "gmc-uppsala": "vgtn0019",
-        }
-
-        self.tenant = None
-        for endpoint_format_string in [
-            "https://{}.ngp-fs1000.vgregion.se",
-            "https://{}.ngp-fs2000.vgregion.se",
-            "https://{}.ngp-fs3000.vgregion.se",
-            "https://{}.hcp1.vgregion.se",
-            "https://{}.vgregion.sjunet.org",
-        ]:
-            tenant_parse = parse(endpoint_format_string, self.endpoint)
-            if type(tenant_parse) is Result:
-                tenant = str(tenant_parse[0])
-                if (
-                    endpoint_format_string == "https://{}.vgregion.sjunet.org"
-                ):  # Check if endpoint is Sjunet
-                    mapped_tenant = gmc_tenant_map.get(tenant)
-                    if mapped_tenant:
-                        self.tenant = mapped_tenant
-                    else:
-                        raise NotAValidTenantError(
-                            'The provided tenant name, "'
-                            + tenant
-                            + '", is not a valid tenant name. Hint: did you'
-                            + "spell it correctly?",
-                        )
-                else:
-                    self.tenant = tenant
-
-                break
-
-        if not self.tenant:
-            raise UnableToParseEndpointError(
-                'Unable to parse endpoint, "'
-                + self.endpoint
-                + '". Make sure that you have entered the correct endpoint in'
-                + "your credentials JSON file. "
-                + 'Hints:\n - The endpoint should *not* contain "https://" or'
-                + "port numbers\n - Is the endpoint spelled correctly?",
-            )
+        self.endpoint, self.username, self.password = parse_credentials(
+            credentials,
+        )
+        self.tenant = get_tenant(self.endpoint)
         self.base_request_url = (
             self.endpoint + ":9090/mapi/tenants/" + self.tenant
         )
@@ -176,22 +266,27 @@ class HCPHandler:
         if not self.use_ssl:
             disable_warnings()
 
-        s3_config = Config(
-            s3={
-                "addressing_style": "path",
-                "payload_signing_enabled": True,
+        # Every MAPI request shares the same keep-alive connections
+        self.mapi_session = Session()
+        self.mapi_session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=1, pool_maxsize=_MAPI_POOL_SIZE),
+        )
+        self.mapi_session.headers.update(
+            {
+                "Authorization": "HCP " + self.token,
+                "Cookie": "hcp-ns-auth=" + self.token,
+                "Accept": "application/json",
             },
-            signature_version="s3v4",
         )
+        self.mapi_session.verify = self.use_ssl
+        self.mapi_cache = MAPICache(mapi_cache_path, enabled=use_mapi_cache)
+        self.bucket_index = BucketIndex(index_path) if index_path else None
 
-        self.s3_client = client(
-            "s3",
-            aws_access_key_id=self.username,
-            aws_secret_access_key=self.password,
-            endpoint_url=self.endpoint,
-            verify=self.use_ssl,
-            config=s3_config,
-        )
+        # The buckets that are known to exist, see `bucket`. The set is shared
+        # with the bucket views, since a view is a shallow copy
+        self._checked_buckets: set[str] = set()
+        self._checked_buckets_lock = Lock()
 
         if custom_config_path:  # pragma: no cover
             ini_config = ConfigParser()
@@ -209,6 +304,18 @@ class HCPHandler:
                 ),
                 use_threads=ini_config.getboolean("hcp", "use_threads"),
             )
+            # The limits are optional in the .ini file, and the arguments take
+            # precedence over it
+            max_bandwidth = (
+                ini_config.getint("hcp", "max_bandwidth", fallback=None)
+                if max_bandwidth is None
+                else max_bandwidth
+            )
+            max_inflight = (
+                ini_config.getint("hcp", "max_inflight", fallback=None)
+                if max_inflight is None
+                else max_inflight
+            )
         else:
             self.transfer_config = TransferConfig(
                 multipart_threshold=10 * _MB,
@@ -217,27 +324,246 @@ class HCPHandler:
                 use_threads=True,
             )
 
-    def get_MAPI_request(self, path_extension: str = "") -> dict:
+        self.transfer_tuner = (
+            TransferTuner(self.endpoint, autotune_path, self._transfer_config)
+            if autotune
+            else None
+        )
+
+        # Every transfer of the handler, such as the files of a folder that are
+        # transferred concurrently, takes connections from the same pool
+        self.s3_client = self._create_s3_client(
+            max_pool_connections
+            or _DEFAULT_MAX_WORKERS
+            * (
+                MAX_CONCURRENCY
+                if autotune
+                else self._transfer_config.max_concurrency
+            ),
+        )
+
+        self.set_transfer_limits(max_bandwidth, max_inflight)
+
+    def _create_s3_client(self, max_pool_connections: int) -> Any:  # noqa: ANN401
+        """
+        Create the S3 client of the handler, with a connection pool of
+        `max_pool_connections` connections. The client is thread-safe.
+        """
+        s3_config = Config(
+            s3={
+                "addressing_style": "path",
+                "payload_signing_enabled": True,
+            },
+            signature_version="s3v4",
+            max_pool_connections=max_pool_connections,
+        )
+
+        return client(
+            "s3",
+            aws_access_key_id=self.username,
+            aws_secret_access_key=self.password,
+            endpoint_url=self.endpoint,
+            verify=self.use_ssl,
+            config=s3_config,
+        )
+
+    @property
+    def transfer_config(self) -> TransferConfig:
+        """
+        The transfer config of uploads and downloads. When autotuning, this is
+        the config with the settings that the transfer tuner is currently at.
+        """
+        if self.transfer_tuner is not None:
+            return self.transfer_tuner.get_transfer_config()
+        return self._transfer_config
+
+    @transfer_config.setter
+    def transfer_config(self, transfer_config: TransferConfig) -> None:
+        self._transfer_config = transfer_config
+
+    def _get_transfer_callback(
+        self,
+        pbar: tqdm | None,
+    ) -> Callable[[int], None]:
+        """
+        Get the progress callback of a transfer, which updates `pbar`, feeds
+        the transfer tuner and waits for as long as the bandwidth limit
+        requires. Waiting in the callback holds back the thread that moves the
+        bytes of the transfer.
+        """
+        tuner = self.transfer_tuner
+
+        def _callback(bytes_transferred: int) -> None:
+            if pbar is not None:
+                pbar.update(bytes_transferred)
+            if tuner is not None:
+                tuner.record(bytes_transferred)
+            self.transfer_limiter.throttle(bytes_transferred)
+
+        return _callback
+
+    def set_transfer_limits(
+        self,
+        max_bandwidth: int | None = None,
+        max_inflight: int | None = None,
+    ) -> None:
+        """
+        Set the bandwidth limit and the in-flight byte budget. The limits are
+        shared by every transfer of every `HCPHandler` in the process, and
+        take effect for running transfers too, see
+        :py:class:`NGPIris.hcp.limits.TransferLimiter`.
+
+        :param max_bandwidth:
+            The most bytes per second that are uploaded and downloaded, or 0
+            for no limit. Defaults to None, which leaves the limit as it is
+        :type max_bandwidth: int | None, optional
+
+        :param max_inflight:
+            The most bytes that are in flight at a time, or 0 for no limit.
+            Defaults to None, which leaves the limit as it is
+        :type max_inflight: int | None, optional
+        """
+        self.transfer_limiter.set_limits(max_bandwidth, max_inflight)
+
+    def _limit_config(self, config: TransferConfig) -> TransferConfig:
+        """
+        Lower the concurrency of `config` so that the parts of one transfer
+        fit in the in-flight byte budget, if there is one.
+        """
+        budget = self.transfer_limiter.inflight.limit
+        if not budget or (
+            config.multipart_chunksize * config.max_concurrency <= budget
+        ):
+            return config
+        limited_config = copy(config)
+        limited_config.max_concurrency = max(
+            1,
+            budget // config.multipart_chunksize,
+        )
+        return limited_config
+
+    def _get_worker_config(self, size: int) -> TransferConfig:
+        """
+        Get the transfer config for a file of `size` bytes that is transferred
+        on a worker thread of a folder transfer. Small files are transferred in
+        a single request on the worker thread itself, so that only large files
+        spawn threads of their own.
+        """
+        if size < self.transfer_config.multipart_threshold:
+            return TransferConfig(
+                multipart_threshold=self.transfer_config.multipart_threshold,
+                use_threads=False,
+            )
+        return self._limit_config(self.transfer_config)
+
+    def _reserve_transfer(
+        self,
+        size: int,
+        config: TransferConfig,
+    ) -> AbstractContextManager[None]:
+        """
+        Reserve the bytes of the in-flight byte budget that a transfer of
+        `size` bytes with `config` can have in flight at a time.
+        """
+        if config.use_threads and size >= config.multipart_threshold:
+            size = min(
+                size,
+                config.multipart_chunksize * config.max_concurrency,
+            )
+        return self.transfer_limiter.reserve(size)
+
+    def _run_parts(
+        self,
+        transfer_part: Callable[..., int],
+        parts: Iterable[tuple],
+        max_workers: int,
+    ) -> None:
+        """
+        Call `transfer_part` with the arguments of every part in `parts`, on at
+        most `max_workers` threads. `transfer_part` returns the number of bytes
+        that it transferred. When autotuning, every part is timed for the
+        transfer tuner, and the number of parts in flight follows its
+        concurrency.
+
+        :raise Exception: The first exception raised by `transfer_part`
+        """
+        tuner = self.transfer_tuner
+
+        def _timed(part: tuple) -> None:
+            start = monotonic()
+            try:
+                part_bytes = transfer_part(*part)
+            except Exception:
+                if tuner is not None:
+                    tuner.record_error()
+                raise
+            if tuner is not None:
+                tuner.record_part(part_bytes, monotonic() - start)
+
+        remaining = iter(parts)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight: set[Future] = set()
+            while True:
+                limit = (
+                    min(max_workers, tuner.concurrency)
+                    if tuner is not None
+                    else max_workers
+                )
+                while len(in_flight) < limit:
+                    part = next(remaining, None)
+                    if part is None:
+                        break
+                    in_flight.add(executor.submit(_timed, part))
+                if not in_flight:
+                    return
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+
+    def _get_MAPI_cache_key(self, path_extension: str = "") -> str:
+        """
+        Get the cache key of a MAPI request. Since the response depends on
+        the permissions of the user, the key is unique for each user.
+        """
+        return (
+            md5_hashing(self.username)
+            + "@"
+            + self.base_request_url
+            + path_extension
+        )
+
+    def get_MAPI_request(
+        self,
+        path_extension: str = "",
+        use_cache: bool = True,
+    ) -> dict:
         """
         Make a GET request to the HCP in order to use the builtin MAPI.
 
+        Responses are cached for a time that depends on which kind of endpoint
+        was requested, see :py:class:`NGPIris.hcp.cache.MAPICache`.
+
         :param path_extension:
             Extension for the base request URL, defaults to the empty string
         :type path_extension: str, optional
 
+        :param use_cache:
+            Boolean choice of using a cached response if there is one. A fresh
+            response is cached either way. Defaults to True
+        :type use_cache: bool, optional
+
         :return: The response as a dictionary
         :rtype: dict
         """
+        cache_key = self._get_MAPI_cache_key(path_extension)
+        if use_cache:
+            cached_response = self.mapi_cache.get(cache_key)
+            if cached_response is not None:
+                return dict(cached_response)
+
         url = self.base_request_url + path_extension
-        headers = {
-            "Authorization": "HCP " + self.token,
-            "Cookie": "hcp-ns-auth=" + self.token,
-            "Accept": "application/json",
-        }
-        response = get(
+        response = self.mapi_session.get(
             url,
-            headers=headers,
-            verify=self.use_ssl,
             timeout=60,
         )
 
@@ -255,45 +581,82 @@ class HCPHandler:
                 raise NotFoundError(msg) from http_e
             raise
 
-        return dict(response.json())
+        response_dict = dict(response.json())
+        self.mapi_cache.set(
+            cache_key,
+            response_dict,
+            get_endpoint_class(path_extension),
+        )
+        return response_dict
+
+    def invalidate_MAPI_cache(self, path_extension: str = "") -> None:
+        """
+        Remove cached MAPI responses for every path that starts with
+        `path_extension`.
+
+        :param path_extension:
+            Extension for the base request URL. Defaults to the empty string,
+            which removes every cached response for this tenant
+        :type path_extension: str, optional
+        """
+        self.mapi_cache.invalidate(self._get_MAPI_cache_key(path_extension))
 
     # ---------------------------- User methods ----------------------------
 
-    def get_users(self) -> list[str]:
+    def get_users(self, use_cache: bool = True) -> list[str]:
         """
         Get a list of users on the tenant.
 
+        :param use_cache:
+            Boolean choice of using a cached MAPI response. Defaults to True
+        :type use_cache: bool, optional
+
         :return: List of users on the tenant
         :rtype: list[str]
         """
-        return self.get_MAPI_request("/userAccounts").get("username", [])
+        return self.get_MAPI_request("/userAccounts", use_cache).get(
+            "username",
+            [],
+        )
 
-    def get_user_roles(self, username: str) -> list[str]:
+    def get_user_roles(
+        self,
+        username: str,
+        use_cache: bool = True,
+    ) -> list[str]:
         """
         Get the user roles for a given user on the tenant.
 
         :param username: A username on the tenant
         :type username: str
 
+        :param use_cache:
+            Boolean choice of using a cached MAPI response. Defaults to True
+        :type use_cache: bool, optional
+
         :return: List of roles the user has
         :rtype: list[str]
         """
         return (
-            self.get_MAPI_request("/userAccounts/" + username)
+            self.get_MAPI_request("/userAccounts/" + username, use_cache)
             .get("roles", {})
             .get("role")
         )  # pytype: disable=bad-return-type
 
-    def is_user_admin(self, username: str) -> bool:
+    def is_user_admin(self, username: str, use_cache: bool = True) -> bool:
         """
         Predicate for checking if a given user has the admin role.
 
         :param username: The user name
         :type username: str
 
+        :param use_cache:
+            Boolean choice of using a cached MAPI response. Defaults to True
+        :type use_cache: bool, optional
+
         :rtype: bool
         """
-        return "ADMINISTRATOR" in self.get_user_roles(username)
+        return "ADMINISTRATOR" in self.get_user_roles(username, use_cache)
 
     # ---------------------------- Util methods ----------------------------
 
@@ -367,6 +730,39 @@ class HCPHandler:
         self.test_connection(bucket_name=bucket_name)
         self.bucket_name = bucket_name
 
+    def bucket(self, bucket_name: str) -> "HCPHandler":
+        """
+        Get a view of the handler with `bucket_name` mounted, without mounting
+        it on the handler itself. The view shares the S3 client, its connection
+        pool and the caches of the handler, and only differs in which bucket is
+        mounted. This makes it safe to work on different buckets from
+        different threads, where :py:meth:`mount_bucket` would change the
+        bucket for every thread.
+
+        The existence of the bucket is only checked the first time a view of it
+        is requested. Later views are shallow copies without any requests,
+        which makes them cheap enough for every task of a thread pool to make.
+        Mounting another bucket on a view changes that view only.
+
+        :param bucket_name: The name of the bucket
+        :type bucket_name: str
+
+        :raises BucketNotFoundError: If no bucket of that name was found
+
+        :return: A handler with `bucket_name` mounted
+        :rtype: HCPHandler
+        """
+        with self._checked_buckets_lock:
+            is_checked = bucket_name in self._checked_buckets
+        if not is_checked:
+            self.test_connection(bucket_name=bucket_name)
+            with self._checked_buckets_lock:
+                self._checked_buckets.add(bucket_name)
+
+        view = copy(self)
+        view.bucket_name = bucket_name
+        return view
+
     def create_bucket(self, bucket_name: str) -> None:
         """
         Create a bucket. The user in the given credentials will be the owner of
@@ -378,6 +774,7 @@ class HCPHandler:
         self.s3_client.create_bucket(
             Bucket=bucket_name,
         )
+        self.invalidate_MAPI_cache("/namespaces")
 
     def delete_bucket(self, bucket: str) -> None:
         """
@@ -391,6 +788,7 @@ class HCPHandler:
         self.s3_client.delete_bucket(
             Bucket=bucket,
         )
+        self.invalidate_MAPI_cache("/namespaces")
 
     class ListBucketsOutputMode(Enum):
         FULL = "full"
@@ -402,108 +800,158 @@ class HCPHandler:
     def list_buckets(
         self,
         output_mode: ListBucketsOutputMode = ListBucketsOutputMode.EXTENDED,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        use_cache: bool = True,
     ) -> list[dict[str, Any]]:
         """
         List all available buckets at endpoint along with statistics for each
         bucket.
 
+        :param output_mode:
+            How much information to include for each bucket. Defaults to
+            EXTENDED
+        :type output_mode: ListBucketsOutputMode, optional
+
+        :param max_workers:
+            The maximum number of MAPI requests that are running at the same
+            time. Defaults to 10
+        :type max_workers: int, optional
+
+        :param use_cache:
+            Boolean choice of using cached MAPI responses. Defaults to True
+        :type use_cache: bool, optional
+
         :return: A list of buckets and their statistics
         :rtype: list[dict[str, Any]]
         """
-        response = self.get_MAPI_request("/namespaces")
+        response = self.get_MAPI_request("/namespaces", use_cache)
         buckets: list[str] = response["name"]
-        output_list = []
-        for bucket in buckets:
-            stats = self.get_MAPI_request(
-                "/namespaces/" + bucket + "/statistics"
+        if output_mode == HCPHandler.ListBucketsOutputMode.BUCKET_ONLY:
+            return [{"Bucket": bucket} for bucket in buckets]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            all_stats = list(
+                executor.map(
+                    lambda bucket: self.get_MAPI_request(
+                        "/namespaces/" + bucket + "/statistics",
+                        use_cache,
+                    ),
+                    buckets,
+                ),
+            )
+            all_bucket_information = list(
+                executor.map(
+                    lambda bucket: self.get_MAPI_request(
+                        "/namespaces/" + bucket,
+                        use_cache,
+                    ),
+                    buckets,
+                ),
             )
-            bucket_information = self.get_MAPI_request("/namespaces/" + bucket)
-
-            base = {"Bucket": bucket}
-
-            # Turn headers from camelCase to human readable text
-            stats = {
-                re.sub(r"(?<=[a-z])([A-Z])", r" \1", k).capitalize(): _
-                for k, _ in stats.items()
-            }
-            bucket_information = {
-                re.sub(r"(?<=[a-z])([A-Z])", r" \1", k).capitalize(): _
-                for k, _ in bucket_information.items()
-            }
 
-            # Parse `"Hard quota"` value to be just a number
-            bucket_information["Hard quota (Bytes)"] = int(
-                bitmath_parse(
-                    # TODO(EB): `"Hard quota"` is written as being decimal
-                    # (MB, GB, TB, etc), but it is probably binary
-                    # (MiB, GiB, TiB, etc). As such the `bitmath_parse` will not
-                    # be 100% correct, and should be corrected soon, but that is
-                    # annoying so I won't right now :/
-                    bucket_information["Hard quota"]
-                ).to_Byte()
+        return [
+            self._format_bucket_dictionary(
+                bucket,
+                raw_stats,
+                raw_bucket_information,
+                output_mode,
+            )
+            for bucket, raw_stats, raw_bucket_information in zip(
+                buckets,
+                all_stats,
+                all_bucket_information,
+                strict=True,
             )
+        ]
+
+    @staticmethod
+    def _format_bucket_dictionary(
+        bucket: str,
+        raw_stats: dict[str, Any],
+        raw_bucket_information: dict[str, Any],
+        output_mode: ListBucketsOutputMode,
+    ) -> dict[str, Any]:
+        """
+        Format the MAPI statistics and information of a bucket according to
+        `output_mode`.
+        """
+        base = {"Bucket": bucket}
 
-            bucket_information["Soft quota (%)"] = bucket_information[
-                "Soft quota"
-            ]
-            del bucket_information["Soft quota"]
-
-            for col in ["Ingested volume", "Storage capacity used"]:
-                stats[col + " (Bytes)"] = stats[col]
-                del stats[col]
-
-            match output_mode:
-                case HCPHandler.ListBucketsOutputMode.FULL:
-                    output_list.append(base | stats | bucket_information)
-
-                case HCPHandler.ListBucketsOutputMode.EXTENDED:
-                    bi_fields = [
-                        "Hard quota (Bytes)",
-                        "Soft quota (%)",
-                        "Description",
-                        "Owner",
-                    ]
-                    output_list.append(
-                        base
-                        | stats
-                        | {f: bucket_information[f] for f in bi_fields}
-                    )
+        # Turn headers from camelCase to human readable text
+        stats = {
+            re.sub(r"(?<=[a-z])([A-Z])", r" \1", k).capitalize(): _
+            for k, _ in raw_stats.items()
+        }
+        bucket_information = {
+            re.sub(r"(?<=[a-z])([A-Z])", r" \1", k).capitalize(): _
+            for k, _ in raw_bucket_information.items()
+        }
 
-                case HCPHandler.ListBucketsOutputMode.SIMPLE:
-                    stats_fields = [
-                        "Ingested volume (Bytes)",
-                        "Storage capacity used (Bytes)",
-                        "Object count",
-                    ]
-                    bi_fields = [
-                        "Hard quota (Bytes)",
-                        "Soft quota (%)",
-                        "Owner",
-                    ]
-
-                    output_list.append(
-                        base
-                        | {f: stats[f] for f in stats_fields}
-                        | {f: bucket_information[f] for f in bi_fields}
-                    )
+        # Parse `"Hard quota"` value to be just a number
+        bucket_information["Hard quota (Bytes)"] = int(
+            bitmath_parse(
+                # TODO(EB): `"Hard quota"` is written as being decimal
+                # (MB, GB, TB, etc), but it is probably binary
+                # (MiB, GiB, TiB, etc). As such the `bitmath_parse` will not
+                # be 100% correct, and should be corrected soon, but that is
+                # annoying so I won't right now :/
+                bucket_information["Hard quota"]
+            ).to_Byte()
+        )
 
-                case HCPHandler.ListBucketsOutputMode.MINIMAL:
-                    stats_fields = ["Object count"]
-                    bi_fields = [
-                        "Hard quota (Bytes)",
-                        "Soft quota (%)",
-                        "Owner",
-                    ]
-
-                    output_list.append(
-                        base
-                        | {f: stats[f] for f in stats_fields}
-                        | {f: bucket_information[f] for f in bi_fields}
-                    )
+        bucket_information["Soft quota (%)"] = bucket_information["Soft quota"]
+        del bucket_information["Soft quota"]
+
+        for col in ["Ingested volume", "Storage capacity used"]:
+            stats[col + " (Bytes)"] = stats[col]
+            del stats[col]
+
+        match output_mode:
+            case HCPHandler.ListBucketsOutputMode.FULL:
+                return base | stats | bucket_information
+
+            case HCPHandler.ListBucketsOutputMode.EXTENDED:
+                bi_fields = [
+                    "Hard quota (Bytes)",
+                    "Soft quota (%)",
+                    "Description",
+                    "Owner",
+                ]
+                return (
+                    base | stats | {f: bucket_information[f] for f in bi_fields}
+                )
 
-                case HCPHandler.ListBucketsOutputMode.BUCKET_ONLY:
-                    output_list.append(base)
-        return output_list
+            case HCPHandler.ListBucketsOutputMode.SIMPLE:
+                stats_fields = [
+                    "Ingested volume (Bytes)",
+                    "Storage capacity used (Bytes)",
+                    "Object count",
+                ]
+                bi_fields = [
+                    "Hard quota (Bytes)",
+                    "Soft quota (%)",
+                    "Owner",
+                ]
+
+                return (
+                    base
+                    | {f: stats[f] for f in stats_fields}
+                    | {f: bucket_information[f] for f in bi_fields}
+                )
+
+            case HCPHandler.ListBucketsOutputMode.MINIMAL:
+                stats_fields = ["Object count"]
+                bi_fields = [
+                    "Hard quota (Bytes)",
+                    "Soft quota (%)",
+                    "Owner",
+                ]
+
+                return (
+                    base
+                    | {f: stats[f] for f in stats_fields}
+                    | {f: bucket_information[f] for f in bi_fields}
+                )
 
     # ---------------------------- Object methods ----------------------------
 
@@ -512,12 +960,45 @@ class HCPHandler:
         EXTENDED = "extended"
         MINIMAL = "minimal"
 
+    @staticmethod
+    def _format_object_dictionary(
+        key: str,
+        object_metadata: dict,
+        is_file: bool,
+        output_mode: ListObjectsOutputMode,
+    ) -> dict[str, Any]:
+        """
+        Format the metadata of a listed object according to `output_mode`.
+        """
+        base = {
+            "Key": key,
+            "IsFile": is_file,
+        }
+
+        match output_mode:
+            case HCPHandler.ListObjectsOutputMode.MINIMAL:
+                return base
+
+            case HCPHandler.ListObjectsOutputMode.SIMPLE:
+                return base | {
+                    "LastModified": object_metadata["LastModified"],
+                    "Size": object_metadata.get("Size", ""),
+                }
+
+            case HCPHandler.ListObjectsOutputMode.EXTENDED:
+                return base | {
+                    "LastModified": object_metadata["LastModified"],
+                    "Size": object_metadata.get("Size", ""),
+                    "ETag": object_metadata["ETag"],
+                }
+
     @check_mounted
-    def list_objects(  # noqa: C901
+    def list_objects(
         self,
         path_key: str = "",
         output_mode: ListObjectsOutputMode = ListObjectsOutputMode.EXTENDED,
         files_only: bool = False,
+        use_index: bool = False,
     ) -> Generator[dict[str, Any], Any, None]:
         r"""
         List all objects in the mounted bucket as a generator.
@@ -540,37 +1021,24 @@ class HCPHandler:
         :param files_only: If True, only yield file objects. Defaults to False
         :type files_only: bool, optional
 
+        :param use_index:
+            Boolean choice of answering from the local index instead of making
+            requests to the HCP, see :py:meth:`refresh_index`. Defaults to False
+        :type use_index: bool, optional
+
+        :raises NoBucketIndexError:
+            If `use_index` is True and the mounted bucket is not indexed
+
         :yield: A generator of all objects in specified folder in a bucket
         :rtype: Generator
         """  # noqa: D400, D415
-
-        def _format_output_dictionary(
-            key: str,
-            object_metadata: dict,
-            is_file: bool,
-            output_mode: HCPHandler.ListObjectsOutputMode,
-        ) -> dict[str, Any]:
-            base = {
-                "Key": key,
-                "IsFile": is_file,
-            }
-
-            match output_mode:
-                case HCPHandler.ListObjectsOutputMode.MINIMAL:
-                    return base
-
-                case HCPHandler.ListObjectsOutputMode.SIMPLE:
-                    return base | {
-                        "LastModified": object_metadata["LastModified"],
-                        "Size": object_metadata.get("Size", ""),
-                    }
-
-                case HCPHandler.ListObjectsOutputMode.EXTENDED:
-                    return base | {
-                        "LastModified": object_metadata["LastModified"],
-                        "Size": object_metadata.get("Size", ""),
-                        "ETag": object_metadata["ETag"],
-                    }
+        if use_index:
+            yield from self._list_objects_from_index(
+                path_key,
+                output_mode,
+                files_only,
+            )
+            return
 
         paginator: Paginator = self.s3_client.get_paginator("list_objects_v2")
         pages: PageIterator = paginator.paginate(
@@ -589,13 +1057,23 @@ class HCPHandler:
             if not files_only:
                 # Hide folder objects when flag `files_only` is True
                 # Handle folder objects before file objects
-                for folder_object in page.get("CommonPrefixes", []):
-                    folder_object: dict
-                    key = folder_object["Prefix"]
-                    folder_object_metadata = self.get_object(
-                        key,
-                    )
-                    yield _format_output_dictionary(
+                folder_keys = [
+                    folder_object["Prefix"]
+                    for folder_object in page.get("CommonPrefixes", [])
+                ]
+                # Only look up folder metadata when it is part of the output
+                folder_stats = (
+                    self.stat_many(folder_keys)
+                    if output_mode != HCPHandler.ListObjectsOutputMode.MINIMAL
+                    else {}
+                )
+                for key in folder_keys:
+                    folder_stat = folder_stats.get(key) or {}
+                    folder_object_metadata = {
+                        "LastModified": folder_stat.get("LastModified", ""),
+                        "ETag": folder_stat.get("ETag", ""),
+                    }
+                    yield self._format_object_dictionary(
                         key, folder_object_metadata, False, output_mode
                     )
 
@@ -604,14 +1082,201 @@ class HCPHandler:
                 file_object_metadata: dict
                 key = file_object_metadata["Key"]
                 if key != path_key:
-                    yield _format_output_dictionary(
+                    yield self._format_object_dictionary(
                         key, file_object_metadata, True, output_mode
                     )
 
+    def _list_objects_from_index(
+        self,
+        path_key: str,
+        output_mode: ListObjectsOutputMode,
+        files_only: bool,
+    ) -> Generator[dict[str, Any], Any, None]:
+        """
+        List one folder level of the mounted bucket from the local index, in
+        the same way as :py:meth:`list_objects`.
+        """
+        bucket_index = self._get_bucket_index()
+        bucket = str(self.bucket_name)
+        folder_keys, file_objects = bucket_index.list_level(bucket, path_key)
+
+        if not files_only:
+            folder_objects = bucket_index.get_objects(bucket, folder_keys)
+            for key in folder_keys:
+                folder_object = folder_objects.get(key) or {}
+                folder_object_metadata = {
+                    "LastModified": folder_object.get("LastModified", ""),
+                    "ETag": folder_object.get("ETag", ""),
+                }
+                yield self._format_object_dictionary(
+                    key, folder_object_metadata, False, output_mode
+                )
+
+        for file_object_metadata in file_objects:
+            key = file_object_metadata["Key"]
+            if key != path_key:
+                yield self._format_object_dictionary(
+                    key, file_object_metadata, True, output_mode
+                )
+
+    @check_mounted
+    def list_objects_parallel(
+        self,
+        path_key: str = "",
+        output_mode: ListObjectsOutputMode = ListObjectsOutputMode.EXTENDED,
+        files_only: bool = False,
+        parallel: int = _DEFAULT_MAX_WORKERS,
+        sort_output: bool = False,
+    ) -> Generator[dict[str, Any], Any, None]:
+        r"""
+        List all objects in the mounted bucket recursively, that is including
+        the objects in every subfolder, using concurrent requests.
+
+        The key space under `path_key` is first discovered by listing a few
+        folder levels with "/" as delimiter. The folders that were found are
+        then split into disjoint key ranges, which are listed concurrently by
+        `parallel` threads. Splitting works best when the objects are spread
+        over many folders or many different initial characters.
+
+        :param path_key:
+            Filter string for which keys to list, specifically for finding
+            objects in certain folders. Defaults to \"the root\" of the bucket
+        :type path_key: str, optional
+
+        :param output_mode:
+            The output mode is any of the following:\n
+                    HCPHandler.ListObjectsOutputMode.SIMPLE,\n
+                    HCPHandler.ListObjectsOutputMode.EXTENDED,\n
+                    HCPHandler.ListObjectsOutputMode.MINIMAL\n
+            Default is EXTENDED
+        :type output_mode: ListObjectsOutputMode, optional
+
+        :param files_only: If True, only yield file objects. Defaults to False
+        :type files_only: bool, optional
+
+        :param parallel:
+            The maximum number of listing requests that are running at the same
+            time. Defaults to 10
+        :type parallel: int, optional
+
+        :param sort_output:
+            Boolean choice of yielding the objects sorted by key. Unsorted
+            output is yielded as soon as it arrives. Defaults to False
+        :type sort_output: bool, optional
+
+        :yield: A generator of all objects under `path_key`
+        :rtype: Generator
+        """
+
+        def _format(hcp_object: dict[str, Any]) -> dict[str, Any]:
+            key = hcp_object["Key"]
+            return self._format_object_dictionary(
+                key,
+                hcp_object,
+                not key.endswith("/"),
+                output_mode,
+            )
+
+        def _include(hcp_object: dict[str, Any]) -> bool:
+            key = hcp_object["Key"]
+            return key != path_key and not (files_only and key.endswith("/"))
+
+        executor = ThreadPoolExecutor(max_workers=parallel)
+        try:
+            # Discover the key space with delimited listings. The objects that
+            # are found directly in the probed folders are part of the output
+            probed_objects: list[dict[str, Any]] = []
+            prefixes = [path_key]
+            for _ in range(_MAX_PROBE_DEPTH):
+                if not prefixes or len(prefixes) >= parallel:
+                    break
+                subfolders: list[str] = []
+                for level_subfolders, level_objects in executor.map(
+                    self._list_folder_level,
+                    prefixes,
+                ):
+                    subfolders.extend(level_subfolders)
+                    probed_objects.extend(level_objects)
+                prefixes = subfolders
+
+            # Split each folder into key ranges, so that there are enough
+            # ranges to keep every thread busy
+            ranges_per_prefix = (
+                -(-parallel // len(prefixes)) if prefixes else 1  # Ceiling
+            )
+            key_ranges = [
+                key_range
+                for prefix in sorted(prefixes)
+                for key_range in split_key_range(prefix, ranges_per_prefix)
+            ]
+            futures = [
+                executor.submit(self._list_key_range, *key_range)
+                for key_range in key_ranges
+            ]
+
+            if sort_output:
+                # The key ranges are disjoint and in key order, which means
+                # that their concatenation is sorted as well
+                probed_objects.sort(key=lambda hcp_object: hcp_object["Key"])
+                hcp_objects = merge(
+                    probed_objects,
+                    (
+                        hcp_object
+                        for future in futures
+                        for hcp_object in future.result()
+                    ),
+                    key=lambda hcp_object: hcp_object["Key"],
+                )
+            else:
+                hcp_objects = chain(
+                    probed_objects,
+                    (
+                        hcp_object
+                        for future in as_completed(futures)
+                        for hcp_object in future.result()
+                    ),
+                )
+
+            for hcp_object in hcp_objects:
+                if _include(hcp_object):
+                    yield _format(hcp_object)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _list_key_range(
+        self,
+        prefix: str,
+        start_after: str,
+        end_key: str,
+    ) -> list[dict[str, Any]]:
+        """
+        List the objects under `prefix`, without delimiter, with keys that
+        are greater than `start_after` and less than or equal to `end_key`.
+        An empty `start_after` or `end_key` leaves that end of the range open.
+
+        :return: The listing metadata of the objects, in key order
+        :rtype: list[dict[str, Any]]
+        """
+        paginator: Paginator = self.s3_client.get_paginator("list_objects_v2")
+        pages: PageIterator = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=prefix,
+            StartAfter=start_after,
+        )
+        objects: list[dict[str, Any]] = []
+        for page in pages:
+            for hcp_object in page.get("Contents", []):
+                if end_key and hcp_object["Key"] > end_key:
+                    return objects
+                objects.append(hcp_object)
+        return objects
+
     @check_mounted
     def get_object(self, key: str) -> dict:
         """
-        Retrieve object metadata.
+        Retrieve an object along with its metadata. Note that this opens a
+        stream to the object body, use :py:meth:`stat` if only the metadata is
+        needed.
 
         :param key: The object name
         :type key: str
@@ -627,535 +1292,3329 @@ class HCPHandler:
         )
 
     @check_mounted
-    def object_exists(self, key: str) -> bool:
+    def stat(self, key: str) -> dict[str, Any]:
         """
-        Check if a given object is in the mounted bucket.
+        Retrieve the metadata of an object without fetching the object body.
 
         :param key: The object name
         :type key: str
 
-        :return: True if the object exist, otherwise False
-        :rtype: bool
-        """
+        :raises ObjectDoesNotExistError:
+            If the object does not exist in the bucket
+
+        :return:
+            A dictionary with the keys `"Key"`, `"Size"`, `"ETag"`,
+            `"LastModified"`, `"ContentType"` and `"Metadata"`, which holds
+            the user metadata of the object
+        :rtype: dict[str, Any]
+        """
+        try:
+            response = self.s3_client.head_object(
+                Bucket=self.bucket_name,
+                Key=key,
+            )
+        except ClientError as e:
+            status_code = e.response["ResponseMetadata"].get(
+                "HTTPStatusCode",
+                -1,
+            )
+            if status_code == 404:  # noqa: PLR2004
+                msg = (
+                    'Could not find object "'
+                    + key
+                    + '" in bucket "'
+                    + str(self.bucket_name)
+                    + '"'
+                )
+                raise ObjectDoesNotExistError(msg) from None
+            raise
+
+        return {
+            "Key": key,
+            "Size": response["ContentLength"],
+            "ETag": response["ETag"],
+            "LastModified": response["LastModified"],
+            "ContentType": response.get("ContentType", ""),
+            "Metadata": response.get("Metadata", {}),
+        }
+
+    @check_mounted
+    def stat_many(
+        self,
+        keys: list[str],
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+    ) -> dict[str, dict[str, Any] | None]:
+        """
+        Retrieve the metadata of several objects concurrently, see
+        :py:meth:`stat`.
+
+        :param keys: The object names
+        :type keys: list[str]
+
+        :param max_workers:
+            The maximum number of requests that are running at the same time.
+            Defaults to 10
+        :type max_workers: int, optional
+
+        :return:
+            A dictionary from each key to its metadata, or to `None` if the
+            object does not exist. The keys are in the same order as `keys`
+        :rtype: dict[str, dict[str, Any] | None]
+        """
+
+        def _stat_or_none(key: str) -> dict[str, Any] | None:
+            try:
+                return self.stat(key)
+            except ObjectDoesNotExistError:
+                return None
+
+        if not keys:
+            return {}
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(keys)),
+        ) as executor:
+            return dict(
+                zip(keys, executor.map(_stat_or_none, keys), strict=True),
+            )
+
+    @check_mounted
+    def object_exists(self, key: str) -> bool:
+        """
+        Check if a given object is in the mounted bucket.
+
+        :param key: The object name
+        :type key: str
+
+        :return: True if the object exist, otherwise False
+        :rtype: bool
+        """
         try:
-            response = self.get_object(key)
-            return response["ResponseMetadata"]["HTTPStatusCode"] == 200  # noqa: PLR2004
+            self.stat(key)
         except Exception:  # noqa: BLE001  # pragma: no cover
             return False
+        return True
 
     @check_mounted
-    def download_file(
+    def open(  # noqa: PLR0913
         self,
         key: str,
-        local_file_path: str,
-        show_progress_bar: bool = True,
-    ) -> None:
+        mode: str = "rb",
+        *,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        prefetch: int = DEFAULT_PREFETCH,
+        part_size: int = 0,
+        max_buffers: int = DEFAULT_MAX_BUFFERS,
+    ) -> ObjectReader | ObjectWriter:
         """
-        Download one object file from the mounted bucket.
+        Open an object in the mounted bucket as a binary file, without
+        downloading or staging it on disk.
 
-        :param key: Name of the object
+        In mode "rb", the object is opened as a seekable, read-only file. It is
+        read with ranged requests in blocks, which are cached and read ahead,
+        see :py:class:`NGPIris.hcp.reader.ObjectReader`. The reader can be
+        passed to anything that reads binary files, such as `gzip.open`, or
+        wrapped in `io.BufferedReader` for small reads.
+
+        In mode "wb", a new object is opened as a write-only file. The written
+        bytes are uploaded in parts while they are written, see
+        :py:class:`NGPIris.hcp.writer.ObjectWriter`, and the object appears
+        when the writer is closed.
+
+        :param key: The object name
         :type key: str
 
-        :param local_file_path:
-            Path to a file on your local system where the contents of the
-            object file can be put
-        :type local_file_path: str
+        :param mode: The mode to open the object in, "rb" or "wb"
+        :type mode: str, optional
 
-        :param show_progress_bar:
-            Boolean choice of displaying a progress bar. Defaults to True
-        :type show_progress_bar: bool, optional
+        :param block_size:
+            The size of each ranged request in bytes. Defaults to 4 MiB
+        :type block_size: int, optional
+
+        :param cache_blocks:
+            The number of blocks that are kept in memory. Defaults to 16
+        :type cache_blocks: int, optional
+
+        :param prefetch:
+            The number of blocks that are requested ahead of sequential reads,
+            or 0 for no read-ahead. Defaults to 2
+        :type prefetch: int, optional
+
+        :param part_size:
+            The size of each part in bytes when writing. Defaults to 0, which
+            means the multipart chunk size of the transfer config
+        :type part_size: int, optional
+
+        :param max_buffers:
+            The number of parts that are kept in memory when writing. Defaults
+            to 4
+        :type max_buffers: int, optional
+
+        :raises ValueError: If `mode` is not supported
+        :raises ObjectDoesNotExistError:
+            If the object does not exist in the bucket, in mode "rb"
+        :raises ObjectAlreadyExistError:
+            If the object already exists in the bucket, in mode "wb"
+
+        :return: The reader or the writer, which are also context managers
+        :rtype: ObjectReader | ObjectWriter
+        """
+        match mode:
+            case "rb":
+                pass
+            case "wb":
+                self._raise_if_object_exists(key)
+                return self._open_writer(key, part_size, max_buffers, None)
+            case _:
+                msg = 'Unsupported mode "' + mode + '", use "rb" or "wb"'
+                raise ValueError(msg)
+        hcp_object = self.stat(key)
+        return ObjectReader(
+            self.s3_client,
+            str(self.bucket_name),
+            key,
+            hcp_object["Size"],
+            hcp_object["ETag"],
+            transfer_limiter=self.transfer_limiter,
+            block_size=block_size,
+            cache_blocks=cache_blocks,
+            prefetch=prefetch,
+        )
+
+    def _raise_if_object_exists(self, key: str) -> None:
+        """
+        Raise `ObjectAlreadyExistError` if the object exists in the mounted
+        bucket.
+        """
+        if self.object_exists(key):
+            msg = 'The object "' + key + '" already exist in the mounted bucket'
+            raise ObjectAlreadyExistError(msg)
+
+    def _open_writer(
+        self,
+        key: str,
+        part_size: int,
+        max_buffers: int,
+        pbar: tqdm | None,
+        metadata: dict[str, str] | None = None,
+    ) -> ObjectWriter:
+        """
+        Open a writer for a new object, see :py:meth:`open`. The writer does
+        not check if the object already exists.
+        """
+        return ObjectWriter(
+            self.s3_client,
+            str(self.bucket_name),
+            key,
+            self.transfer_limiter,
+            part_size or self.transfer_config.multipart_chunksize,
+            max_buffers=max_buffers,
+            callback=self._get_transfer_callback(pbar),
+            extra_args={"Metadata": metadata} if metadata else None,
+        )
+
+    class Compression(Enum):
+        GZIP = "gzip"
+        ZSTD = "zstd"
+
+    @check_mounted
+    def stream_object(  # noqa: PLR0913
+        self,
+        key: str,
+        first_byte: int = 0,
+        last_byte: int | None = None,
+        *,
+        part_size: int = 0,
+        prefetch: int = DEFAULT_PREFETCH,
+        decompress: bool = False,
+    ) -> Generator[bytes, None, None]:
+        """
+        Stream an object, or a byte range of it, from the mounted bucket as a
+        generator of chunks, without writing it to disk.
+
+        The object is requested in byte ranges, and up to `prefetch` ranges
+        ahead of the one being consumed are downloaded concurrently. This keeps
+        the throughput close to that of a parallel download, while at most
+        `prefetch + 1` ranges are kept in memory. Every range is requested with
+        `If-Match`, so that an object that changes while it is streamed fails
+        rather than mixes two versions. Closing the generator early cancels the
+        ranges that have not been downloaded.
+
+        :param key: The object name
+        :type key: str
+
+        :param first_byte: The first byte to stream. Defaults to 0
+        :type first_byte: int, optional
+
+        :param last_byte:
+            The last byte to stream, inclusively. Defaults to None, which means
+            the end of the object
+        :type last_byte: int | None, optional
+
+        :param part_size:
+            The size of the ranges in bytes. Defaults to 0, which means the
+            multipart chunk size of the transfer config
+        :type part_size: int, optional
+
+        :param prefetch:
+            The number of ranges that are downloaded ahead of the consumer.
+            Defaults to 2
+        :type prefetch: int, optional
+
+        :param decompress:
+            Boolean choice of decompressing an object that was uploaded with
+            compression, see :py:meth:`upload_file`. The object is then
+            decompressed on a worker thread while the next ranges are
+            downloaded. Objects without compression are streamed as they are.
+            Defaults to False
+        :type decompress: bool, optional
 
         :raises ObjectDoesNotExistError:
             If the object does not exist in the bucket
 
-        :raises ClientError:
-            Underlying botocore exception.
-            https://boto3.amazonaws.com/v1/documentation/api/latest/guide/error-handling.html#aws-service-exceptions
-        :raises Exception: Other exceptions
+        :raises ValueError:
+            If the byte range is not valid, or if a byte range of a compressed
+            object is to be decompressed
+
+        :yield: The bytes of the object, in order, one range at a time
+        :rtype: Generator[bytes, None, None]
         """
-        try:
-            self.get_object(key)
-        except:  # noqa: E722
+        if first_byte < 0 or (last_byte is not None and last_byte < first_byte):
             msg = (
-                'Could not find object "'
-                + key
-                + '" in bucket "'
-                + str(self.bucket_name)
-                + '"'
+                "Invalid byte range "
+                + str(first_byte)
+                + "-"
+                + ("" if last_byte is None else str(last_byte))
             )
-            raise ObjectDoesNotExistError(
-                msg,
-            ) from None
+            raise ValueError(msg)
+        hcp_object = self.stat(key)
+        size: int = hcp_object["Size"]
+        end = size if last_byte is None else min(last_byte + 1, size)
+        compression = (
+            hcp_object["Metadata"].get(COMPRESSION_METADATA_KEY)
+            if decompress
+            else None
+        )
+        if compression and (first_byte or end != size):
+            msg = "A byte range of a compressed object cannot be decompressed"
+            raise ValueError(msg)
+
+        chunks = self._stream_ranges(
+            hcp_object,
+            first_byte,
+            end,
+            part_size or self.transfer_config.multipart_chunksize,
+            prefetch,
+        )
+        if compression:
+            chunks = iterate_in_thread(decompress_chunks(chunks, compression))
+        with closing(chunks):
+            yield from chunks
 
-        if show_progress_bar:
-            file_size: int = self.s3_client.head_object(
-                Bucket=self.bucket_name,
-                Key=key,
-            )["ContentLength"]
-            with tqdm(
-                total=file_size,
-                unit="B",
-                unit_scale=True,
-                desc=key,
-            ) as pbar:
-                self.s3_client.download_file(
+    def _stream_ranges(
+        self,
+        hcp_object: dict[str, Any],
+        first_byte: int,
+        end: int,
+        part_size: int,
+        prefetch: int,
+    ) -> Generator[bytes, None, None]:
+        """
+        Download the bytes from `first_byte` up to `end` of an object in
+        ranges, with up to `prefetch` ranges ahead of the one being consumed,
+        see :py:meth:`stream_object`.
+
+        :param hcp_object: The metadata of the object, see :py:meth:`stat`
+        :type hcp_object: dict[str, Any]
+
+        :param first_byte: The first byte to download
+        :type first_byte: int
+
+        :param end: The byte after the last byte to download
+        :type end: int
+
+        :param part_size: The size of the ranges in bytes
+        :type part_size: int
+
+        :param prefetch: The number of ranges that are downloaded ahead
+        :type prefetch: int
+
+        :yield: The bytes of the object, in order, one range at a time
+        :rtype: Generator[bytes, None, None]
+        """
+        key: str = hcp_object["Key"]
+
+        def _download_range(range_start: int) -> bytes:
+            range_end = min(range_start + part_size, end) - 1
+            with self.transfer_limiter.reserve(range_end - range_start + 1):
+                response: dict = self.s3_client.get_object(
                     Bucket=self.bucket_name,
                     Key=key,
-                    Filename=local_file_path,
-                    Config=self.transfer_config,
-                    Callback=lambda bytes_transferred: pbar.update(
-                        bytes_transferred,
-                    ),
+                    Range="bytes=" + str(range_start) + "-" + str(range_end),
+                    IfMatch=hcp_object["ETag"],
                 )
-        else:
-            self.s3_client.download_file(
-                Bucket=self.bucket_name,
-                Key=key,
-                Filename=local_file_path,
-                Config=self.transfer_config,
+                body: bytes = response["Body"].read()
+            self.transfer_limiter.throttle(len(body))
+            return body
+
+        range_starts = iter(range(first_byte, end, part_size))
+        executor = ThreadPoolExecutor(max_workers=max(prefetch, 1))
+        try:
+            window: deque[Future[bytes]] = deque(
+                executor.submit(_download_range, range_start)
+                for range_start in islice(range_starts, prefetch + 1)
             )
+            while window:
+                body = window.popleft().result()
+                range_start = next(range_starts, None)
+                if range_start is not None:
+                    window.append(executor.submit(_download_range, range_start))
+                yield body
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
     @check_mounted
-    def download_folder(
+    def upload_stream(  # noqa: PLR0913
         self,
-        folder_key: str,
-        local_folder_path: str,
-        use_download_limit: bool = False,
-        download_limit_in_bytes: Byte = TiB(1).to_Byte(),  # noqa: B008
+        stream: Iterable[bytes],
+        key: str,
         show_progress_bar: bool = True,
+        *,
+        part_size: int = 0,
+        max_buffers: int = DEFAULT_MAX_BUFFERS,
+        compression: Compression | None = None,
     ) -> None:
         """
-        Download multiple objects from a folder in the mounted bucket.
+        Upload a stream of bytes to a new object in the mounted bucket, such as
+        the output of a generator or the chunks of a pipe, without staging it
+        on disk. The parts are uploaded while the stream is still being
+        consumed, and at most `max_buffers` parts are kept in memory, see
+        :py:class:`NGPIris.hcp.writer.ObjectWriter`. If the stream raises an
+        exception, the upload is aborted and no object is created.
 
-        :param folder_key: Name of the folder
-        :type folder_key: str
+        :param stream: The chunks of bytes to upload, in order
+        :type stream: Iterable[bytes]
 
-        :param local_folder_path:
-            Path to a folder on your local system where the contents of the
-            objects can be put
-        :type local_folder_path: str
+        :param key: The name of the new object
+        :type key: str
 
-        :param use_download_limit:
-            Boolean choice for using a download limit. Defaults to False
-        :type use_download_limit: bool, optional
+        :param show_progress_bar:
+            Boolean choice of displaying a progress bar of the uploaded bytes.
+            Defaults to True
+        :type show_progress_bar: bool, optional
 
-        :param download_limit_in_bytes:
-            The optional download limit in Byte (from the package `bitmath`).
-            Defaults to 1 TB (`TiB(1).to_Byte()`)
-        :type download_limit_in_bytes: Byte, optional
+        :param part_size:
+            The size of each part in bytes. Defaults to 0, which means the
+            multipart chunk size of the transfer config. Since an object can
+            be at most 10,000 parts, this also sets the largest stream that can
+            be uploaded
+        :type part_size: int, optional
+
+        :param max_buffers:
+            The number of parts that are kept in memory. Defaults to 4
+        :type max_buffers: int, optional
+
+        :param compression:
+            The compression of the object, see :py:meth:`upload_file`, or None
+            for no compression. The progress bar then counts compressed bytes.
+            Defaults to None
+        :type compression: HCPHandler.Compression | None, optional
+
+        :raises ObjectAlreadyExistError: If the object already exists
+        :raises ImportError:
+            If `compression` is HCPHandler.Compression.ZSTD and zstandard is
+            not installed
+        """
+        self._raise_if_object_exists(key)
+        metadata = None
+        if compression is not None:
+            stream = iterate_in_thread(
+                compress_chunks(stream, compression.value),
+            )
+            metadata = {COMPRESSION_METADATA_KEY: compression.value}
+
+        pbar = (
+            tqdm(unit="B", unit_scale=True, desc=key)
+            if show_progress_bar
+            else None
+        )
+        try:
+            with self._open_writer(
+                key,
+                part_size,
+                max_buffers,
+                pbar,
+                metadata,
+            ) as writer:
+                for chunk in stream:
+                    writer.write(chunk)
+        finally:
+            if pbar is not None:
+                pbar.close()
+
+    @check_mounted
+    def download_file(  # noqa: PLR0913
+        self,
+        key: str,
+        local_file_path: str,
+        show_progress_bar: bool = True,
+        *,
+        resume: bool = False,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        parallel: bool = False,
+        part_size: int = 0,
+        decompress: bool = True,
+        verify: bool = False,
+        manifest: bool = False,
+    ) -> None:
+        """
+        Download one object file from the mounted bucket.
+
+        :param key: Name of the object
+        :type key: str
+
+        :param local_file_path:
+            Path to a file on your local system where the contents of the
+            object file can be put
+        :type local_file_path: str
 
         :param show_progress_bar:
             Boolean choice of displaying a progress bar. Defaults to True
         :type show_progress_bar: bool, optional
 
+        :param resume:
+            Boolean choice of downloading in a resumable way, see
+            :py:meth:`_download_file_resumable`. An interrupted download is
+            then continued from where it stopped the next time it is made.
+            Defaults to False
+        :type resume: bool, optional
+
+        :param max_workers:
+            The maximum number of byte ranges that are downloaded at the same
+            time when `resume` or `parallel` is True. Defaults to 10
+        :type max_workers: int, optional
+
+        :param parallel:
+            Boolean choice of downloading in byte ranges straight into a
+            preallocated file, see :py:meth:`_download_file_parallel`, which
+            suits large objects on links with high latency. Ignored when
+            `resume` is True. Defaults to False
+        :type parallel: bool, optional
+
+        :param part_size:
+            The size of the byte ranges in bytes when `parallel` is True or the
+            object is decompressed. Defaults to 0, which means the multipart
+            chunk size of the transfer config
+        :type part_size: int, optional
+
+        :param decompress:
+            Boolean choice of decompressing an object that was uploaded with
+            compression by this library, see
+            :py:meth:`_download_file_decompressed`. `resume` and `parallel`
+            are then ignored, and the progress bar counts compressed bytes.
+            Defaults to True
+        :type decompress: bool, optional
+
+        :param verify:
+            Boolean choice of hashing the object while it is downloaded and
+            comparing the checksums with its ETag, see
+            :py:meth:`_download_file_hashed`, instead of reading the file again
+            afterwards. `resume` and `parallel` are then ignored. Compressed
+            objects are verified before they are decompressed. Defaults to
+            False
+        :type verify: bool, optional
+
+        :param manifest:
+            Boolean choice of writing the MD5 and the SHA-256 of the object to
+            a JSON manifest next to the file, see
+            :py:func:`NGPIris.hcp.checksum.write_manifest`. Implies `verify`.
+            Defaults to False
+        :type manifest: bool, optional
+
         :raises ObjectDoesNotExistError:
             If the object does not exist in the bucket
 
-        :raises DownloadLimitReachedError:
-            If download limit was reached while downloading files
+        :raises ChecksumMismatchError:
+            If `verify` or `manifest` is True and the downloaded bytes do not
+            match the ETag, in which case no file is created
 
-        :raises NotADirectoryError: If local_folder_path is not a directory
+        :raises ClientError:
+            Underlying botocore exception.
+            https://boto3.amazonaws.com/v1/documentation/api/latest/guide/error-handling.html#aws-service-exceptions
+        :raises Exception: Other exceptions
         """
-        try:
-            self.get_object(folder_key)
-        except:  # noqa: E722
-            msg = (
-                'Could not find object "'
-                + folder_key
-                + '" in bucket "'
-                + str(self.bucket_name)
-                + '"'
+        hcp_object = self.stat(key)
+        file_size: int = hcp_object["Size"]
+        compression = hcp_object["Metadata"].get(COMPRESSION_METADATA_KEY)
+        checksums = None
+        if verify or manifest:
+            part_sizes = get_etag_part_sizes(
+                hcp_object["ETag"],
+                file_size,
+                [self.transfer_config.multipart_chunksize],
             )
-            raise ObjectDoesNotExistError(
-                msg,
-            ) from None
-        if Path(local_folder_path).is_dir():
-            current_download_size_in_bytes = Byte(
-                0,
-            )  # For tracking download limit
-            (Path(local_folder_path) / Path(folder_key)).mkdir(
-                parents=True,
-            )  # Create "base folder"
-            for hcp_object in self.list_objects(
-                folder_key,
-            ):  # Build the tree with directories or add files:
-                p = Path(local_folder_path) / Path(hcp_object["Key"])
-                if not hcp_object["IsFile"]:  # If the object is a "folder"
-                    p.mkdir(parents=True)
-                    self.download_folder(
-                        folder_key=str(hcp_object["Key"]),
-                        local_folder_path=local_folder_path,
-                        use_download_limit=use_download_limit,
-                        show_progress_bar=show_progress_bar,
-                        download_limit_in_bytes=download_limit_in_bytes
-                        - current_download_size_in_bytes,
-                    )
-                else:  # If the object is a file
-                    current_download_size_in_bytes += Byte(hcp_object["Size"])
-                    if (
-                        current_download_size_in_bytes
-                        >= download_limit_in_bytes
-                        and use_download_limit
-                    ):
-                        msg = (
-                            "The download limit was reached when downloading"
-                            " files"
-                        )
-                        raise DownloadLimitReachedError(msg)
-                    self.download_file(
-                        hcp_object["Key"],
-                        p.as_posix(),
-                        show_progress_bar=show_progress_bar,
-                    )
-        else:
-            raise NotADirectoryError(
-                local_folder_path + " is not a directory",
+            checksums = Checksums(
+                part_sizes,
+                include_md5=manifest or not part_sizes,
+                include_sha256=manifest,
             )
 
-    class UploadMode(Enum):
-        STANDARD = "standard"
-        SIMPLE = "simple"
-        EQUAL_PARTS = "equal_parts"
+        pbar = (
+            tqdm(total=file_size, unit="B", unit_scale=True, desc=key)
+            if show_progress_bar
+            else None
+        )
+        try:
+            if decompress and compression:
+                self._download_file_decompressed(
+                    hcp_object,
+                    local_file_path,
+                    compression,
+                    pbar,
+                    part_size or self.transfer_config.multipart_chunksize,
+                    checksums=checksums,
+                )
+            elif checksums is not None:
+                self._download_file_hashed(
+                    hcp_object,
+                    local_file_path,
+                    pbar,
+                    checksums,
+                )
+            elif resume:
+                self._download_file_resumable(
+                    hcp_object,
+                    local_file_path,
+                    pbar,
+                    max_workers,
+                )
+            elif parallel:
+                self._download_file_parallel(
+                    hcp_object,
+                    local_file_path,
+                    pbar,
+                    part_size or self.transfer_config.multipart_chunksize,
+                    max_workers,
+                )
+            else:
+                config = self._limit_config(self.transfer_config)
+                with self._reserve_transfer(file_size, config):
+                    self.s3_client.download_file(
+                        Bucket=self.bucket_name,
+                        Key=key,
+                        Filename=local_file_path,
+                        Config=config,
+                        Callback=self._get_transfer_callback(pbar),
+                    )
+        finally:
+            if pbar is not None:
+                pbar.close()
 
-    @check_mounted
-    def upload_file(
+        if manifest and checksums is not None:
+            write_manifest(local_file_path, hcp_object, checksums)
+
+    def _download_file_hashed(
         self,
+        hcp_object: dict[str, Any],
         local_file_path: str,
-        key: str = "",
-        show_progress_bar: bool = True,
-        upload_mode: UploadMode = UploadMode.STANDARD,
-        equal_parts: int = 5,
+        pbar: tqdm | None,
+        checksums: Checksums,
     ) -> None:
-        r"""
-        Upload one file to the mounted bucket.
+        """
+        Download an object to a partial file next to `local_file_path` while
+        hashing it, and rename the file once the checksums match the ETag.
 
-        :param local_file_path: Path to the file to be uploaded
-        :type local_file_path: str
+        The object is downloaded like any other, but written through a
+        :py:class:`NGPIris.hcp.checksum.HashingFile`, which makes boto3 write
+        it in order and hands every chunk to a
+        :py:class:`NGPIris.hcp.checksum.TransferHasher` on its way to the
+        disk. An object that is replaced during the download does not match
+        the ETag it had when the download started, and is therefore rejected
+        as well. A failed or mismatching download removes the partial file.
 
-        :param key:
-            An optional new name for the file object on the bucket.
-            Defaults to the same name as the file
-        :type key: str, optional
+        :param hcp_object: The metadata of the object, see :py:meth:`stat`
+        :type hcp_object: dict[str, Any]
 
-        :param show_progress_bar:
-            Boolean choice of displaying a progress bar. Defaults to True
-        :type show_progress_bar: bool, optional
+        :param local_file_path: Path to the finished file
+        :type local_file_path: str
 
-        :param upload_mode:
-            The upload mode of the transfer is any of the following:\n
-                HCPHandler.UploadMode.STANDARD,\n
-                HCPHandler.UploadMode.SIMPLE,\n
-                HCPHandler.UploadMode.EQUAL_PARTS\n
-            Default is STANDARD
-        :type upload_mode: UploadMode, optional
+        :param pbar: Progress bar to be updated with downloaded bytes, or None
+        :type pbar: tqdm | None
 
-        :param equal_parts:
-            The number of equal parts that each file should be divided into when
-            using the HCPHandler.UploadMode.EQUAL_PARTS mode. Default is 5
-        :type equal_parts: int, optional
+        :param checksums: The checksums to calculate
+        :type checksums: Checksums
 
-        :raises FileNotFoundError: If `path` does not exist
+        :raises ChecksumMismatchError: If the checksums do not match the ETag
+        """
+        part_path = Path(local_file_path + PART_SUFFIX)
+        config = self._limit_config(self.transfer_config)
+        try:
+            with (
+                part_path.open("wb") as file,
+                TransferHasher(checksums) as hasher,
+                self._reserve_transfer(hcp_object["Size"], config),
+            ):
+                self.s3_client.download_fileobj(
+                    Bucket=self.bucket_name,
+                    Key=hcp_object["Key"],
+                    Fileobj=HashingFile(file, hasher),
+                    Config=config,
+                    Callback=self._get_transfer_callback(pbar),
+                )
+            self._raise_if_checksums_mismatch(hcp_object, checksums)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
 
-        :raises UnallowedCharacterError: If the \"\\\" is used in the file path
+        part_path.replace(local_file_path)
 
-        :raises ObjectAlreadyExistError:
-            If the object already exist on the mounted bucket
+    def _raise_if_checksums_mismatch(
+        self,
+        hcp_object: dict[str, Any],
+        checksums: Checksums | None,
+    ) -> None:
         """
-        raise_path_error(local_file_path)
-
-        if not key:
-            file_name = Path(local_file_path).name
-            key = file_name
+        Raise `ChecksumMismatchError` if `checksums` do not match the ETag of
+        the object. Does nothing if `checksums` is None.
+        """
+        if checksums is not None and not checksums.matches(hcp_object["ETag"]):
+            msg = (
+                'The checksums of "'
+                + hcp_object["Key"]
+                + '" do not match its ETag '
+                + hcp_object["ETag"]
+                + " after "
+                + str(checksums.size)
+                + " transferred bytes"
+            )
+            raise ChecksumMismatchError(msg)
 
-        if "\\" in local_file_path:
-            msg = 'The "\\" character is not allowed in the file path'
+    def _download_file_resumable(
+        self,
+        hcp_object: dict[str, Any],
+        local_file_path: str,
+        pbar: tqdm | None,
+        max_workers: int,
+    ) -> None:
+        """
+        Download an object in byte ranges to a partial file next to
+        `local_file_path`, which is renamed once every range is complete.
+
+        The completed ranges are recorded in a checkpoint next to the partial
+        file, see :py:class:`DownloadCheckpoint`. When the download is made
+        again, only the missing ranges are downloaded. A checkpoint of another
+        version of the object, as told by its ETag and size, is discarded and
+        the download starts over. Every range is requested with `If-Match`, so
+        that an object that changes during the download is not mixed with the
+        previous version.
+
+        :param hcp_object: The metadata of the object, see :py:meth:`stat`
+        :type hcp_object: dict[str, Any]
+
+        :param local_file_path: Path to the finished file
+        :type local_file_path: str
+
+        :param pbar: Progress bar to be updated with downloaded bytes, or None
+        :type pbar: tqdm | None
+
+        :param max_workers:
+            The maximum number of ranges that are downloaded at the same time
+        :type max_workers: int
+        """
+        key: str = hcp_object["Key"]
+        etag: str = hcp_object["ETag"]
+        size: int = hcp_object["Size"]
+        part_path = Path(local_file_path + PART_SUFFIX)
+        checkpoint = DownloadCheckpoint(
+            local_file_path + PART_SUFFIX + CHECKPOINT_SUFFIX,
+        )
+        if not (checkpoint.matches(key, etag, size) and part_path.exists()):
+            part_path.unlink(missing_ok=True)
+            checkpoint.reset(
+                key,
+                etag,
+                size,
+                self.transfer_config.multipart_chunksize,
+            )
+
+        missing_ranges = checkpoint.get_missing_ranges()
+        callback = self._get_transfer_callback(pbar)
+        if pbar is not None:
+            pbar.update(
+                size
+                - sum(
+                    last_byte - first_byte + 1
+                    for first_byte, last_byte in missing_ranges
+                ),
+            )
+
+        file_descriptor = os.open(part_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            preallocate_file(file_descriptor, size)
+
+            def _download_range(first_byte: int, last_byte: int) -> int:
+                offset = first_byte
+                with self.transfer_limiter.reserve(last_byte - first_byte + 1):
+                    response: dict = self.s3_client.get_object(
+                        Bucket=self.bucket_name,
+                        Key=key,
+                        Range="bytes=" + str(first_byte) + "-" + str(last_byte),
+                        IfMatch=etag,
+                    )
+                    for chunk in response["Body"].iter_chunks(_MB):
+                        os.pwrite(file_descriptor, chunk, offset)
+                        offset += len(chunk)
+                        callback(len(chunk))
+                # The range has to be on disk before it is recorded
+                os.fsync(file_descriptor)
+                checkpoint.add(first_byte)
+                return offset - first_byte
+
+            self._run_parts(_download_range, missing_ranges, max_workers)
+        finally:
+            os.close(file_descriptor)
+
+        part_path.replace(local_file_path)
+        checkpoint.remove()
+
+    def _download_file_parallel(
+        self,
+        hcp_object: dict[str, Any],
+        local_file_path: str,
+        pbar: tqdm | None,
+        part_size: int,
+        max_workers: int,
+    ) -> None:
+        """
+        Download an object in byte ranges to a partial file next to
+        `local_file_path`, which is renamed once every range is complete.
+
+        The partial file is preallocated to the size of the object, and every
+        range is written straight to its offset with `pwrite` as it arrives,
+        without being buffered or put back together in order. Every range is
+        requested with `If-Match`, so that an object that changes during the
+        download is not mixed with the previous version. A failed download
+        removes the partial file, see :py:meth:`_download_file_resumable` for
+        downloads that can be continued.
+
+        :param hcp_object: The metadata of the object, see :py:meth:`stat`
+        :type hcp_object: dict[str, Any]
+
+        :param local_file_path: Path to the finished file
+        :type local_file_path: str
+
+        :param pbar: Progress bar to be updated with downloaded bytes, or None
+        :type pbar: tqdm | None
+
+        :param part_size: The size of each byte range in bytes
+        :type part_size: int
+
+        :param max_workers:
+            The maximum number of ranges that are downloaded at the same time
+        :type max_workers: int
+        """
+        key: str = hcp_object["Key"]
+        etag: str = hcp_object["ETag"]
+        size: int = hcp_object["Size"]
+        part_path = Path(local_file_path + PART_SUFFIX)
+        callback = self._get_transfer_callback(pbar)
+
+        file_descriptor = os.open(
+            part_path,
+            os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+            0o644,
+        )
+        try:
+            preallocate_file(file_descriptor, size)
+
+            def _download_range(first_byte: int, last_byte: int) -> int:
+                offset = first_byte
+                with self.transfer_limiter.reserve(last_byte - first_byte + 1):
+                    response: dict = self.s3_client.get_object(
+                        Bucket=self.bucket_name,
+                        Key=key,
+                        Range="bytes=" + str(first_byte) + "-" + str(last_byte),
+                        IfMatch=etag,
+                    )
+                    for chunk in response["Body"].iter_chunks(_MB):
+                        os.pwrite(file_descriptor, chunk, offset)
+                        offset += len(chunk)
+                        callback(len(chunk))
+                return offset - first_byte
+
+            self._run_parts(
+                _download_range,
+                (
+                    (first_byte, min(first_byte + part_size, size) - 1)
+                    for first_byte in range(0, size, part_size)
+                ),
+                max_workers,
+            )
+        except BaseException:
+            os.close(file_descriptor)
+            part_path.unlink(missing_ok=True)
+            raise
+        os.close(file_descriptor)
+
+        part_path.replace(local_file_path)
+
+    def _download_file_decompressed(  # noqa: PLR0913
+        self,
+        hcp_object: dict[str, Any],
+        local_file_path: str,
+        compression: str,
+        pbar: tqdm | None,
+        part_size: int,
+        *,
+        checksums: Checksums | None = None,
+    ) -> None:
+        """
+        Download an object that was uploaded with compression, and decompress
+        it to a partial file next to `local_file_path`, which is renamed once
+        the object is complete.
+
+        The object is downloaded in byte ranges that are prefetched
+        concurrently, see :py:meth:`stream_object`, and decompressed on a
+        worker thread, so that the network, the decompression and the writes
+        to disk overlap. A failed download removes the partial file.
+
+        :param hcp_object: The metadata of the object, see :py:meth:`stat`
+        :type hcp_object: dict[str, Any]
+
+        :param local_file_path: Path to the finished file
+        :type local_file_path: str
+
+        :param compression: The compression of the object, "gzip" or "zstd"
+        :type compression: str
+
+        :param pbar:
+            Progress bar to be updated with downloaded, compressed bytes, or
+            None
+        :type pbar: tqdm | None
+
+        :param part_size: The size of each byte range in bytes
+        :type part_size: int
+
+        :param checksums:
+            The checksums to calculate of the compressed bytes, which have to
+            match the ETag before the file is renamed, or None. Defaults to
+            None
+        :type checksums: Checksums | None, optional
+
+        :raises ImportError:
+            If `compression` is "zstd" and zstandard is not installed
+
+        :raises ChecksumMismatchError: If the checksums do not match the ETag
+        """
+        part_path = Path(local_file_path + PART_SUFFIX)
+        try:
+            with (
+                part_path.open("wb") as file,
+                (
+                    TransferHasher(checksums)
+                    if checksums is not None
+                    else nullcontext()
+                ) as hasher,
+                closing(
+                    iterate_in_thread(
+                        decompress_chunks(
+                            _update_progress(
+                                self._stream_ranges(
+                                    hcp_object,
+                                    0,
+                                    hcp_object["Size"],
+                                    part_size,
+                                    DEFAULT_PREFETCH,
+                                ),
+                                pbar,
+                                hasher,
+                            ),
+                            compression,
+                        ),
+                    ),
+                ) as decompressed_chunks,
+            ):
+                for chunk in decompressed_chunks:
+                    file.write(chunk)
+            self._raise_if_checksums_mismatch(hcp_object, checksums)
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+        part_path.replace(local_file_path)
+
+    def _download_file_if_compressed(
+        self,
+        key: str,
+        local_file_path: str,
+        pbar: tqdm | None,
+    ) -> bool:
+        """
+        Download and decompress an object if it was uploaded with compression,
+        see :py:meth:`_download_file_decompressed`.
+
+        :return: True if the object was compressed and downloaded, else False
+        :rtype: bool
+        """
+        hcp_object = self.stat(key)
+        compression = hcp_object["Metadata"].get(COMPRESSION_METADATA_KEY)
+        if not compression:
+            return False
+        self._download_file_decompressed(
+            hcp_object,
+            local_file_path,
+            compression,
+            pbar,
+            self.transfer_config.multipart_chunksize,
+        )
+        return True
+
+    @check_mounted
+    def download_folder(  # noqa: C901, PLR0913
+        self,
+        folder_key: str,
+        local_folder_path: str,
+        use_download_limit: bool = False,
+        download_limit_in_bytes: Byte = TiB(1).to_Byte(),  # noqa: B008
+        show_progress_bar: bool = True,
+        *,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        resume: bool = False,
+        decompress: bool = False,
+    ) -> None:
+        """
+        Download multiple objects from a folder in the mounted bucket.
+
+        The folder tree is crawled and downloaded concurrently by a single pool
+        of `max_workers` threads, which means that listing subfolders and
+        downloading files overlap each other.
+
+        :param folder_key: Name of the folder
+        :type folder_key: str
+
+        :param local_folder_path:
+            Path to a folder on your local system where the contents of the
+            objects can be put
+        :type local_folder_path: str
+
+        :param use_download_limit:
+            Boolean choice for using a download limit. Defaults to False
+        :type use_download_limit: bool, optional
+
+        :param download_limit_in_bytes:
+            The optional download limit in Byte (from the package `bitmath`).
+            Defaults to 1 TB (`TiB(1).to_Byte()`)
+        :type download_limit_in_bytes: Byte, optional
+
+        :param show_progress_bar:
+            Boolean choice of displaying a progress bar. Defaults to True
+        :type show_progress_bar: bool, optional
+
+        :param max_workers:
+            The maximum number of listings and downloads that are running at
+            the same time. Defaults to 10
+        :type max_workers: int, optional
+
+        :param resume:
+            Boolean choice of downloading every file in a resumable way, see
+            :py:meth:`download_file`. Files that already exist with the size
+            of their object are then skipped. Defaults to False
+        :type resume: bool, optional
+
+        :param decompress:
+            Boolean choice of decompressing the objects that were uploaded with
+            compression, see :py:meth:`download_file`. Since the compression is
+            only found in the metadata of each object, this makes one extra
+            request per object. Defaults to False
+        :type decompress: bool, optional
+
+        :raises ObjectDoesNotExistError:
+            If the object does not exist in the bucket
+
+        :raises DownloadLimitReachedError:
+            If download limit was reached while downloading files
+
+        :raises NotADirectoryError: If local_folder_path is not a directory
+        """
+        self.stat(folder_key)
+        if not Path(local_folder_path).is_dir():
+            raise NotADirectoryError(
+                local_folder_path + " is not a directory",
+            )
+
+        (Path(local_folder_path) / Path(folder_key)).mkdir(
+            parents=True,
+            exist_ok=True,
+        )  # Create "base folder"
+
+        def _download(hcp_object: dict[str, Any]) -> None:
+            key, size = hcp_object["Key"], hcp_object["Size"]
+            p = Path(local_folder_path) / Path(key)
+            if decompress and self._download_file_if_compressed(
+                key,
+                p.as_posix(),
+                pbar,
+            ):
+                return
+            if resume:
+                if p.is_file() and p.stat().st_size == size:
+                    if pbar is not None:
+                        pbar.update(size)
+                    return
+                # The files are already downloaded concurrently, which means
+                # that the ranges of each file are downloaded one at a time
+                self._download_file_resumable(
+                    hcp_object,
+                    p.as_posix(),
+                    pbar,
+                    max_workers=1,
+                )
+                return
+            config = self._get_worker_config(size)
+            with self._reserve_transfer(size, config):
+                self.s3_client.download_file(
+                    Bucket=self.bucket_name,
+                    Key=key,
+                    Filename=p.as_posix(),
+                    Config=config,
+                    Callback=self._get_transfer_callback(pbar),
+                )
+
+        # All scheduling happens on the calling thread, which means that the
+        # download size below is only ever updated by one thread at a time
+        current_download_size_in_bytes = Byte(0)  # For tracking download limit
+        pbar = (
+            tqdm(total=0, unit="B", unit_scale=True, desc=folder_key)
+            if show_progress_bar
+            else None
+        )
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending: set[Future] = {
+            executor.submit(self._list_folder_level, folder_key),
+        }
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    result = future.result()
+                    if result is None:  # A finished file download
+                        continue
+                    subfolders, objects = result
+                    for subfolder in subfolders:
+                        (Path(local_folder_path) / Path(subfolder)).mkdir(
+                            parents=True,
+                            exist_ok=True,
+                        )
+                        pending.add(
+                            executor.submit(
+                                self._list_folder_level,
+                                subfolder,
+                            ),
+                        )
+                    for hcp_object in objects:
+                        key, size = hcp_object["Key"], hcp_object["Size"]
+                        if key.endswith("/"):  # Skip folder objects
+                            continue
+                        current_download_size_in_bytes += Byte(size)
+                        if (
+                            current_download_size_in_bytes
+                            >= download_limit_in_bytes
+                            and use_download_limit
+                        ):
+                            msg = (
+                                "The download limit was reached when "
+                                "downloading files"
+                            )
+                            raise DownloadLimitReachedError(msg)
+                        if pbar is not None:
+                            pbar.total += size
+                            pbar.refresh()
+                        pending.add(executor.submit(_download, hcp_object))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if pbar is not None:
+                pbar.close()
+
+    def _list_folder_level(
+        self,
+        folder_key: str,
+    ) -> tuple[list[str], list[dict[str, Any]]]:
+        """
+        List one level of a folder in the mounted bucket without looking up any
+        folder object metadata.
+
+        :param folder_key: Name of the folder
+        :type folder_key: str
+
+        :return:
+            The subfolder keys and the listing metadata of the objects directly
+            in the folder, both in key order
+        :rtype: tuple[list[str], list[dict[str, Any]]]
+        """
+        paginator: Paginator = self.s3_client.get_paginator("list_objects_v2")
+        pages: PageIterator = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=folder_key,
+            Delimiter="/",
+        )
+        subfolders: list[str] = []
+        objects: list[dict[str, Any]] = []
+        for page in pages:
+            subfolders.extend(
+                folder_object["Prefix"]
+                for folder_object in page.get("CommonPrefixes", [])
+            )
+            objects.extend(page.get("Contents", []))
+        return subfolders, objects
+
+    class UploadMode(Enum):
+        STANDARD = "standard"
+        SIMPLE = "simple"
+        EQUAL_PARTS = "equal_parts"
+
+    @check_mounted
+    def upload_file(  # noqa: PLR0913
+        self,
+        local_file_path: str,
+        key: str = "",
+        show_progress_bar: bool = True,
+        upload_mode: UploadMode = UploadMode.STANDARD,
+        equal_parts: int = 5,
+        *,
+        resume: bool = False,
+        compression: Compression | None = None,
+        verify: bool = False,
+        manifest: bool = False,
+    ) -> None:
+        r"""
+        Upload one file to the mounted bucket.
+
+        :param local_file_path: Path to the file to be uploaded
+        :type local_file_path: str
+
+        :param key:
+            An optional new name for the file object on the bucket.
+            Defaults to the same name as the file
+        :type key: str, optional
+
+        :param show_progress_bar:
+            Boolean choice of displaying a progress bar. Defaults to True
+        :type show_progress_bar: bool, optional
+
+        :param upload_mode:
+            The upload mode of the transfer is any of the following:\n
+                HCPHandler.UploadMode.STANDARD,\n
+                HCPHandler.UploadMode.SIMPLE,\n
+                HCPHandler.UploadMode.EQUAL_PARTS\n
+            Default is STANDARD
+        :type upload_mode: UploadMode, optional
+
+        :param equal_parts:
+            The number of equal parts that each file should be divided into when
+            using the HCPHandler.UploadMode.EQUAL_PARTS mode. Default is 5
+        :type equal_parts: int, optional
+
+        :param resume:
+            Boolean choice of uploading files above the multipart threshold in
+            a resumable way, see :py:meth:`_upload_file_resumable`. An
+            interrupted upload is then continued from where it stopped the next
+            time it is made, even by another process. Has no effect in the
+            HCPHandler.UploadMode.SIMPLE mode. Defaults to False
+        :type resume: bool, optional
+
+        :param compression:
+            The compression of the object, which is any of the following:\n
+                HCPHandler.Compression.GZIP,\n
+                HCPHandler.Compression.ZSTD\n
+            or None for no compression, see :py:meth:`_upload_file_compressed`.
+            `upload_mode` and `resume` are then ignored. Defaults to None
+        :type compression: Compression | None, optional
+
+        :param verify:
+            Boolean choice of hashing the file while it is uploaded and
+            comparing the checksums with the ETag of the new object, see
+            :py:meth:`_upload_file_hashed`, instead of reading the file again
+            afterwards. `resume` is then ignored. Compressed files are verified
+            by the checksums of the compressed bytes. Defaults to False
+        :type verify: bool, optional
+
+        :param manifest:
+            Boolean choice of writing the MD5 and the SHA-256 of the uploaded
+            bytes to a JSON manifest next to the file, see
+            :py:func:`NGPIris.hcp.checksum.write_manifest`. Implies `verify`.
+            Defaults to False
+        :type manifest: bool, optional
+
+        :raises FileNotFoundError: If `path` does not exist
+
+        :raises UnallowedCharacterError: If the \"\\\" is used in the file path
+
+        :raises ObjectAlreadyExistError:
+            If the object already exist on the mounted bucket
+
+        :raises ChecksumMismatchError:
+            If `verify` or `manifest` is True and the new object does not match
+            the uploaded bytes, in which case the object is deleted
+        """
+        raise_path_error(local_file_path)
+
+        if not key:
+            file_name = Path(local_file_path).name
+            key = file_name
+
+        if "\\" in local_file_path:
+            msg = 'The "\\" character is not allowed in the file path'
             raise UnallowedCharacterError(msg)
 
-        if self.object_exists(key):
-            msg = 'The object "' + key + '" already exist in the mounted bucket'
-            raise ObjectAlreadyExistError(msg)
+        if self.object_exists(key):
+            msg = 'The object "' + key + '" already exist in the mounted bucket'
+            raise ObjectAlreadyExistError(msg)
+
+        file_size: int = Path(local_file_path).stat().st_size
+
+        config = self._get_upload_config(upload_mode, file_size, equal_parts)
+
+        checksums = (
+            self._get_upload_checksums(file_size, config, compression, manifest)
+            if verify or manifest
+            else None
+        )
+
+        pbar = (
+            tqdm(
+                total=file_size,
+                unit="B",
+                unit_scale=True,
+                desc=local_file_path,
+            )
+            if show_progress_bar
+            else None
+        )
+        try:
+            if compression is not None:
+                self._upload_file_compressed(
+                    local_file_path,
+                    key,
+                    compression,
+                    pbar,
+                    checksums,
+                )
+            elif checksums is not None:
+                self._upload_file_hashed(
+                    local_file_path,
+                    key,
+                    config,
+                    pbar,
+                    checksums,
+                )
+            elif (
+                resume
+                and upload_mode != HCPHandler.UploadMode.SIMPLE
+                and file_size >= config.multipart_threshold
+            ):
+                self._upload_file_resumable(
+                    local_file_path,
+                    key,
+                    config.multipart_chunksize,
+                    pbar,
+                    config.max_concurrency,
+                )
+            else:
+                config = self._limit_config(config)
+                with self._reserve_transfer(file_size, config):
+                    self.s3_client.upload_file(
+                        Filename=local_file_path,
+                        Bucket=self.bucket_name,
+                        Key=key,
+                        Config=config,
+                        Callback=self._get_transfer_callback(pbar),
+                    )
+        finally:
+            if pbar is not None:
+                pbar.close()
+
+        if checksums is not None:
+            self._verify_upload(local_file_path, key, checksums, manifest)
+
+        self._update_index([key])
+
+    def _get_upload_checksums(
+        self,
+        file_size: int,
+        config: TransferConfig,
+        compression: Compression | None,
+        include_sha256: bool,
+    ) -> Checksums:
+        """
+        Get the checksums to calculate while uploading a file, with the
+        multipart ETag of the part size that the upload will use. The MD5 of
+        the whole file is only calculated for single part uploads and for the
+        manifest.
+        """
+        if compression is not None:
+            part_sizes = [
+                max(self.transfer_config.multipart_chunksize, MIN_PART_SIZE),
+            ]
+        elif file_size >= config.multipart_threshold:
+            part_sizes = [config.multipart_chunksize]
+        else:
+            part_sizes = []
+        return Checksums(
+            part_sizes,
+            include_md5=include_sha256 or not part_sizes,
+            include_sha256=include_sha256,
+        )
+
+    def _verify_upload(
+        self,
+        local_file_path: str,
+        key: str,
+        checksums: Checksums,
+        manifest: bool,
+    ) -> None:
+        """
+        Compare the checksums of an uploaded file with the ETag of the new
+        object, which is deleted if they do not match, and write the manifest
+        if `manifest` is True.
+
+        :raises ChecksumMismatchError: If the checksums do not match the ETag
+        """
+        hcp_object = self.stat(key)
+        try:
+            self._raise_if_checksums_mismatch(hcp_object, checksums)
+        except ChecksumMismatchError:
+            self.delete_object(key)
+            raise
+        if manifest:
+            write_manifest(local_file_path, hcp_object, checksums)
+
+    def _upload_file_hashed(
+        self,
+        local_file_path: str,
+        key: str,
+        config: TransferConfig,
+        pbar: tqdm | None,
+        checksums: Checksums,
+    ) -> None:
+        """
+        Upload a file while hashing it, see :py:meth:`upload_file`.
+
+        The file is read through a
+        :py:class:`NGPIris.hcp.checksum.HashingFile`, which makes boto3 read it
+        once and in order, and hands every chunk to a
+        :py:class:`NGPIris.hcp.checksum.TransferHasher` on its way to the
+        network. The parts are still uploaded concurrently.
+
+        :param local_file_path: Path to the file to be uploaded
+        :type local_file_path: str
+
+        :param key: The name of the new object
+        :type key: str
+
+        :param config: The transfer config of the upload
+        :type config: TransferConfig
+
+        :param pbar: Progress bar to be updated with uploaded bytes, or None
+        :type pbar: tqdm | None
+
+        :param checksums: The checksums to calculate
+        :type checksums: Checksums
+        """
+        file_size = Path(local_file_path).stat().st_size
+        config = self._limit_config(config)
+        with (
+            Path(local_file_path).open("rb") as file,
+            TransferHasher(checksums) as hasher,
+            self._reserve_transfer(file_size, config),
+        ):
+            self.s3_client.upload_fileobj(
+                Fileobj=HashingFile(file, hasher),
+                Bucket=self.bucket_name,
+                Key=key,
+                Config=config,
+                Callback=self._get_transfer_callback(pbar),
+            )
+
+    def _upload_file_compressed(
+        self,
+        local_file_path: str,
+        key: str,
+        compression: Compression,
+        pbar: tqdm | None,
+        checksums: Checksums | None = None,
+    ) -> None:
+        """
+        Upload a file compressed with `compression`, without staging the
+        compressed file on disk.
+
+        The file is read and compressed on a worker thread, while the
+        compressed parts are uploaded by an
+        :py:class:`NGPIris.hcp.writer.ObjectWriter`, so that the compression
+        overlaps with the network. The object is tagged with the compression
+        and the uncompressed size in its metadata, which
+        :py:meth:`download_file` uses to decompress it.
+
+        :param local_file_path: Path to the file to be uploaded
+        :type local_file_path: str
+
+        :param key: The name of the new object
+        :type key: str
+
+        :param compression: The compression of the object
+        :type compression: Compression
+
+        :param pbar:
+            Progress bar to be updated with read, uncompressed bytes, or None
+        :type pbar: tqdm | None
+
+        :param checksums:
+            The checksums to calculate of the compressed bytes, or None.
+            Defaults to None
+        :type checksums: Checksums | None, optional
+
+        :raises ImportError:
+            If `compression` is HCPHandler.Compression.ZSTD and zstandard is
+            not installed
+        """
+        metadata = {
+            COMPRESSION_METADATA_KEY: compression.value,
+            UNCOMPRESSED_SIZE_METADATA_KEY: str(
+                Path(local_file_path).stat().st_size,
+            ),
+        }
+        with (
+            Path(local_file_path).open("rb") as file,
+            self._open_writer(
+                key,
+                0,
+                DEFAULT_MAX_BUFFERS,
+                None,
+                metadata,
+            ) as writer,
+            (
+                TransferHasher(checksums)
+                if checksums is not None
+                else nullcontext()
+            ) as hasher,
+            closing(
+                iterate_in_thread(
+                    compress_chunks(
+                        _update_progress(
+                            iter(partial(file.read, _MB), b""),
+                            pbar,
+                        ),
+                        compression.value,
+                    ),
+                ),
+            ) as compressed_chunks,
+        ):
+            for chunk in _update_progress(compressed_chunks, None, hasher):
+                writer.write(chunk)
+
+    def _upload_file_resumable(
+        self,
+        local_file_path: str,
+        key: str,
+        part_size: int,
+        pbar: tqdm | None,
+        max_workers: int,
+    ) -> None:
+        """
+        Upload a local file with a multipart upload whose upload ID and
+        completed parts are recorded in a checkpoint next to the file, see
+        :py:class:`UploadCheckpoint`.
+
+        When the upload is made again, the parts that the HCP already has are
+        found with ListParts and only the missing parts are uploaded. A
+        checkpoint of another version of the file, as told by its size and
+        modification time, or of an upload that has since been aborted, is
+        discarded and the upload starts over. The upload of a discarded
+        checkpoint is aborted. Every part is sent with its MD5,
+        so that the HCP rejects parts that were corrupted on the way.
+
+        :param local_file_path: Path to the file to be uploaded
+        :type local_file_path: str
+
+        :param key: The name of the object
+        :type key: str
+
+        :param part_size: The size of the parts in bytes for a new upload
+        :type part_size: int
+
+        :param pbar: Progress bar to be updated with uploaded bytes, or None
+        :type pbar: tqdm | None
+
+        :param max_workers:
+            The maximum number of parts that are uploaded at the same time
+        :type max_workers: int
+        """
+        bucket = str(self.bucket_name)
+        file_stat = Path(local_file_path).stat()
+        size = file_stat.st_size
+        checkpoint = UploadCheckpoint(
+            local_file_path + UPLOAD_SUFFIX + CHECKPOINT_SUFFIX,
+        )
+
+        parts = None
+        if checkpoint.matches(bucket, key, size, file_stat.st_mtime_ns):
+            parts = self._list_uploaded_parts(checkpoint, size)
+        elif checkpoint.header.get("UploadId"):
+            # The parts of the discarded upload would otherwise keep taking up
+            # space on the namespace
+            with suppress(ClientError, KeyError):
+                self.s3_client.abort_multipart_upload(
+                    Bucket=checkpoint.header["Bucket"],
+                    Key=checkpoint.header["Key"],
+                    UploadId=checkpoint.header["UploadId"],
+                )
+        if parts is None:
+            upload_id: str = self.s3_client.create_multipart_upload(
+                Bucket=bucket,
+                Key=key,
+            )["UploadId"]
+            checkpoint.reset(
+                bucket,
+                key,
+                size=size,
+                modified_ns=file_stat.st_mtime_ns,
+                part_size=max(part_size, -(-size // _MAX_PARTS)),  # Ceiling
+                upload_id=upload_id,
+            )
+            parts = {}
+        upload_id = checkpoint.header["UploadId"]
+        part_size = checkpoint.header["PartSize"]
+
+        callback = self._get_transfer_callback(pbar)
+
+        def _upload_part(part_number: int) -> int:
+            with self.transfer_limiter.reserve(part_size):
+                with Path(local_file_path).open("rb") as local_file:
+                    local_file.seek((part_number - 1) * part_size)
+                    body = local_file.read(part_size)
+                response: dict = self.s3_client.upload_part(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                    ContentMD5=b64encode(md5(body).digest()).decode(),  # noqa: S324
+                )
+            checkpoint.add(part_number, response["ETag"])
+            callback(len(body))
+            return len(body)
+
+        part_numbers = range(1, max(1, -(-size // part_size)) + 1)
+        if pbar is not None:
+            pbar.update(
+                sum(
+                    min(part_size, size - (part_number - 1) * part_size)
+                    for part_number in parts
+                ),
+            )
+        self._run_parts(
+            _upload_part,
+            [
+                (part_number,)
+                for part_number in part_numbers
+                if part_number not in parts
+            ],
+            max_workers,
+        )
+
+        # The parts that were uploaded now are recorded in the checkpoint
+        etags = parts | checkpoint.parts
+        self.s3_client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part_number, "ETag": etags[part_number]}
+                    for part_number in part_numbers
+                ],
+            },
+        )
+        checkpoint.remove()
+
+    def _list_uploaded_parts(
+        self,
+        checkpoint: UploadCheckpoint,
+        size: int,
+    ) -> dict[int, str] | None:
+        """
+        List the complete parts of the multipart upload in `checkpoint`. Parts
+        of the wrong size, or with another ETag than the checkpoint recorded,
+        are left out so that they are uploaded again.
+
+        :return:
+            The ETag of every complete part by part number, or None if the
+            upload does not exist anymore
+        :rtype: dict[int, str] | None
+        """
+        part_size: int = checkpoint.header["PartSize"]
+        paginator: Paginator = self.s3_client.get_paginator("list_parts")
+        parts: dict[int, str] = {}
+        try:
+            for page in paginator.paginate(
+                Bucket=checkpoint.header["Bucket"],
+                Key=checkpoint.header["Key"],
+                UploadId=checkpoint.header["UploadId"],
+            ):
+                for part in page.get("Parts", []):
+                    part_number: int = part["PartNumber"]
+                    expected_size = min(
+                        part_size,
+                        size - (part_number - 1) * part_size,
+                    )
+                    recorded_etag = checkpoint.parts.get(
+                        part_number,
+                        part["ETag"],
+                    )
+                    if (
+                        part["Size"] == expected_size
+                        and recorded_etag == part["ETag"]
+                    ):
+                        parts[part_number] = part["ETag"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "NoSuchUpload":
+                return None
+            raise
+        return parts
+
+    def _get_upload_config(
+        self,
+        upload_mode: UploadMode,
+        file_size: int,
+        equal_parts: int,
+    ) -> TransferConfig:
+        """
+        Get the transfer config for uploading a file of `file_size` bytes with
+        the given `upload_mode`.
+        """
+        match upload_mode:
+            case HCPHandler.UploadMode.STANDARD:
+                config = self.transfer_config
+            case HCPHandler.UploadMode.SIMPLE:
+                config = TransferConfig(multipart_chunksize=file_size)
+            case HCPHandler.UploadMode.EQUAL_PARTS:
+                config = TransferConfig(
+                    multipart_chunksize=round(file_size / equal_parts),
+                )
+        return config
+
+    class UploadStatus(Enum):
+        UPLOADED = "uploaded"
+        ALREADY_EXISTS = "already exists"
+        FAILED = "failed"
+
+    @check_mounted
+    def upload_folder(  # noqa: C901, PLR0913
+        self,
+        local_folder_path: str,
+        key: str = "",
+        show_progress_bar: bool = True,
+        upload_mode: UploadMode = UploadMode.STANDARD,
+        equal_parts: int = 5,
+        *,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+        resume: bool = False,
+        compression: Compression | None = None,
+    ) -> list[dict[str, Any]]:
+        r"""
+        Upload the contents of a folder, including all of its subfolders, to the
+        mounted bucket.
+
+        Every file is uploaded concurrently by a single pool of `max_workers`
+        threads. Objects that already exist are found with one listing of
+        `key` up front and are not overwritten. A file that can not be uploaded
+        does not stop the rest of the upload, but is instead reported in the
+        returned list.
+
+        :param local_folder_path: Path to the folder to be uploaded
+        :type local_folder_path: str
+
+        :param key:
+            An optional new name for the folder path on the bucket. Defaults to
+            the same name as the local folder path
+        :type key: str, optional
+
+        :param show_progress_bar:
+            Boolean choice of displaying a progress bar. Defaults to True
+        :type show_progress_bar: bool, optional
+
+        :param upload_mode:
+            The upload mode of the transfer is any of the following:
+                HCPHandler.UploadMode.STANDARD,
+                HCPHandler.UploadMode.SIMPLE,
+                HCPHandler.UploadMode.EQUAL_PARTS\n
+        :type upload_mode: UploadMode, optional
+
+        :param equal_parts:
+            The number of equal parts that each file should be divided into when
+            using the HCPHandler.UploadMode.EQUAL_PARTS mode. Default is 5
+        :type equal_parts: int, optional
+
+        :param max_workers:
+            The maximum number of files that are uploaded at the same time.
+            Defaults to 10
+        :type max_workers: int, optional
+
+        :param resume:
+            Boolean choice of uploading files above the multipart threshold in
+            a resumable way, see :py:meth:`upload_file`. Defaults to False
+        :type resume: bool, optional
+
+        :param compression:
+            The compression of every object, see :py:meth:`upload_file`, or
+            None for no compression. `upload_mode` and `resume` are then
+            ignored. Defaults to None
+        :type compression: Compression | None, optional
+
+        :raises FileNotFoundError: If `path` does not exist
+
+        :return:
+            One dictionary per file with the keys `"Path"`, `"Key"`, `"Status"`
+            and `"Error"`, where `"Status"` is any of the following:\n
+                HCPHandler.UploadStatus.UPLOADED,\n
+                HCPHandler.UploadStatus.ALREADY_EXISTS,\n
+                HCPHandler.UploadStatus.FAILED\n
+        :rtype: list[dict[str, Any]]
+        """
+        raise_path_error(local_folder_path)
+
+        if not key:
+            key = local_folder_path
+
+        paginator: Paginator = self.s3_client.get_paginator("list_objects_v2")
+        existing_keys = {
+            file_object["Key"]
+            for page in paginator.paginate(Bucket=self.bucket_name, Prefix=key)
+            for file_object in page.get("Contents", [])
+        }
+
+        def _upload(
+            local_file_path: str,
+            file_key: str,
+            file_size: int,
+        ) -> dict[str, Any]:
+            result = {
+                "Path": local_file_path,
+                "Key": file_key,
+                "Status": HCPHandler.UploadStatus.UPLOADED,
+                "Error": "",
+            }
+            if file_key in existing_keys:
+                return result | {
+                    "Status": HCPHandler.UploadStatus.ALREADY_EXISTS,
+                }
+            config = (
+                self._get_worker_config(file_size)
+                if upload_mode == HCPHandler.UploadMode.STANDARD
+                else self._get_upload_config(
+                    upload_mode,
+                    file_size,
+                    equal_parts,
+                )
+            )
+            try:
+                if "\\" in local_file_path:
+                    msg = 'The "\\" character is not allowed in the file path'
+                    raise UnallowedCharacterError(msg)  # noqa: TRY301
+                if compression is not None:
+                    self._upload_file_compressed(
+                        local_file_path,
+                        file_key,
+                        compression,
+                        pbar,
+                    )
+                elif (
+                    resume
+                    and upload_mode != HCPHandler.UploadMode.SIMPLE
+                    and file_size >= config.multipart_threshold
+                ):
+                    # The files are already uploaded concurrently, which means
+                    # that the parts of each file are uploaded one at a time
+                    self._upload_file_resumable(
+                        local_file_path,
+                        file_key,
+                        config.multipart_chunksize,
+                        pbar,
+                        max_workers=1,
+                    )
+                else:
+                    config = self._limit_config(config)
+                    with self._reserve_transfer(file_size, config):
+                        self.s3_client.upload_file(
+                            Filename=local_file_path,
+                            Bucket=self.bucket_name,
+                            Key=file_key,
+                            Config=config,
+                            Callback=self._get_transfer_callback(pbar),
+                        )
+            except Exception as e:  # noqa: BLE001
+                return result | {
+                    "Status": HCPHandler.UploadStatus.FAILED,
+                    "Error": str(e),
+                }
+            return result
+
+        pbar = (
+            tqdm(total=0, unit="B", unit_scale=True, desc=local_folder_path)
+            if show_progress_bar
+            else None
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures: list[Future[dict[str, Any]]] = []
+                for local_file_path, relative_path, file_size in walk_files(
+                    local_folder_path,
+                ):
+                    file_key = key + relative_path
+                    if pbar is not None and file_key not in existing_keys:
+                        pbar.total += file_size
+                        pbar.refresh()
+                    futures.append(
+                        executor.submit(
+                            _upload,
+                            local_file_path,
+                            file_key,
+                            file_size,
+                        ),
+                    )
+                results = [future.result() for future in futures]
+        finally:
+            if pbar is not None:
+                pbar.close()
+
+        self._update_index(
+            [
+                result["Key"]
+                for result in results
+                if result["Status"] == HCPHandler.UploadStatus.UPLOADED
+            ],
+        )
+        return results
+
+    @check_mounted
+    def list_multipart_uploads(
+        self,
+        path_key: str = "",
+    ) -> Generator[dict[str, Any], Any, None]:
+        r"""
+        List the multipart uploads in the mounted bucket that have been started
+        but neither completed nor aborted. Their parts take up space on the
+        namespace until then.
+
+        :param path_key:
+            Filter string for which keys to list. Defaults to \"the root\" of
+            the bucket
+        :type path_key: str, optional
+
+        :yield:
+            One dictionary per upload with the keys `"Key"`, `"UploadId"` and
+            `"Initiated"`
+        :rtype: Generator
+        """
+        paginator: Paginator = self.s3_client.get_paginator(
+            "list_multipart_uploads",
+        )
+        for page in paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=path_key,
+        ):
+            for upload in page.get("Uploads", []):
+                yield {
+                    "Key": upload["Key"],
+                    "UploadId": upload["UploadId"],
+                    "Initiated": upload["Initiated"],
+                }
+
+    @check_mounted
+    def abort_multipart_uploads(
+        self,
+        path_key: str = "",
+        initiated_before: datetime | None = None,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+    ) -> list[dict[str, Any]]:
+        r"""
+        Abort the unfinished multipart uploads in the mounted bucket, which
+        frees the space that their parts take up. Note that an upload that is
+        still running fails when it is aborted.
+
+        :param path_key:
+            Filter string for which keys to abort uploads to. Defaults to
+            \"the root\" of the bucket
+        :type path_key: str, optional
+
+        :param initiated_before:
+            Only abort the uploads that were started before this time. Defaults
+            to None, which means that every upload is aborted
+        :type initiated_before: datetime | None, optional
+
+        :param max_workers:
+            The maximum number of requests that are running at the same time.
+            Defaults to 10
+        :type max_workers: int, optional
+
+        :return:
+            The aborted uploads, see :py:meth:`list_multipart_uploads`, with
+            the additional key `"Error"`, which is the empty string unless the
+            upload could not be aborted
+        :rtype: list[dict[str, Any]]
+        """
+        uploads = [
+            upload
+            for upload in self.list_multipart_uploads(path_key)
+            if initiated_before is None
+            or upload["Initiated"] < initiated_before
+        ]
+
+        def _abort(upload: dict[str, Any]) -> dict[str, Any]:
+            try:
+                self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=upload["Key"],
+                    UploadId=upload["UploadId"],
+                )
+            except ClientError as e:
+                return upload | {"Error": str(e)}
+            return upload | {"Error": ""}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(_abort, uploads))
+
+    @check_mounted
+    def delete_objects(
+        self,
+        keys: list[str],
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+    ) -> dict[str, Any]:
+        """
+        Delete a list of objects on the mounted bucket. The keys are deleted
+        in batches of 1000, which is the most that one request can hold, and
+        the batches are sent concurrently. Note that keys that do not exist
+        are reported as deleted.
+
+        :param keys: List of object names to be deleted
+        :type keys: list[str]
+
+        :param max_workers:
+            The maximum number of requests that are running at the same time.
+            Defaults to 10
+        :type max_workers: int, optional
+
+        :raises IsFolderObjectError: If the provided object is a folder object
+
+        :return:
+            A dictionary with the keys `"Deleted"`, the list of deleted keys,
+            `"Errors"`, one dictionary with the keys `"Key"`, `"Code"` and
+            `"Message"` per key that could not be deleted, as well as
+            `"DeletedCount"` and `"ErrorCount"`
+        :rtype: dict[str, Any]
+        """
+        for key in keys:
+            if key.endswith("/"):
+                raise IsFolderObjectError(
+                    'The object "'
+                    + key
+                    + '" is a folder object. Please use the `delete_folder`'
+                    + "method for this object",
+                )
+        return self._delete_keys(keys, max_workers)
+
+    def _delete_keys(
+        self,
+        keys: Iterable[str],
+        max_workers: int,
+    ) -> dict[str, Any]:
+        """
+        Delete `keys` from the mounted bucket in concurrent batches, without
+        checking them first. The batches are sent while `keys` is still being
+        consumed, so that a listing and the deletion can overlap.
+
+        :return: See :py:meth:`delete_objects`
+        :rtype: dict[str, Any]
+        """
+
+        def _delete_batch(
+            batch: list[str],
+        ) -> tuple[list[str], list[dict[str, str]]]:
+            try:
+                response: dict = self.s3_client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={
+                        "Objects": [{"Key": key} for key in batch],
+                        "Quiet": False,
+                    },
+                )
+            except ClientError as e:
+                # The whole batch failed, for example because of permissions
+                error = e.response.get("Error", {})
+                return [], [
+                    {
+                        "Key": key,
+                        "Code": error.get("Code", ""),
+                        "Message": error.get("Message", str(e)),
+                    }
+                    for key in batch
+                ]
+            return [
+                deleted_object["Key"]
+                for deleted_object in response.get("Deleted", [])
+            ], [
+                {
+                    "Key": error["Key"],
+                    "Code": error.get("Code", ""),
+                    "Message": error.get("Message", ""),
+                }
+                for error in response.get("Errors", [])
+            ]
+
+        deleted: list[str] = []
+        errors: list[dict[str, str]] = []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(_delete_batch, batch)
+                for batch in chunked(keys, _DELETE_BATCH_SIZE)
+            ]
+            for future in futures:
+                batch_deleted, batch_errors = future.result()
+                deleted.extend(batch_deleted)
+                errors.extend(batch_errors)
+
+        self._remove_from_index(deleted)
+        return {
+            "Deleted": deleted,
+            "Errors": errors,
+            "DeletedCount": len(deleted),
+            "ErrorCount": len(errors),
+        }
+
+    @check_mounted
+    def delete_object(self, key: str) -> dict[str, Any]:
+        """
+        Delete a single object in the mounted bucket.
+
+        :param key: The object to be deleted
+        :type key: str
+
+        :raises IsFolderObject: If the provided object is a folder object
+
+        :return: The result of the deletion, see :py:meth:`delete_objects`
+        :rtype: dict[str, Any]
+        """
+        return self.delete_objects([key])
+
+    @check_mounted
+    def delete_folder(
+        self,
+        key: str,
+        recursive: bool = False,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+    ) -> dict[str, Any]:
+        """
+        Delete a folder of objects in the mounted bucket.
+        If there are subfolders and `recursive` is False, a `SubfolderError`
+        is raised
+
+        :param key: The folder of objects to be deleted
+        :type key: str
+
+        :param recursive:
+            Boolean choice of also deleting every subfolder and the objects in
+            them. The folder is then listed and deleted at the same time.
+            Defaults to False
+        :type recursive: bool, optional
+
+        :param max_workers:
+            The maximum number of requests that are running at the same time.
+            Defaults to 10
+        :type max_workers: int, optional
+
+        :raises ObjectDoesNotExistError: If an object does not exist
+
+        :raises SubfolderError: If there are subfolders
+
+        :return:
+            The result of the deletion, including the folder object itself,
+            see :py:meth:`delete_objects`
+        :rtype: dict[str, Any]
+        """  # noqa: D400, D415
+        if key[-1] != "/":
+            key += "/"
+
+        if recursive:
+            hcp_objects = peekable(
+                self.list_objects_parallel(
+                    key,
+                    output_mode=HCPHandler.ListObjectsOutputMode.MINIMAL,
+                    parallel=max_workers,
+                ),
+            )
+            if not hcp_objects and not self.object_exists(key):
+                raise ObjectDoesNotExistError(
+                    '"' + key + '"' + " does not exist",
+                )
+            return self._delete_keys(
+                chain((hcp_object["Key"] for hcp_object in hcp_objects), [key]),
+                max_workers,
+            )
+
+        objects: list[dict[str, Any]] = list(
+            self.list_objects(
+                key,
+                output_mode=HCPHandler.ListObjectsOutputMode.MINIMAL,
+            ),
+        )
+
+        if not self.object_exists(key):
+            raise ObjectDoesNotExistError(
+                '"' + key + '"' + " does not exist",
+            )
+
+        for hcp_object in objects:
+            if not hcp_object["IsFile"]:
+                raise SubfolderError(
+                    'There is at least one subfolder in "'
+                    + key
+                    + '". Please remove all subfolders before deleting "'
+                    + key
+                    + '" itself, or use `recursive=True`',
+                )
+
+        # The folder object itself is deleted along with the file objects
+        return self._delete_keys(
+            [hcp_object["Key"] for hcp_object in objects] + [key],
+            max_workers,
+        )
+
+    @check_mounted
+    def copy_file(
+        self,
+        source_key: str,
+        destination_key: str,
+        destination_bucket: str = "",
+    ) -> None:
+        """
+        Copy a file object within the HCP.
+
+        :param source_key: The key to the object to be copied
+        :type source_key: str
+
+        :param destination_key: The key to where the object will be copied to
+        :type destination_key: str
+
+        :param destination_bucket:
+            The destination bucket, defaults to the mounted bucket
+        :type destination_bucket: str
+        """
+        file_size: int = self.stat(source_key)["Size"]
+        with (
+            tqdm(
+                total=file_size,
+                unit="B",
+                unit_scale=True,
+                desc=source_key,
+            ) as pbar,
+            self._reserve_transfer(file_size, TransferConfig()),
+        ):
+            # The copy is made by the HCP itself, which means that it counts
+            # towards the in-flight byte budget but not the bandwidth limit
+            self.s3_client.copy(
+                {"Bucket": self.bucket_name, "Key": source_key},
+                destination_bucket if destination_bucket else self.bucket_name,
+                destination_key,
+                Callback=lambda bytes_transferred: pbar.update(
+                    bytes_transferred,
+                ),
+            )
+
+        self._update_index([destination_key], destination_bucket)
+
+    @check_mounted
+    def move_file(
+        self,
+        source_key: str,
+        destination_key: str,
+        destination_bucket: str = "",
+    ) -> None:
+        """
+        Move a file `source_key` to `destination_key`.
+
+        :param source_key: The key to the object to be moved
+        :type source_key: str
+
+        :param destination_key: The key to where the object will be moved to
+        :type destination_key: str
+
+        :param destination_bucket:
+            The destination bucket, defaults to the mounted bucket
+        :type destination_bucket: str
+        """
+        self.copy_file(source_key, destination_key, destination_bucket)
+        self.delete_object(source_key)
+
+    class CopyStatus(Enum):
+        COPIED = "copied"
+        MOVED = "moved"
+        FAILED = "failed"
+
+    def _copy_object(
+        self,
+        hcp_object: dict[str, Any],
+        destination_key: str,
+        destination_bucket: str,
+        part_executor: ThreadPoolExecutor,
+        pbar: tqdm | None,
+    ) -> dict[str, Any] | None:
+        """
+        Copy one object from the mounted bucket without downloading it.
+        Objects above the multipart threshold of the transfer config are copied
+        with a multipart upload, where the parts are copied concurrently by
+        `part_executor`.
+
+        :return: The index entry of the copy, see :py:meth:`_head_or_none`
+        :rtype: dict[str, Any] | None
+        """
+        copy_source = {"Bucket": self.bucket_name, "Key": hcp_object["Key"]}
+        size: int = hcp_object["Size"]
+
+        # The copies are made by the HCP itself, which means that they count
+        # towards the in-flight byte budget but not the bandwidth limit
+        if size < self.transfer_config.multipart_threshold:
+            with self.transfer_limiter.reserve(size):
+                response: dict = self.s3_client.copy_object(
+                    CopySource=copy_source,
+                    Bucket=destination_bucket,
+                    Key=destination_key,
+                )
+            if pbar is not None:
+                pbar.update(size)
+            return {
+                "Key": destination_key,
+                "Size": size,
+                "ETag": response["CopyObjectResult"]["ETag"],
+                "LastModified": response["CopyObjectResult"]["LastModified"],
+            }
+
+        # Unlike CopyObject, a multipart upload does not carry over the
+        # metadata of the source object
+        head: dict = self.s3_client.head_object(**copy_source)
+        upload_id: str = self.s3_client.create_multipart_upload(
+            Bucket=destination_bucket,
+            Key=destination_key,
+            ContentType=head.get("ContentType", "binary/octet-stream"),
+            Metadata=head.get("Metadata", {}),
+        )["UploadId"]
+        part_size = max(
+            self.transfer_config.multipart_chunksize,
+            -(-size // _MAX_PARTS),  # Ceiling
+        )
+
+        def _copy_part(part_number: int, first_byte: int) -> dict[str, Any]:
+            last_byte = min(first_byte + part_size, size) - 1
+            with self.transfer_limiter.reserve(last_byte - first_byte + 1):
+                response: dict = self.s3_client.upload_part_copy(
+                    Bucket=destination_bucket,
+                    Key=destination_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    CopySource=copy_source,
+                    CopySourceRange="bytes="
+                    + str(first_byte)
+                    + "-"
+                    + str(last_byte),
+                )
+            if pbar is not None:
+                pbar.update(last_byte - first_byte + 1)
+            return {
+                "PartNumber": part_number,
+                "ETag": response["CopyPartResult"]["ETag"],
+            }
+
+        futures = [
+            part_executor.submit(_copy_part, part_number, first_byte)
+            for part_number, first_byte in enumerate(
+                range(0, size, part_size),
+                start=1,
+            )
+        ]
+        try:
+            parts = [future.result() for future in futures]
+            self.s3_client.complete_multipart_upload(
+                Bucket=destination_bucket,
+                Key=destination_key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            self.s3_client.abort_multipart_upload(
+                Bucket=destination_bucket,
+                Key=destination_key,
+                UploadId=upload_id,
+            )
+            raise
+        return self._head_or_none(destination_key, destination_bucket)
+
+    @check_mounted
+    def copy_folder(
+        self,
+        source_key: str,
+        destination_key: str,
+        destination_bucket: str = "",
+        show_progress_bar: bool = True,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+    ) -> list[dict[str, Any]]:
+        r"""
+        Copy a folder, including all of its subfolders, within the HCP.
+
+        The source folder is listed once, after which every object is copied
+        concurrently on the HCP itself, without being downloaded. Objects above
+        the multipart threshold of the transfer config are copied in parts,
+        which are also copied concurrently. Existing objects at the destination
+        are overwritten. An object that can not be copied does not stop the
+        rest of the copy, but is instead reported in the returned list.
+
+        :param source_key: The folder to be copied
+        :type source_key: str
+
+        :param destination_key: The folder to where the objects will be copied
+        :type destination_key: str
+
+        :param destination_bucket:
+            The destination bucket, defaults to the mounted bucket
+        :type destination_bucket: str, optional
+
+        :param show_progress_bar:
+            Boolean choice of displaying a progress bar. Defaults to True
+        :type show_progress_bar: bool, optional
+
+        :param max_workers:
+            The maximum number of objects, as well as the maximum number of
+            parts, that are copied at the same time. Defaults to 10
+        :type max_workers: int, optional
+
+        :raises ObjectDoesNotExistError: If the folder does not exist
+
+        :raises SourceIsDestinationError:
+            If the destination is the same folder as the source
+
+        :return:
+            One dictionary per object with the keys `"SourceKey"`, `"Key"`,
+            `"Status"` and `"Error"`, where `"Status"` is any of the
+            following:\n
+                HCPHandler.CopyStatus.COPIED,\n
+                HCPHandler.CopyStatus.FAILED\n
+        :rtype: list[dict[str, Any]]
+        """
+        source_key = source_key.removesuffix("/") + "/"
+        destination_key = destination_key.removesuffix("/") + "/"
+        destination_bucket = destination_bucket or str(self.bucket_name)
+
+        if (
+            destination_bucket == self.bucket_name
+            and destination_key == source_key
+        ):
+            raise SourceIsDestinationError(
+                'Can not copy "' + source_key + '" onto itself',
+            )
+
+        # The listing is completed before copying, so that a destination
+        # inside of the source folder is not copied again
+        hcp_objects = list(
+            self.list_objects_parallel(
+                source_key,
+                output_mode=HCPHandler.ListObjectsOutputMode.SIMPLE,
+                parallel=max_workers,
+            ),
+        )
+        folder_object = self._head_or_none(source_key, str(self.bucket_name))
+        if folder_object is not None:
+            hcp_objects.append(folder_object)
+        elif not hcp_objects:
+            raise ObjectDoesNotExistError(
+                '"' + source_key + '"' + " does not exist",
+            )
+
+        def _copy(
+            hcp_object: dict[str, Any],
+        ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+            result = {
+                "SourceKey": hcp_object["Key"],
+                "Key": destination_key + hcp_object["Key"][len(source_key) :],
+                "Status": HCPHandler.CopyStatus.COPIED,
+                "Error": "",
+            }
+            try:
+                index_entry = self._copy_object(
+                    hcp_object,
+                    result["Key"],
+                    destination_bucket,
+                    part_executor,
+                    pbar,
+                )
+            except Exception as e:  # noqa: BLE001
+                return result | {
+                    "Status": HCPHandler.CopyStatus.FAILED,
+                    "Error": str(e),
+                }, None
+            return result, index_entry
+
+        pbar = (
+            tqdm(
+                total=sum(hcp_object["Size"] for hcp_object in hcp_objects),
+                unit="B",
+                unit_scale=True,
+                desc=source_key,
+            )
+            if show_progress_bar
+            else None
+        )
+        # The parts get a pool of their own, since the threads that copy the
+        # objects wait for them
+        try:
+            with (
+                ThreadPoolExecutor(max_workers=max_workers) as part_executor,
+                ThreadPoolExecutor(max_workers=max_workers) as executor,
+            ):
+                copies = list(executor.map(_copy, hcp_objects))
+        finally:
+            if pbar is not None:
+                pbar.close()
+
+        if self.bucket_index is not None and self.bucket_index.is_indexed(
+            destination_bucket
+        ):
+            self.bucket_index.upsert(
+                destination_bucket,
+                [index_entry for _, index_entry in copies if index_entry],
+            )
+        return [result for result, _ in copies]
+
+    @check_mounted
+    def move_folder(
+        self,
+        source_key: str,
+        destination_key: str,
+        destination_bucket: str = "",
+        show_progress_bar: bool = True,
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+    ) -> list[dict[str, Any]]:
+        r"""
+        Move a folder, including all of its subfolders, within the HCP.
+
+        The folder is first copied with :py:meth:`copy_folder`. Once every
+        copy has been confirmed, the source objects are deleted in batches.
+        The source objects that could not be copied are not deleted, and
+        neither is the source folder object itself in that case.
+
+        :param source_key: The folder to be moved
+        :type source_key: str
+
+        :param destination_key: The folder to where the objects will be moved
+        :type destination_key: str
+
+        :param destination_bucket:
+            The destination bucket, defaults to the mounted bucket
+        :type destination_bucket: str, optional
+
+        :param show_progress_bar:
+            Boolean choice of displaying a progress bar. Defaults to True
+        :type show_progress_bar: bool, optional
+
+        :param max_workers:
+            The maximum number of requests that are running at the same time.
+            Defaults to 10
+        :type max_workers: int, optional
+
+        :raises ObjectDoesNotExistError: If the folder does not exist
+
+        :raises SourceIsDestinationError:
+            If the destination is the same folder as the source
+
+        :return:
+            One dictionary per object with the keys `"SourceKey"`, `"Key"`,
+            `"Status"` and `"Error"`, where `"Status"` is any of the
+            following:\n
+                HCPHandler.CopyStatus.MOVED,\n
+                HCPHandler.CopyStatus.COPIED,\n
+                HCPHandler.CopyStatus.FAILED\n
+            Objects that were copied but could not be deleted from the source
+            are reported as COPIED, along with the reason in `"Error"`
+        :rtype: list[dict[str, Any]]
+        """
+        results = self.copy_folder(
+            source_key,
+            destination_key,
+            destination_bucket,
+            show_progress_bar,
+            max_workers,
+        )
+        keys = [
+            result["SourceKey"]
+            for result in results
+            if result["Status"] == HCPHandler.CopyStatus.COPIED
+        ]
+        if len(keys) < len(results):
+            # Keep the folder object, as there are objects left in it
+            folder_key = source_key.removesuffix("/") + "/"
+            keys = [key for key in keys if key != folder_key]
+
+        deletion = self._delete_keys(keys, max_workers)
+        deleted = set(deletion["Deleted"])
+        errors = {
+            error["Key"]: error["Message"] for error in deletion["Errors"]
+        }
+        for result in results:
+            if result["SourceKey"] in deleted:
+                result["Status"] = HCPHandler.CopyStatus.MOVED
+            elif result["SourceKey"] in errors:
+                result["Error"] = errors[result["SourceKey"]]
+        return results
+
+    # ---------------------------- Sync methods ----------------------------
+
+    class SyncDirection(Enum):
+        UPLOAD = "upload"
+        DOWNLOAD = "download"
+
+    class SyncAction(Enum):
+        UPLOAD = "upload"
+        DOWNLOAD = "download"
+        DELETE = "delete"
+
+    def _is_unchanged(
+        self,
+        local_file_path: str,
+        hcp_object: dict[str, Any],
+        direction: SyncDirection,
+        checksum: bool,
+    ) -> bool:
+        """
+        Compare a local file with an object by size, modification time and
+        ETag. The ETag is only calculated when the size and the modification
+        time are not enough to tell that the file is unchanged.
+        """
+        local_stat = Path(local_file_path).stat()
+        if local_stat.st_size != hcp_object["Size"]:
+            return False
+        hcp_mtime = hcp_object["LastModified"].timestamp()
+        if not checksum:
+            match direction:
+                # The object was uploaded after the file was last modified
+                case HCPHandler.SyncDirection.UPLOAD if (
+                    local_stat.st_mtime <= hcp_mtime
+                ):
+                    return True
+                # Downloaded files get the modification time of the object
+                case HCPHandler.SyncDirection.DOWNLOAD if int(
+                    local_stat.st_mtime,
+                ) == int(hcp_mtime):
+                    return True
+        # A file that does not match any of the part size candidates is
+        # considered changed
+        return bool(
+            verify_file(
+                local_file_path,
+                hcp_object["ETag"],
+                [
+                    self.transfer_config.multipart_chunksize,
+                    TransferConfig().multipart_chunksize,
+                ],
+            ),
+        )
+
+    def _get_sync_plan(  # noqa: PLR0913
+        self,
+        local_folder_path: str,
+        key: str,
+        direction: SyncDirection,
+        *,
+        delete: bool,
+        checksum: bool,
+        max_workers: int,
+    ) -> list[dict[str, Any]]:
+        """
+        Diff the local folder against the objects under `key`, see
+        :py:meth:`sync`. The files that exist on both sides are compared
+        concurrently, since that might mean calculating their ETags.
+        """
+        local_files = (
+            {
+                relative_path: (local_file_path, file_size)
+                for local_file_path, relative_path, file_size in walk_files(
+                    local_folder_path,
+                )
+            }
+            if Path(local_folder_path).is_dir()
+            else {}
+        )
+        hcp_objects = {
+            hcp_object["Key"][len(key) :]: hcp_object
+            for hcp_object in self.list_objects_parallel(
+                key,
+                output_mode=HCPHandler.ListObjectsOutputMode.EXTENDED,
+                files_only=True,
+                parallel=max_workers,
+            )
+        }
+
+        if direction == HCPHandler.SyncDirection.UPLOAD:
+            transfer = HCPHandler.SyncAction.UPLOAD
+            sources, destinations = local_files, hcp_objects
+        else:
+            transfer = HCPHandler.SyncAction.DOWNLOAD
+            sources, destinations = hcp_objects, local_files
 
-        file_size: int = Path(local_file_path).stat().st_size
+        def _plan_entry(
+            relative_path: str,
+            action: HCPHandler.SyncAction,
+            reason: str,
+        ) -> dict[str, Any]:
+            hcp_object = hcp_objects.get(relative_path, {})
+            match action:
+                case HCPHandler.SyncAction.UPLOAD:
+                    size = local_files[relative_path][1]
+                case HCPHandler.SyncAction.DOWNLOAD:
+                    size = hcp_object["Size"]
+                case HCPHandler.SyncAction.DELETE:
+                    size = 0
+            return {
+                "Path": str(Path(local_folder_path) / relative_path),
+                "Key": key + relative_path,
+                "Action": action,
+                "Reason": reason,
+                "Size": size,
+                "LastModified": hcp_object.get("LastModified"),
+            }
 
-        match upload_mode:
-            case HCPHandler.UploadMode.STANDARD:
-                config = self.transfer_config
-            case HCPHandler.UploadMode.SIMPLE:
-                config = TransferConfig(multipart_chunksize=file_size)
-            case HCPHandler.UploadMode.EQUAL_PARTS:
-                config = TransferConfig(
-                    multipart_chunksize=round(file_size / equal_parts),
+        plan = [
+            _plan_entry(relative_path, transfer, "new")
+            for relative_path in sources.keys() - destinations.keys()
+        ]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            comparisons = {
+                relative_path: executor.submit(
+                    self._is_unchanged,
+                    local_files[relative_path][0],
+                    hcp_objects[relative_path],
+                    direction,
+                    checksum,
+                )
+                for relative_path in sources.keys() & destinations.keys()
+            }
+            plan.extend(
+                _plan_entry(relative_path, transfer, "changed")
+                for relative_path, comparison in comparisons.items()
+                if not comparison.result()
+            )
+        if delete:
+            plan.extend(
+                _plan_entry(
+                    relative_path,
+                    HCPHandler.SyncAction.DELETE,
+                    "extraneous",
                 )
+                for relative_path in destinations.keys() - sources.keys()
+            )
 
-        if show_progress_bar:
-            with tqdm(
-                total=file_size,
-                unit="B",
-                unit_scale=True,
-                desc=local_file_path,
-            ) as pbar:
+        plan.sort(key=lambda entry: entry["Key"])
+        return plan
+
+    def _apply_sync_entry(
+        self,
+        entry: dict[str, Any],
+        config: TransferConfig,
+        pbar: tqdm | None,
+    ) -> None:
+        """
+        Carry out one entry of a sync plan, apart from deleting objects, which
+        is done in batches.
+        """
+        callback = self._get_transfer_callback(pbar)
+        match entry["Action"]:
+            case HCPHandler.SyncAction.UPLOAD:
                 self.s3_client.upload_file(
-                    Filename=local_file_path,
+                    Filename=entry["Path"],
                     Bucket=self.bucket_name,
-                    Key=key,
+                    Key=entry["Key"],
                     Config=config,
-                    Callback=lambda bytes_transferred: pbar.update(
-                        bytes_transferred,
-                    ),
+                    Callback=callback,
                 )
-        else:
-            self.s3_client.upload_file(
-                Filename=local_file_path,
-                Bucket=self.bucket_name,
-                Key=key,
-                Config=config,
-            )
+            case HCPHandler.SyncAction.DOWNLOAD:
+                local_file_path = Path(entry["Path"])
+                local_file_path.parent.mkdir(parents=True, exist_ok=True)
+                self.s3_client.download_file(
+                    Bucket=self.bucket_name,
+                    Key=entry["Key"],
+                    Filename=local_file_path.as_posix(),
+                    Config=config,
+                    Callback=callback,
+                )
+                hcp_mtime = entry["LastModified"].timestamp()
+                os.utime(local_file_path, (hcp_mtime, hcp_mtime))
+            case HCPHandler.SyncAction.DELETE:
+                Path(entry["Path"]).unlink()
 
     @check_mounted
-    def upload_folder(
+    def sync(  # noqa: PLR0913
         self,
         local_folder_path: str,
         key: str = "",
+        *,
+        direction: SyncDirection = SyncDirection.UPLOAD,
+        delete: bool = False,
+        checksum: bool = False,
+        dry_run: bool = False,
         show_progress_bar: bool = True,
-        upload_mode: UploadMode = UploadMode.STANDARD,
-        equal_parts: int = 5,
-    ) -> None:
+        max_workers: int = _DEFAULT_MAX_WORKERS,
+    ) -> list[dict[str, Any]]:
         r"""
-        Upload the contents of a folder to the mounted bucket.
-
-        :param local_folder_path: Path to the folder to be uploaded
+        Synchronise a local folder with a folder in the mounted bucket, so that
+        only new or changed files are transferred.
+
+        A file and an object are the same if they have the same size and
+        either the modification time of the file shows that it has not changed
+        since the last transfer, or the ETag of the object matches the
+        contents of the file. Multipart ETags are calculated locally with the
+        part sizes of the transfer config, or with the part sizes that equal
+        parts would have. The transfers and the comparisons run concurrently.
+        Files that are downloaded get the modification time of their object.
+
+        :param local_folder_path: Path to a folder on your local system
         :type local_folder_path: str
 
         :param key:
-            An optional new name for the folder path on the bucket. Defaults to
-            the same name as the local folder path
+            The folder in the mounted bucket. Defaults to "the root" of the
+            bucket
         :type key: str, optional
 
+        :param direction:
+            The direction of the synchronisation is any of the following:\n
+                HCPHandler.SyncDirection.UPLOAD,\n
+                HCPHandler.SyncDirection.DOWNLOAD\n
+            Default is UPLOAD
+        :type direction: SyncDirection, optional
+
+        :param delete:
+            Boolean choice of deleting the files or objects at the destination
+            that do not exist at the source. Defaults to False
+        :type delete: bool, optional
+
+        :param checksum:
+            Boolean choice of always comparing the ETags of files and objects
+            of the same size, regardless of modification times. Defaults to
+            False
+        :type checksum: bool, optional
+
+        :param dry_run:
+            Boolean choice of only returning the plan, without transferring or
+            deleting anything. Defaults to False
+        :type dry_run: bool, optional
+
         :param show_progress_bar:
             Boolean choice of displaying a progress bar. Defaults to True
         :type show_progress_bar: bool, optional
 
-        :param upload_mode:
-            The upload mode of the transfer is any of the following:
-                HCPHandler.UploadMode.STANDARD,
-                HCPHandler.UploadMode.SIMPLE,
-                HCPHandler.UploadMode.EQUAL_PARTS\n
-        :type upload_mode: UploadMode, optional
+        :param max_workers:
+            The maximum number of files that are compared or transferred at the
+            same time. Defaults to 10
+        :type max_workers: int, optional
+
+        :raises FileNotFoundError:
+            If `local_folder_path` does not exist when uploading
+
+        :return:
+            One dictionary per planned action with the keys `"Path"`, `"Key"`,
+            `"Action"`, `"Reason"`, `"Size"`, `"LastModified"` and `"Error"`,
+            sorted by key. `"Size"` is the number of bytes to transfer, and
+            `"LastModified"` is the modification time of the object, if there
+            is one.
+            `"Action"` is any of the following:\n
+                HCPHandler.SyncAction.UPLOAD,\n
+                HCPHandler.SyncAction.DOWNLOAD,\n
+                HCPHandler.SyncAction.DELETE\n
+            `"Reason"` is "new", "changed" or "extraneous", and `"Error"` is
+            the empty string unless the action failed
+        :rtype: list[dict[str, Any]]
+        """
+        if direction == HCPHandler.SyncDirection.UPLOAD:
+            raise_path_error(local_folder_path)
+        if key and not key.endswith("/"):
+            key += "/"
 
-        :param equal_parts:
-            The number of equal parts that each file should be divided into when
-            using the HCPHandler.UploadMode.EQUAL_PARTS mode. Default is 5
-        :type equal_parts: int, optional
+        plan = [
+            entry | {"Error": ""}
+            for entry in self._get_sync_plan(
+                local_folder_path,
+                key,
+                direction,
+                delete=delete,
+                checksum=checksum,
+                max_workers=max_workers,
+            )
+        ]
+        if dry_run:
+            return plan
+
+        def _transfer(entry: dict[str, Any]) -> None:
+            config = self._get_worker_config(entry["Size"])
+            try:
+                with self._reserve_transfer(entry["Size"], config):
+                    self._apply_sync_entry(entry, config, pbar)
+            except Exception as e:  # noqa: BLE001
+                entry["Error"] = str(e)
+
+        transfers = [
+            entry
+            for entry in plan
+            if entry["Action"] != HCPHandler.SyncAction.DELETE
+            or direction == HCPHandler.SyncDirection.DOWNLOAD
+        ]
+        pbar = (
+            tqdm(
+                total=sum(entry["Size"] for entry in transfers),
+                unit="B",
+                unit_scale=True,
+                desc=local_folder_path,
+            )
+            if show_progress_bar
+            else None
+        )
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(_transfer, transfers))
+        finally:
+            if pbar is not None:
+                pbar.close()
+
+        if direction == HCPHandler.SyncDirection.UPLOAD:
+            self._update_index(
+                [entry["Key"] for entry in transfers if not entry["Error"]],
+            )
+            self._delete_sync_entries(plan, max_workers)
+        return plan
 
-        :raises FileNotFoundError: If `path` does not exist
+    def _delete_sync_entries(
+        self,
+        plan: list[dict[str, Any]],
+        max_workers: int,
+    ) -> None:
         """
-        raise_path_error(local_folder_path)
-
-        if not key:
-            key = local_folder_path
+        Delete the objects of the delete entries in a sync plan in batches,
+        and record the errors in the entries.
+        """
+        deletions = [
+            entry
+            for entry in plan
+            if entry["Action"] == HCPHandler.SyncAction.DELETE
+        ]
+        errors = {
+            error["Key"]: error["Message"]
+            for error in self._delete_keys(
+                [entry["Key"] for entry in deletions],
+                max_workers,
+            )["Errors"]
+        }
+        for entry in deletions:
+            entry["Error"] = errors.get(entry["Key"], "")
 
-        filenames = Path(local_folder_path).iterdir()
+    # ---------------------------- Verify methods ----------------------------
 
-        for filename in filenames:
-            self.upload_file(
-                local_folder_path + filename.name,
-                key + filename.name,
-                show_progress_bar=show_progress_bar,
-                upload_mode=upload_mode,
-                equal_parts=equal_parts,
-            )
+    class VerifyStatus(Enum):
+        MATCHED = "matched"
+        MISMATCHED = "mismatched"
+        UNVERIFIABLE = "unverifiable"
+        MISSING = "missing"
+        EXTRANEOUS = "extraneous"
 
     @check_mounted
-    def delete_objects(self, keys: list[str]) -> str:
-        """
-        Delete a list of objects on the mounted bucket.
+    def verify(
+        self,
+        local_folder_path: str,
+        key: str = "",
+        *,
+        show_progress_bar: bool = True,
+        max_workers: int | None = None,
+    ) -> list[dict[str, Any]]:
+        r"""
+        Verify the integrity of a local folder against a folder in the mounted
+        bucket, without downloading anything.
+
+        The objects under `key` are listed once, after which the local files
+        of the same size are hashed in a pool of processes, so that verifying
+        scales with the local cores and disks rather than with requests to the
+        HCP. Every file is memory mapped and read once, and compared with the
+        ETag of its object. Multipart ETags are calculated with the part sizes
+        of the transfer config, or with the part sizes that equal parts would
+        have, given the number of parts in the ETag, which means that objects
+        that were uploaded with other part sizes are reported as mismatched.
+        Checksum manifests next to the files are ignored.
+
+        Objects that were uploaded compressed are compared with their
+        compressed bytes, which means that decompressed downloads of them are
+        reported as mismatched.
+
+        :param local_folder_path: Path to a folder on your local system
+        :type local_folder_path: str
 
-        :param keys: List of object names to be deleted
-        :type keys: list[str]
+        :param key:
+            The folder in the mounted bucket. Defaults to "the root" of the
+            bucket
+        :type key: str, optional
 
-        :raises IsFolderObjectError: If the provided object is a folder object
+        :param show_progress_bar:
+            Boolean choice of displaying a progress bar of the hashed bytes.
+            Defaults to True
+        :type show_progress_bar: bool, optional
 
-        :return: The result of the deletion
-        :rtype: str
+        :param max_workers:
+            The maximum number of files that are hashed at the same time.
+            Defaults to None, which means the number of CPU cores
+        :type max_workers: int | None, optional
+
+        :raises FileNotFoundError: If `local_folder_path` does not exist
+
+        :return:
+            One dictionary per file or object with the keys `"Path"`, `"Key"`,
+            `"Status"`, `"Size"` and `"LocalSize"`, sorted by key. `"Size"`
+            is the size of the object and `"LocalSize"` is the size of the
+            file, either of which is None if it does not exist.
+            `"Status"` is any of the following:\n
+                HCPHandler.VerifyStatus.MATCHED,\n
+                HCPHandler.VerifyStatus.MISMATCHED,\n
+                HCPHandler.VerifyStatus.UNVERIFIABLE,\n
+                HCPHandler.VerifyStatus.MISSING,\n
+                HCPHandler.VerifyStatus.EXTRANEOUS\n
+            where UNVERIFIABLE means that no part size results in the number
+            of parts in a multipart ETag, MISSING means that there is no local
+            file and EXTRANEOUS means that there is no object
+        :rtype: list[dict[str, Any]]
         """
-        object_list = []
-        does_not_exist = []
-        for key in keys:
-            if self.object_exists(key):
-                if key[-1] == "/":
-                    raise IsFolderObjectError(
-                        'The object "'
-                        + key
-                        + '" is a folder object. Please use the `delete_folder`'
-                        + "method for this object",
-                    )
-                object_list.append({"Key": key})
-            else:
-                does_not_exist.append(key)
+        raise_path_error(local_folder_path)
+        if key and not key.endswith("/"):
+            key += "/"
 
-        result = ""
-        if object_list:
-            deletion_dict = {"Objects": object_list}
-            response: dict = self.s3_client.delete_objects(
-                Bucket=self.bucket_name,
-                Delete=deletion_dict,
+        local_files = {
+            relative_path: (local_file_path, file_size)
+            for local_file_path, relative_path, file_size in walk_files(
+                local_folder_path,
             )
-
-            deleted_files: list = [d["Key"] for d in response["Deleted"]]
-            result += "The following was successfully deleted: \n" + "\n".join(
-                deleted_files,
+            if not relative_path.endswith(MANIFEST_SUFFIX)
+        }
+        hcp_objects = {
+            hcp_object["Key"][len(key) :]: hcp_object
+            for hcp_object in self.list_objects_parallel(
+                key,
+                output_mode=HCPHandler.ListObjectsOutputMode.EXTENDED,
+                files_only=True,
             )
+        }
 
-        if does_not_exist:
-            result += (
-                "The following could not be deleted because they didn't "
-                "exist:\n" + "\n".join(does_not_exist)
+        results = {
+            relative_path: {
+                "Path": str(Path(local_folder_path) / relative_path),
+                "Key": key + relative_path,
+                "Status": HCPHandler.VerifyStatus.MISMATCHED,
+                "Size": (
+                    hcp_objects[relative_path]["Size"]
+                    if relative_path in hcp_objects
+                    else None
+                ),
+                "LocalSize": (
+                    local_files[relative_path][1]
+                    if relative_path in local_files
+                    else None
+                ),
+            }
+            for relative_path in local_files.keys() | hcp_objects.keys()
+        }
+        for result in results.values():
+            if result["LocalSize"] is None:
+                result["Status"] = HCPHandler.VerifyStatus.MISSING
+            elif result["Size"] is None:
+                result["Status"] = HCPHandler.VerifyStatus.EXTRANEOUS
+
+        # Only files of the same size as their object have to be hashed. The
+        # largest files are hashed first, so that no single large file is left
+        # for the end
+        to_hash = sorted(
+            (
+                relative_path
+                for relative_path, result in results.items()
+                if result["Size"] == result["LocalSize"]
+            ),
+            key=lambda relative_path: results[relative_path]["Size"],
+            reverse=True,
+        )
+        part_sizes = [
+            self.transfer_config.multipart_chunksize,
+            TransferConfig().multipart_chunksize,
+        ]
+        pbar = (
+            tqdm(
+                total=sum(results[path]["Size"] for path in to_hash),
+                unit="B",
+                unit_scale=True,
+                desc=local_folder_path,
             )
-
-        return result
+            if show_progress_bar
+            else None
+        )
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                verifications = {
+                    executor.submit(
+                        verify_file,
+                        local_files[relative_path][0],
+                        hcp_objects[relative_path]["ETag"].strip('"'),
+                        part_sizes,
+                    ): relative_path
+                    for relative_path in to_hash
+                }
+                for verification in as_completed(verifications):
+                    result = results[verifications[verification]]
+                    match verification.result():
+                        case True:
+                            result["Status"] = HCPHandler.VerifyStatus.MATCHED
+                        case None:
+                            result["Status"] = (
+                                HCPHandler.VerifyStatus.UNVERIFIABLE
+                            )
+                    if pbar is not None:
+                        pbar.update(result["Size"])
+        finally:
+            if pbar is not None:
+                pbar.close()
+
+        return sorted(results.values(), key=lambda result: result["Key"])
+
+    # ---------------------------- Index methods ----------------------------
 
     @check_mounted
-    def delete_object(self, key: str) -> str:
+    def _get_bucket_index(self) -> BucketIndex:
         """
-        Delete a single object in the mounted bucket.
-
-        :param key: The object to be deleted
-        :type key: str
+        Get the bucket index, making sure that the mounted bucket is indexed.
 
-        :raises IsFolderObject: If the provided object is a folder object
+        :raises NoBucketIndexError:
+            If no index was opened or if the mounted bucket is not indexed
 
-        :return: The result of the deletion
-        :rtype: str
+        :return: The bucket index
+        :rtype: BucketIndex
         """
-        return self.delete_objects([key])
+        if self.bucket_index is None:
+            msg = "No bucket index is opened"
+            raise NoBucketIndexError(msg)
+        if not self.bucket_index.is_indexed(str(self.bucket_name)):
+            msg = (
+                'The bucket "'
+                + str(self.bucket_name)
+                + '" is not indexed. Please use `refresh_index` first'
+            )
+            raise NoBucketIndexError(msg)
+        return self.bucket_index
 
     @check_mounted
-    def delete_folder(self, key: str) -> str:
-        """
-        Delete a folder of objects in the mounted bucket.
-        If there are subfolders, a `SubfolderException` is raised
+    def refresh_index(
+        self,
+        path_key: str = "",
+        parallel: int = _DEFAULT_MAX_WORKERS,
+        substring_index: bool = False,
+    ) -> dict[str, int]:
+        r"""
+        Bring the local index of the mounted bucket up to date by listing
+        every object under `path_key`, see :py:meth:`list_objects_parallel`.
+        Only the objects that were added, changed or removed since the last
+        refresh are written to the index.
 
-        :param key: The folder of objects to be deleted
-        :type key: str
+        :param path_key:
+            The folder to be refreshed. Defaults to \"the root\" of the
+            bucket, which refreshes the whole bucket
+        :type path_key: str, optional
 
-        :raises ObjectDoesNotExistError: If an object does not exist
+        :param parallel:
+            The maximum number of listing requests that are running at the same
+            time. Defaults to 10
+        :type parallel: int, optional
 
-        :raises SubfolderError: If there are subfolders
+        :param substring_index:
+            Boolean choice of also building a trigram index of the keys, which
+            makes substring searches with :py:meth:`search_in_bucket` fast.
+            Once built, the trigram index of the bucket is kept up to date by
+            every later refresh. Defaults to False
+        :type substring_index: bool, optional
 
-        :return: The result of the deletion
-        :rtype: str
-        """  # noqa: D400, D415
-        if key[-1] != "/":
-            key += "/"
+        :raises NoBucketIndexError: If no index was opened
 
-        objects: list[dict[str, Any]] = list(
-            self.list_objects(
-                key,
-                output_mode=HCPHandler.ListObjectsOutputMode.MINIMAL,
-            ),
+        :return:
+            The number of `"Added"`, `"Changed"` and `"Removed"` objects
+        :rtype: dict[str, int]
+        """
+        if self.bucket_index is None:
+            msg = "No bucket index is opened"
+            raise NoBucketIndexError(msg)
+        bucket = str(self.bucket_name)
+        hcp_objects = self.list_objects_parallel(path_key, parallel=parallel)
+        # The listing leaves out the folder object of `path_key` itself
+        folder_object = (
+            self._head_or_none(path_key, bucket) if path_key else None
         )
+        changes = self.bucket_index.refresh(
+            bucket,
+            chain(hcp_objects, [folder_object] if folder_object else []),
+            path_key,
+        )
+        if substring_index:
+            self.bucket_index.enable_trigrams(bucket)
+        return changes
 
-        if not self.object_exists(key):
-            raise ObjectDoesNotExistError(
-                '"' + key + '"' + " does not exist",
-            )
-
-        # If the folder object is empty, delete the object itself. Since
-        # `delete_objects` was only made for file objects in mind then
-        if not objects:
-            result = '"' + key + '"' + " was deleted"
-        else:
-            for hcp_object in objects:
-                if not hcp_object["IsFile"]:
-                    raise SubfolderError(
-                        'There is at least one subfolder in "'
-                        + key
-                        + '". Please remove all subfolders before deleting "'
-                        + key
-                        + '" itself',
-                    )
+    def _head_or_none(self, key: str, bucket: str) -> dict[str, Any] | None:
+        """
+        Get the index entry of an object in any bucket, or `None` if the
+        object does not exist.
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=bucket, Key=key)
+        except ClientError:
+            return None
+        return {
+            "Key": key,
+            "Size": response["ContentLength"],
+            "ETag": response["ETag"],
+            "LastModified": response["LastModified"],
+        }
 
-            result = self.delete_objects([obj["Key"] for obj in objects])
+    def _update_index(self, keys: list[str], bucket: str = "") -> None:
+        """
+        Update the index entries of `keys` after they were written to or
+        deleted from `bucket`. Buckets that are not indexed are left alone.
+        Defaults to the mounted bucket.
+        """
+        bucket = bucket or str(self.bucket_name)
+        if (
+            self.bucket_index is None
+            or not keys
+            or not self.bucket_index.is_indexed(bucket)
+        ):
+            return
 
-        # Delete the folder object itself separately
-        self.s3_client.delete_object(
-            Bucket=self.bucket_name,
-            Key=key,
+        with ThreadPoolExecutor(
+            max_workers=min(_DEFAULT_MAX_WORKERS, len(keys)),
+        ) as executor:
+            heads = list(
+                executor.map(lambda key: self._head_or_none(key, bucket), keys),
+            )
+        self.bucket_index.upsert(bucket, [head for head in heads if head])
+        self.bucket_index.remove(
+            bucket,
+            [key for key, head in zip(keys, heads, strict=True) if not head],
         )
 
-        return result
+    def _remove_from_index(self, keys: list[str]) -> None:
+        """
+        Remove the index entries of `keys` after they were deleted from the
+        mounted bucket.
+        """
+        if self.bucket_index is not None and keys:
+            self.bucket_index.remove(str(self.bucket_name), keys)
 
     @check_mounted
-    def copy_file(
-        self,
-        source_key: str,
-        destination_key: str,
-        destination_bucket: str = "",
-    ) -> None:
-        """
-        Copy a file object within the HCP.
+    def get_folder_size(self, path_key: str = "") -> dict[str, int]:
+        r"""
+        Get the total size and number of objects under `path_key`, including
+        the objects in every subfolder. The answer comes from the local index,
+        see :py:meth:`refresh_index`.
 
-        :param source_key: The key to the object to be copied
-        :type source_key: str
+        :param path_key:
+            The folder key. Defaults to \"the root\" of the bucket
+        :type path_key: str, optional
 
-        :param destination_key: The key to where the object will be copied to
-        :type destination_key: str
+        :raises NoBucketIndexError:
+            If no index was opened or if the mounted bucket is not indexed
 
-        :param destination_bucket:
-            The destination bucket, defaults to the mounted bucket
-        :type destination_bucket: str
+        :return: A dictionary with the keys `"Size"` and `"ObjectCount"`
+        :rtype: dict[str, int]
         """
-        file_size: int = self.s3_client.head_object(
-            Bucket=self.bucket_name,
-            Key=source_key,
-        )["ContentLength"]
-        with tqdm(
-            total=file_size,
-            unit="B",
-            unit_scale=True,
-            desc=source_key,
-        ) as pbar:
-            self.s3_client.copy(
-                {"Bucket": self.bucket_name, "Key": source_key},
-                destination_bucket if destination_bucket else self.bucket_name,
-                destination_key,
-                Callback=lambda bytes_transferred: pbar.update(
-                    bytes_transferred,
-                ),
-            )
+        return self._get_bucket_index().get_folder_size(
+            str(self.bucket_name),
+            path_key,
+        )
 
     @check_mounted
-    def move_file(
+    def get_subfolder_sizes(
         self,
-        source_key: str,
-        destination_key: str,
-        destination_bucket: str = "",
-    ) -> None:
-        """
-        Move a file `source_key` to `destination_key`.
+        path_key: str = "",
+    ) -> dict[str, dict[str, int]]:
+        r"""
+        Get the total size and number of objects of every subfolder directly
+        under `path_key`, including the objects in their own subfolders. The
+        answer comes from the local index, see :py:meth:`refresh_index`.
 
-        :param source_key: The key to the object to be moved
-        :type source_key: str
+        :param path_key:
+            The folder key. Defaults to \"the root\" of the bucket
+        :type path_key: str, optional
 
-        :param destination_key: The key to where the object will be moved to
-        :type destination_key: str
+        :raises NoBucketIndexError:
+            If no index was opened or if the mounted bucket is not indexed
 
-        :param destination_bucket:
-            The destination bucket, defaults to the mounted bucket
-        :type destination_bucket: str
+        :return:
+            A dictionary from each subfolder key to a dictionary with the keys
+            `"Size"` and `"ObjectCount"`
+        :rtype: dict[str, dict[str, int]]
         """
-        self.copy_file(source_key, destination_key, destination_bucket)
-        self.delete_object(source_key)
+        return self._get_bucket_index().get_subfolder_sizes(
+            str(self.bucket_name),
+            path_key,
+        )
 
     # ---------------------------- Search methods ----------------------------
 
+    def _list_search_candidates(
+        self,
+        path_key: str,
+        use_index: bool,
+    ) -> tuple[list[str], list[dict[str, Any]]]:
+        """
+        List every object under `path_key` once, for searching.
+
+        :return:
+            The keys and the objects in SIMPLE output mode, in the same order
+        :rtype: tuple[list[str], list[dict[str, Any]]]
+        """
+        output_mode = HCPHandler.ListObjectsOutputMode.SIMPLE
+        if use_index:
+            hcp_objects = [
+                self._format_object_dictionary(
+                    hcp_object["Key"],
+                    hcp_object,
+                    not hcp_object["Key"].endswith("/"),
+                    output_mode,
+                )
+                for hcp_object in self._get_bucket_index().list_objects(
+                    str(self.bucket_name),
+                    path_key,
+                )
+                if hcp_object["Key"] != path_key
+            ]
+        else:
+            hcp_objects = list(
+                self.list_objects_parallel(path_key, output_mode=output_mode),
+            )
+        return [hcp_object["Key"] for hcp_object in hcp_objects], hcp_objects
+
     @check_mounted
     def search_in_bucket(
         self,
         search_string: str,
         case_sensitive: bool = False,
-    ) -> Generator:
-        """
+        *,
+        path_key: str = "",
+        use_index: bool = False,
+    ) -> Generator[dict[str, Any], Any, None]:
+        r"""
         Simple search method using exact substrings in order to find certain
         objects. Case insensitive by default. Does not utilise the HCI
 
@@ -1165,20 +4624,60 @@ class HCPHandler:
         :param case_sensitive: Case sensitivity. Defaults to False
         :type case_sensitive: bool, optional
 
+        :param path_key:
+            Only search among the objects under this folder. Defaults to
+            \"the root\" of the bucket
+        :type path_key: str, optional
+
+        :param use_index:
+            Boolean choice of searching the local index instead of making
+            requests to the HCP, see :py:meth:`refresh_index`. If the index
+            of the bucket includes a trigram index, only the keys that can
+            contain `search_string` are checked. Defaults to False
+        :type use_index: bool, optional
+
         :return: A generator of objects based on the search string
         :rtype: Generator
         """  # noqa: D400, D415
-        return self.fuzzy_search_in_bucket(search_string, case_sensitive, 100)
+        if use_index:
+            for hcp_object in self._get_bucket_index().search_substring(
+                str(self.bucket_name),
+                search_string,
+                case_sensitive=case_sensitive,
+                prefix=path_key,
+            ):
+                key = hcp_object["Key"]
+                if key != path_key:
+                    yield self._format_object_dictionary(
+                        key,
+                        hcp_object,
+                        not key.endswith("/"),
+                        HCPHandler.ListObjectsOutputMode.SIMPLE,
+                    )
+            return
+
+        keys, hcp_objects = self._list_search_candidates(path_key, use_index)
+        if not case_sensitive:
+            search_string = search_string.lower()
+        for key, hcp_object in zip(keys, hcp_objects, strict=True):
+            if search_string in (key if case_sensitive else key.lower()):
+                yield hcp_object
 
     @check_mounted
-    def fuzzy_search_in_bucket(
+    def fuzzy_search_in_bucket(  # noqa: PLR0913
         self,
         search_string: str,
         case_sensitive: bool = False,
         threshold: int = 80,
-    ) -> Generator:
-        """
-        Fuzzy search implementation based on the `RapidFuzz` library.
+        *,
+        path_key: str = "",
+        top_k: int = 0,
+        use_index: bool = False,
+    ) -> Generator[dict[str, Any], Any, None]:
+        r"""
+        Fuzzy search implementation based on the `RapidFuzz` library. The
+        bucket is listed once, after which the keys are scored in batches. If
+        NumPy is installed, each batch is scored on every CPU core.
 
         :param search_string: Substring to be used in the search
         :type search_string: str
@@ -1189,31 +4688,63 @@ class HCPHandler:
         :param threshold: The fuzzy search similarity score. Defaults to 80
         :type threshold: int, optional
 
-        :return: A generator of objects based on the search string
+        :param path_key:
+            Only search among the objects under this folder. Defaults to
+            \"the root\" of the bucket
+        :type path_key: str, optional
+
+        :param top_k:
+            If greater than 0, only yield the `top_k` best matches, best match
+            first. Otherwise, every match is yielded in key order as soon as its
+            batch is scored. Defaults to 0
+        :type top_k: int, optional
+
+        :param use_index:
+            Boolean choice of listing the objects from the local index instead
+            of making requests to the HCP, see :py:meth:`refresh_index`.
+            Defaults to False
+        :type use_index: bool, optional
+
+        :return:
+            A generator of objects based on the search string, each with its
+            score under the key `"Score"`
         :rtype: Generator
         """
-        msg = "This method is currently not implemented"
-        raise NotImplementedError(msg)
         processor = None if case_sensitive else utils.default_process
-
-        full_list = peekable(self.list_objects())
-
-        full_list_names_only = peekable(
-            obj["Key"]
-            for obj in self.list_objects(
-                output_mode=HCPHandler.ListObjectsOutputMode.MINIMAL,
-                list_all_bucket_objects=True,
-            )
-        )
-
-        for _, score, index in process.extract_iter(
-            search_string,
-            full_list_names_only,
-            scorer=fuzz.partial_ratio,
-            processor=processor,
-        ):
-            if score >= threshold:
-                yield full_list[index]
+        keys, hcp_objects = self._list_search_candidates(path_key, use_index)
+        batch_size = _SEARCH_BATCH_SIZE
+
+        if top_k > 0:
+            best_matches: list[tuple[float, int]] = []
+            for batch_start in range(0, len(keys), batch_size):
+                best_matches = nlargest(
+                    top_k,
+                    chain(
+                        best_matches,
+                        (
+                            (score, batch_start + index)
+                            for score, index in score_keys(
+                                search_string,
+                                keys[batch_start : batch_start + batch_size],
+                                processor,
+                                threshold,
+                            )
+                        ),
+                    ),
+                    key=lambda match: (match[0], -match[1]),
+                )
+            for score, index in best_matches:
+                yield hcp_objects[index] | {"Score": score}
+            return
+
+        for batch_start in range(0, len(keys), batch_size):
+            for score, index in score_keys(
+                search_string,
+                keys[batch_start : batch_start + batch_size],
+                processor,
+                threshold,
+            ):
+                yield hcp_objects[batch_start + index] | {"Score": score}
 
     # ---------------------------- ACL methods ----------------------------
 
@@ -1,9 +1,125 @@
+import os
 import sys
-from collections.abc import Callable
+from collections.abc import Callable, Generator, Iterable
+from contextlib import suppress
+from importlib.util import find_spec
 from pathlib import Path
-from typing import ParamSpec, TypeVar
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Any, ParamSpec, TypeVar
 
-from NGPIris.hcp.exceptions import NoBucketMountedError
+from parse import Result, parse
+from rapidfuzz import fuzz, process
+
+from NGPIris.hcp.exceptions import (
+    NoBucketMountedError,
+    NotAValidTenantError,
+    UnableToParseEndpointError,
+)
+from NGPIris.parse_credentials import CredentialsHandler
+
+# `process.cdist` returns NumPy arrays, which makes NumPy an optional
+# dependency for scoring on every CPU core
+_HAS_NUMPY = find_spec("numpy") is not None
+
+# The number of items that a pipeline stage produces ahead of its consumer
+_PIPELINE_DEPTH = 4
+
+
+# A lookup table for GMC names to HCP tenant names
+_GMC_TENANT_MAP = {
+    "gmc-joint": "vgtn0008",
+    "gmc-west": "vgtn0012",
+    "gmc-southeast": "vgtn0014",
+    "gmc-south": "vgtn0015",
+    "gmc-orebro": "vgtn0016",
+    "gmc-karolinska": "vgtn0017",
+    "gmc-north": "vgtn0018",
+    "gmc-uppsala": "vgtn0019",
+}
+
+_SJUNET_ENDPOINT_FORMAT_STRING = "https://{}.vgregion.sjunet.org"
+
+_ENDPOINT_FORMAT_STRINGS = [
+    "https://{}.ngp-fs1000.vgregion.se",
+    "https://{}.ngp-fs2000.vgregion.se",
+    "https://{}.ngp-fs3000.vgregion.se",
+    "https://{}.hcp1.vgregion.se",
+    _SJUNET_ENDPOINT_FORMAT_STRING,
+]
+
+
+def parse_credentials(
+    credentials: str | dict[str, str],
+) -> tuple[str, str, str]:
+    """
+    Get the endpoint, the username and the password from HCP credentials.
+
+    :param credentials:
+        Path to a JSON credentials file, or a dictionary with the credentials,
+        see :py:class:`NGPIris.hcp.hcp.HCPHandler`
+    :type credentials: str | dict[str, str]
+
+    :return: The endpoint, with "https://", the username and the password
+    :rtype: tuple[str, str, str]
+    """
+    parsed_credentials = (
+        CredentialsHandler(credentials).hcp
+        if type(credentials) is str
+        else credentials
+    )
+    return (
+        "https://" + parsed_credentials["endpoint"],
+        parsed_credentials["username"]
+        if parsed_credentials.get("username")
+        else parsed_credentials["aws_access_key_id"],
+        parsed_credentials["password"]
+        if parsed_credentials.get("password")
+        else parsed_credentials["aws_secret_access_key"],
+    )
+
+
+def get_tenant(endpoint: str) -> str:
+    """
+    Get the HCP tenant of `endpoint`.
+
+    :param endpoint: The endpoint, with "https://"
+    :type endpoint: str
+
+    :raise NotAValidTenantError:
+        If the tenant in the specified endpoint is not valid
+
+    :raise UnableToParseEndpointError: The endpoint could not be parsed
+
+    :return: The name of the tenant
+    :rtype: str
+    """
+    for endpoint_format_string in _ENDPOINT_FORMAT_STRINGS:
+        tenant_parse = parse(endpoint_format_string, endpoint)
+        if type(tenant_parse) is not Result:
+            continue
+        tenant = str(tenant_parse[0])
+        if endpoint_format_string != _SJUNET_ENDPOINT_FORMAT_STRING:
+            return tenant
+        # Check if endpoint is Sjunet
+        mapped_tenant = _GMC_TENANT_MAP.get(tenant)
+        if not mapped_tenant:
+            raise NotAValidTenantError(
+                'The provided tenant name, "'
+                + tenant
+                + '", is not a valid tenant name. Hint: did you'
+                + "spell it correctly?",
+            )
+        return mapped_tenant
+
+    raise UnableToParseEndpointError(
+        'Unable to parse endpoint, "'
+        + endpoint
+        + '". Make sure that you have entered the correct endpoint in'
+        + "your credentials JSON file. "
+        + 'Hints:\n - The endpoint should *not* contain "https://" or'
+        + "port numbers\n - Is the endpoint spelled correctly?",
+    )
 
 
 def create_access_control_policy(user_ID_permissions: dict[str, str]) -> dict:  # noqa: D103
@@ -44,10 +160,256 @@ def raise_path_error(path: str) -> None:
         raise FileNotFoundError('"' + path + '"' + " does not exist")
 
 
+def walk_files(path: str) -> Generator[tuple[str, str, int], None, None]:
+    """
+    Walk the local folder `path` recursively and yield every file in it.
+    Symbolic links to folders are followed, but each folder is only walked
+    once, so that a link to one of its parents does not loop forever.
+
+    :param path: Local system path to a folder
+    :type path: str
+
+    :yield:
+        A tuple of the path to each file, its path relative to `path` with "/"
+        as separator and its size in bytes
+    :rtype: Generator[tuple[str, str, int], None, None]
+    """
+    folders = [(path, "")]
+    visited_folders: set[tuple[int, int]] = set()
+    while folders:
+        folder, relative_folder = folders.pop()
+        folder_stat = Path(folder).stat()
+        folder_id = (folder_stat.st_dev, folder_stat.st_ino)
+        if folder_id in visited_folders:
+            continue
+        visited_folders.add(folder_id)
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                relative_path = relative_folder + entry.name
+                if entry.is_dir():
+                    folders.append((entry.path, relative_path + "/"))
+                elif entry.is_file():
+                    yield entry.path, relative_path, entry.stat().st_size
+
+
+def preallocate_file(file_descriptor: int, size: int) -> None:
+    """
+    Set the size of an open file to `size` bytes and, where the platform and
+    the file system support it, allocate its blocks up front. Allocating the
+    whole file at once avoids fragmentation and running out of space halfway
+    through a download.
+
+    :param file_descriptor: A file descriptor opened for writing
+    :type file_descriptor: int
+
+    :param size: The size of the file in bytes
+    :type size: int
+    """
+    os.ftruncate(file_descriptor, size)
+    if size and hasattr(os, "posix_fallocate"):
+        # If the file system does not support it, the file is left sparse
+        with suppress(OSError):
+            os.posix_fallocate(file_descriptor, 0, size)
+
+
+# Characters that keys are split on for parallel listing, in sorted order
+_KEY_RANGE_BOUNDARY_CHARACTERS = (
+    "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+)
+
+
+def split_key_range(prefix: str, parts: int) -> list[tuple[str, str, str]]:
+    """
+    Split the keys under `prefix` into at most `parts` disjoint key ranges.
+    Each range is given as a `(prefix, start_after, end_key)` tuple, which
+    covers the keys that are greater than `start_after` and less than or equal
+    to `end_key`. The empty string leaves that end of the range open.
+
+    :param prefix: The key prefix to be split
+    :type prefix: str
+
+    :param parts: The maximum number of key ranges
+    :type parts: int
+
+    :return: The key ranges in key order
+    :rtype: list[tuple[str, str, str]]
+    """
+    characters = _KEY_RANGE_BOUNDARY_CHARACTERS
+    parts = max(1, min(parts, len(characters)))
+    boundaries = [
+        prefix + characters[i * len(characters) // parts]
+        for i in range(1, parts)
+    ]
+    starts = ["", *boundaries]
+    ends = [*boundaries, ""]
+    return [
+        (prefix, start, end) for start, end in zip(starts, ends, strict=True)
+    ]
+
+
+# Part sizes are commonly whole MiB
+_MIB = 1024 * 1024
+
+
+def get_part_size_candidates(
+    size: int,
+    part_count: int,
+    part_sizes: Iterable[int],
+) -> list[int]:
+    """
+    Get the part sizes that could have been used for uploading `size` bytes
+    in `part_count` parts. The candidates are the given `part_sizes`, as well
+    as the sizes that equal parts and equal parts rounded up to whole MiB would
+    have.
+
+    :param size: The size of the object in bytes
+    :type size: int
+
+    :param part_count: The number of parts, as given by the ETag
+    :type part_count: int
+
+    :param part_sizes: Part sizes to try first, such as transfer configs
+    :type part_sizes: Iterable[int]
+
+    :return: The candidates that result in `part_count` parts, without repeats
+    :rtype: list[int]
+    """
+    equal_part_size = -(-size // part_count)  # Ceiling
+    candidates = [
+        *part_sizes,
+        equal_part_size,
+        round(size / part_count),
+        -(-equal_part_size // _MIB) * _MIB,
+    ]
+    return [
+        part_size
+        for i, part_size in enumerate(candidates)
+        if part_size > 0
+        and part_size not in candidates[:i]
+        and -(-size // part_size) == part_count
+    ]
+
+
 P = ParamSpec("P")
 T = TypeVar("T")
 
 
+def score_keys(
+    search_string: str,
+    keys: list[str],
+    processor: Callable[[str], str] | None,
+    threshold: float,
+) -> list[tuple[float, int]]:
+    """
+    Score `keys` against `search_string` with the partial ratio of RapidFuzz.
+    If NumPy is installed, the keys are scored on every CPU core.
+
+    :param search_string: The string to search for
+    :type search_string: str
+
+    :param keys: The keys to be scored
+    :type keys: list[str]
+
+    :param processor: A function for preprocessing the strings, or `None`
+    :type processor: Callable[[str], str] | None
+
+    :param threshold: The lowest score of a match
+    :type threshold: float
+
+    :return:
+        The score and the index in `keys` of every key that scored at least
+        `threshold`, in the same order as `keys`
+    :rtype: list[tuple[float, int]]
+    """
+    if not keys:
+        return []
+    if _HAS_NUMPY:
+        scores = process.cdist(
+            [search_string],
+            keys,
+            scorer=fuzz.partial_ratio,
+            processor=processor,
+            score_cutoff=threshold,
+            workers=-1,
+        )[0]
+        return [
+            (float(score), index)
+            for index, score in enumerate(scores)
+            if score >= threshold
+        ]
+    return [
+        (score, index)
+        for _, score, index in process.extract_iter(
+            search_string,
+            keys,
+            scorer=fuzz.partial_ratio,
+            processor=processor,
+            score_cutoff=threshold,
+        )
+    ]
+
+
+def iterate_in_thread(  # noqa: C901
+    iterable: Iterable[T],
+    depth: int = _PIPELINE_DEPTH,
+) -> Generator[T, None, None]:
+    """
+    Consume `iterable` on a worker thread, as a stage of a pipeline, and yield
+    its items in order. The worker stays at most `depth` items ahead, so that
+    a CPU bound stage, such as compression, overlaps with the network I/O of
+    the next stage without filling the memory. An exception in the worker is
+    raised in the consumer, and closing the generator early stops the worker.
+
+    :param iterable: The items to produce on the worker thread
+    :type iterable: Iterable[T]
+
+    :param depth:
+        The number of items that the worker produces ahead of the consumer.
+        Defaults to 4
+    :type depth: int, optional
+
+    :yield: The items of `iterable`
+    :rtype: Generator[T, None, None]
+    """
+    items: Queue[tuple[bool, Any]] = Queue(maxsize=max(depth, 1))
+    stopped = Event()
+
+    def _put(item: tuple[bool, Any]) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+            except Full:
+                continue
+            return True
+        return False
+
+    def _produce() -> None:
+        try:
+            for item in iterable:
+                if not _put((True, item)):
+                    return
+            _put((False, None))
+        except BaseException as e:  # noqa: BLE001
+            _put((False, e))
+        finally:
+            if isinstance(iterable, Generator):
+                iterable.close()
+
+    worker = Thread(target=_produce, name="iterate_in_thread", daemon=True)
+    worker.start()
+    try:
+        while True:
+            is_item, item = items.get()
+            if not is_item:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        stopped.set()
+        worker.join()
+
+
 def check_mounted(method: Callable[P, T]) -> Callable[P, T]:
     """
     Decorator for checking if a bucket is mounted. This is meant to be used by
@@ -0,0 +1,600 @@
+import sqlite3
+from collections.abc import Generator, Iterable
+from datetime import UTC, datetime
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+# Bumped whenever the layout of the tables changes
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    id INTEGER PRIMARY KEY,
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    etag TEXT NOT NULL,
+    last_modified TEXT NOT NULL,
+    parent TEXT NOT NULL,
+    UNIQUE (bucket, key)
+);
+CREATE INDEX IF NOT EXISTS objects_parent ON objects (bucket, parent);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket TEXT PRIMARY KEY,
+    refreshed_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS trigram_buckets (
+    bucket TEXT PRIMARY KEY
+);
+"""
+
+_DROP_SCHEMA = """
+DROP TRIGGER IF EXISTS objects_trigrams_insert;
+DROP TRIGGER IF EXISTS objects_trigrams_delete;
+DROP TABLE IF EXISTS trigrams;
+DROP TABLE IF EXISTS trigram_buckets;
+DROP TABLE IF EXISTS buckets;
+DROP TABLE IF EXISTS objects;
+"""
+
+# The trigram index is an FTS5 table over the keys, which is kept in sync with
+# the objects table by triggers for the buckets in `trigram_buckets`
+_TRIGRAM_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS trigrams USING fts5(
+    key,
+    content='objects',
+    content_rowid='id',
+    tokenize='trigram',
+    detail='none'
+);
+CREATE TRIGGER IF NOT EXISTS objects_trigrams_insert AFTER INSERT ON objects
+WHEN new.bucket IN (SELECT bucket FROM trigram_buckets) BEGIN
+    INSERT INTO trigrams (rowid, key) VALUES (new.id, new.key);
+END;
+CREATE TRIGGER IF NOT EXISTS objects_trigrams_delete AFTER DELETE ON objects
+WHEN old.bucket IN (SELECT bucket FROM trigram_buckets) BEGIN
+    INSERT INTO trigrams (trigrams, rowid, key)
+    VALUES ('delete', old.id, old.key);
+END;
+"""
+
+# Substrings shorter than this cannot be looked up in the trigram index
+_TRIGRAM_LENGTH = 3
+
+# Inserts new objects and updates the metadata of the existing ones, without
+# replacing their rows, since that would leave the trigram index out of sync
+_UPSERT = (
+    "INSERT INTO objects (bucket, key, size, etag, last_modified, parent) "
+    "{source} ON CONFLICT (bucket, key) DO UPDATE SET "
+    "size = excluded.size, etag = excluded.etag, "
+    "last_modified = excluded.last_modified "
+    "WHERE etag != excluded.etag OR size != excluded.size "
+    "OR last_modified != excluded.last_modified"
+)
+
+
+def get_parent(key: str) -> str:
+    """
+    Get the parent prefix of a key, that is everything up to and including
+    the last "/". Keys at the root of a bucket have the empty string as parent.
+
+    :param key: The object key
+    :type key: str
+
+    :return: The parent prefix of `key`
+    :rtype: str
+    """
+    return key[: key.rfind("/") + 1]
+
+
+def get_prefix_upper_bound(prefix: str) -> str:
+    """
+    Get the smallest string that is greater than every string that starts with
+    `prefix`. Used for turning prefix queries into range queries.
+
+    :param prefix: A non-empty key prefix
+    :type prefix: str
+
+    :return: The exclusive upper bound of the keys starting with `prefix`
+    :rtype: str
+    """
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def _to_row(bucket: str, hcp_object: dict[str, Any]) -> tuple:
+    last_modified = hcp_object["LastModified"]
+    if isinstance(last_modified, datetime):
+        last_modified = last_modified.isoformat()
+    return (
+        bucket,
+        hcp_object["Key"],
+        hcp_object["Size"],
+        hcp_object["ETag"],
+        last_modified,
+        get_parent(hcp_object["Key"]),
+    )
+
+
+def _from_row(row: sqlite3.Row) -> dict[str, Any]:
+    return {
+        "Key": row["key"],
+        "LastModified": datetime.fromisoformat(row["last_modified"]),
+        "Size": row["size"],
+        "ETag": row["etag"],
+    }
+
+
+class BucketIndex:
+    """
+    Class for a local SQLite index of the objects in one or more buckets. The
+    index holds the key, size, ETag, last modified time and parent prefix of
+    every object, so that listings and folder sizes can be answered without
+    making requests to the HCP.
+    """
+
+    def __init__(self, index_path: str) -> None:
+        """
+        Constructor for the `BucketIndex` class.
+
+        :param index_path:
+            Path to the SQLite database file. The file is created if it does
+            not exist
+        :type index_path: str
+        """
+        self.index_path = index_path
+        Path(index_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # The connection is shared between threads, but only used while
+        # holding the lock
+        self._connection = sqlite3.connect(
+            index_path,
+            check_same_thread=False,
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        schema_version = self._connection.execute(
+            "PRAGMA user_version",
+        ).fetchone()[0]
+        if schema_version != _SCHEMA_VERSION:
+            # The index is only a local copy of bucket listings, so an index
+            # with another layout is dropped and has to be refreshed again
+            self._connection.executescript(_DROP_SCHEMA)
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute(
+            "PRAGMA user_version = " + str(_SCHEMA_VERSION),
+        )
+        self._lock = Lock()
+
+    def close(self) -> None:
+        """
+        Close the connection to the database file.
+        """
+        with self._lock:
+            self._connection.close()
+
+    @staticmethod
+    def _prefix_condition(prefix: str) -> tuple[str, list[str]]:
+        """
+        Get an SQL condition, along with its parameters, that matches the keys
+        starting with `prefix`.
+        """
+        if not prefix:
+            return "1", []
+        return "key >= ? AND key < ?", [
+            prefix,
+            get_prefix_upper_bound(prefix),
+        ]
+
+    def refresh(
+        self,
+        bucket: str,
+        hcp_objects: Iterable[dict[str, Any]],
+        prefix: str = "",
+    ) -> dict[str, int]:
+        """
+        Bring the index of `bucket` up to date with a fresh listing of the keys
+        under `prefix`. Only the rows that were added, changed or removed are
+        written.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param hcp_objects:
+            Every object under `prefix`, with the keys `"Key"`, `"Size"`,
+            `"ETag"` and `"LastModified"`
+        :type hcp_objects: Iterable[dict[str, Any]]
+
+        :param prefix:
+            The prefix that was listed. Defaults to the empty string, which
+            refreshes the whole bucket
+        :type prefix: str, optional
+
+        :return:
+            The number of `"Added"`, `"Changed"` and `"Removed"` objects
+        :rtype: dict[str, int]
+        """
+        condition, parameters = self._prefix_condition(prefix)
+        # Consume the listing before taking the lock, since it may be a
+        # generator that is making requests
+        rows = [_to_row(bucket, hcp_object) for hcp_object in hcp_objects]
+        with self._lock, self._connection as connection:
+            connection.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS listing ("
+                "bucket TEXT, key TEXT PRIMARY KEY, size INTEGER, etag TEXT, "
+                "last_modified TEXT, parent TEXT)"
+            )
+            connection.execute("DELETE FROM listing")
+            connection.executemany(
+                "INSERT OR REPLACE INTO listing VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            added = connection.execute(
+                "SELECT COUNT(*) FROM listing WHERE NOT EXISTS ("
+                "SELECT 1 FROM objects WHERE objects.bucket = ? "
+                "AND objects.key = listing.key)",
+                [bucket],
+            ).fetchone()[0]
+            changed = connection.execute(
+                "SELECT COUNT(*) FROM listing JOIN objects "
+                "ON objects.bucket = ? AND objects.key = listing.key "
+                "WHERE objects.etag != listing.etag "
+                "OR objects.size != listing.size "
+                "OR objects.last_modified != listing.last_modified",
+                [bucket],
+            ).fetchone()[0]
+            removed = connection.execute(
+                "DELETE FROM objects WHERE bucket = ? AND "  # noqa: S608
+                + condition
+                + " AND key NOT IN (SELECT key FROM listing)",
+                [bucket, *parameters],
+            ).rowcount
+            connection.execute(
+                _UPSERT.format(
+                    source="SELECT bucket, key, size, etag, last_modified, "
+                    "parent FROM listing WHERE 1",
+                ),
+            )
+            connection.execute("DELETE FROM listing")
+            connection.execute(
+                "INSERT OR REPLACE INTO buckets VALUES (?, ?)",
+                [bucket, datetime.now(UTC).isoformat()],
+            )
+        return {"Added": added, "Changed": changed, "Removed": removed}
+
+    def upsert(
+        self,
+        bucket: str,
+        hcp_objects: Iterable[dict[str, Any]],
+    ) -> None:
+        """
+        Add or update objects in the index of `bucket`.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param hcp_objects:
+            The objects, with the keys `"Key"`, `"Size"`, `"ETag"` and
+            `"LastModified"`
+        :type hcp_objects: Iterable[dict[str, Any]]
+        """
+        with self._lock, self._connection as connection:
+            connection.executemany(
+                _UPSERT.format(source="VALUES (?, ?, ?, ?, ?, ?)"),
+                (_to_row(bucket, hcp_object) for hcp_object in hcp_objects),
+            )
+
+    def remove(self, bucket: str, keys: Iterable[str]) -> None:
+        """
+        Remove objects from the index of `bucket`.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param keys: The keys of the objects to be removed
+        :type keys: Iterable[str]
+        """
+        with self._lock, self._connection as connection:
+            connection.executemany(
+                "DELETE FROM objects WHERE bucket = ? AND key = ?",
+                ((bucket, key) for key in keys),
+            )
+
+    def enable_trigrams(self, bucket: str) -> None:
+        """
+        Build the trigram index of `bucket` from the indexed objects. Once
+        enabled, the trigram index is kept up to date by every refresh, upsert
+        and removal, and is used by :py:meth:`search_substring`. Requires an
+        SQLite library with the FTS5 trigram tokenizer, version 3.34 or later.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+        """
+        with self._lock, self._connection as connection:
+            connection.executescript(_TRIGRAM_SCHEMA)
+            if self._has_trigrams(connection, bucket):
+                return
+            connection.execute(
+                "INSERT INTO trigram_buckets VALUES (?)",
+                [bucket],
+            )
+            connection.execute(
+                "INSERT INTO trigrams (rowid, key) "
+                "SELECT id, key FROM objects WHERE bucket = ?",
+                [bucket],
+            )
+
+    @staticmethod
+    def _has_trigrams(connection: sqlite3.Connection, bucket: str) -> bool:
+        """
+        Predicate for checking if the trigram index of `bucket` is enabled.
+        """
+        return (
+            connection.execute(
+                "SELECT 1 FROM trigram_buckets WHERE bucket = ?",
+                [bucket],
+            ).fetchone()
+            is not None
+        )
+
+    def has_trigrams(self, bucket: str) -> bool:
+        """
+        Predicate for checking if the trigram index of `bucket` is enabled.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :rtype: bool
+        """
+        with self._lock:
+            return self._has_trigrams(self._connection, bucket)
+
+    def search_substring(
+        self,
+        bucket: str,
+        substring: str,
+        case_sensitive: bool = False,
+        prefix: str = "",
+    ) -> Generator[dict[str, Any], Any, None]:
+        """
+        Find every indexed object with a key that contains `substring`, in key
+        order. If the trigram index of `bucket` is enabled, only the keys that
+        contain the trigrams of `substring` are checked. Otherwise, or if
+        `substring` is shorter than three characters, every key is checked.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param substring: The substring to search for
+        :type substring: str
+
+        :param case_sensitive: Case sensitivity. Defaults to False
+        :type case_sensitive: bool, optional
+
+        :param prefix:
+            Only search among the keys starting with `prefix`. Defaults to the
+            empty string
+        :type prefix: str, optional
+
+        :yield: The objects with the keys `"Key"`, `"LastModified"`, `"Size"`
+            and `"ETag"`
+        :rtype: Generator[dict[str, Any], Any, None]
+        """
+        condition, parameters = self._prefix_condition(prefix)
+        with self._lock:
+            if len(substring) >= _TRIGRAM_LENGTH and self._has_trigrams(
+                self._connection,
+                bucket,
+            ):
+                # The LIKE pattern finds a superset of the matches, since the
+                # trigram index is case insensitive and "_" and "%" in
+                # `substring` act as wildcards. The exact check is made below
+                rows = self._connection.execute(
+                    "SELECT * FROM objects WHERE id IN ("  # noqa: S608
+                    "SELECT rowid FROM trigrams WHERE key LIKE ?"
+                    ") AND bucket = ? AND " + condition + " ORDER BY key",
+                    ["%" + substring + "%", bucket, *parameters],
+                ).fetchall()
+            else:
+                rows = self._connection.execute(
+                    "SELECT * FROM objects WHERE bucket = ? AND "  # noqa: S608
+                    + condition
+                    + " ORDER BY key",
+                    [bucket, *parameters],
+                ).fetchall()
+
+        if not case_sensitive:
+            substring = substring.lower()
+        for row in rows:
+            key = row["key"]
+            if substring in (key if case_sensitive else key.lower()):
+                yield _from_row(row)
+
+    def is_indexed(self, bucket: str) -> bool:
+        """
+        Predicate for checking if `bucket` has been refreshed at least once.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :rtype: bool
+        """
+        return self.get_refreshed_at(bucket) is not None
+
+    def get_refreshed_at(self, bucket: str) -> datetime | None:
+        """
+        Get the time of the latest refresh of `bucket`.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :return: The time of the latest refresh, or `None` if there is none
+        :rtype: datetime | None
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT refreshed_at FROM buckets WHERE bucket = ?",
+                [bucket],
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def get_objects(
+        self,
+        bucket: str,
+        keys: Iterable[str],
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Look up indexed objects by key.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param keys: The keys of the objects
+        :type keys: Iterable[str]
+
+        :return:
+            A dictionary from each indexed key to its object. Keys that are not
+            indexed are left out
+        :rtype: dict[str, dict[str, Any]]
+        """
+        with self._lock:
+            rows = [
+                self._connection.execute(
+                    "SELECT * FROM objects WHERE bucket = ? AND key = ?",
+                    [bucket, key],
+                ).fetchone()
+                for key in keys
+            ]
+        return {row["key"]: _from_row(row) for row in rows if row}
+
+    def list_objects(
+        self,
+        bucket: str,
+        prefix: str = "",
+    ) -> Generator[dict[str, Any], Any, None]:
+        """
+        List every indexed object with a key starting with `prefix`, in key
+        order.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param prefix: The key prefix. Defaults to the empty string
+        :type prefix: str, optional
+
+        :yield: The objects with the keys `"Key"`, `"LastModified"`, `"Size"`
+            and `"ETag"`
+        :rtype: Generator[dict[str, Any], Any, None]
+        """
+        condition, parameters = self._prefix_condition(prefix)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM objects WHERE bucket = ? AND "  # noqa: S608
+                + condition
+                + " ORDER BY key",
+                [bucket, *parameters],
+            ).fetchall()
+        for row in rows:
+            yield _from_row(row)
+
+    def list_level(
+        self,
+        bucket: str,
+        prefix: str = "",
+    ) -> tuple[list[str], list[dict[str, Any]]]:
+        """
+        List one level under `prefix` with "/" as delimiter, in the same way
+        as a delimited `list_objects_v2` request.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param prefix: The key prefix. Defaults to the empty string
+        :type prefix: str, optional
+
+        :return:
+            The subfolder keys and the objects directly under `prefix`, both in
+            key order
+        :rtype: tuple[list[str], list[dict[str, Any]]]
+        """
+        condition, parameters = self._prefix_condition(prefix)
+        parent = get_parent(prefix)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT * FROM objects WHERE bucket = ? AND parent = ? AND "  # noqa: S608
+                + condition
+                + " ORDER BY key",
+                [bucket, parent, *parameters],
+            ).fetchall()
+            parents = self._connection.execute(
+                "SELECT DISTINCT parent FROM objects WHERE bucket = ? AND "  # noqa: S608
+                + condition.replace("key", "parent")
+                + " AND parent != ?",
+                [bucket, *parameters, parent],
+            ).fetchall()
+        subfolders = {
+            prefix + row[0][len(prefix) :].split("/", 1)[0] + "/"
+            for row in parents
+        }
+        return sorted(subfolders), [_from_row(row) for row in rows]
+
+    def get_folder_size(self, bucket: str, prefix: str = "") -> dict[str, int]:
+        """
+        Get the total size and number of the indexed objects with a key
+        starting with `prefix`.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param prefix: The key prefix. Defaults to the empty string
+        :type prefix: str, optional
+
+        :return: A dictionary with the keys `"Size"` and `"ObjectCount"`
+        :rtype: dict[str, int]
+        """
+        condition, parameters = self._prefix_condition(prefix)
+        with self._lock:
+            size, count = self._connection.execute(
+                "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM objects "  # noqa: S608
+                "WHERE bucket = ? AND " + condition,
+                [bucket, *parameters],
+            ).fetchone()
+        return {"Size": size, "ObjectCount": count}
+
+    def get_subfolder_sizes(
+        self,
+        bucket: str,
+        prefix: str = "",
+    ) -> dict[str, dict[str, int]]:
+        """
+        Get the total size and number of objects of every subfolder directly
+        under `prefix`, including the objects in their own subfolders.
+
+        :param bucket: The name of the bucket
+        :type bucket: str
+
+        :param prefix: The key prefix. Defaults to the empty string
+        :type prefix: str, optional
+
+        :return:
+            A dictionary from each subfolder key to a dictionary with the keys
+            `"Size"` and `"ObjectCount"`, in key order
+        :rtype: dict[str, dict[str, int]]
+        """
+        condition, parameters = self._prefix_condition(prefix)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT parent, SUM(size), COUNT(*) FROM objects "  # noqa: S608
+                "WHERE bucket = ? AND " + condition + " GROUP BY parent",
+                [bucket, *parameters],
+            ).fetchall()
+        rollup: dict[str, dict[str, int]] = {}
+        for parent, size, count in rows:
+            rest = parent[len(prefix) :]
+            if not parent.startswith(prefix) or "/" not in rest:
+                continue
+            subfolder = prefix + rest.split("/", 1)[0] + "/"
+            totals = rollup.setdefault(subfolder, {"Size": 0, "ObjectCount": 0})
+            totals["Size"] += size
+            totals["ObjectCount"] += count
+        return dict(sorted(rollup.items()))
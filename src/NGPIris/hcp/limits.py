@@ -0,0 +1,210 @@
+from collections.abc import Generator
+from contextlib import AbstractContextManager, contextmanager
+from threading import Condition
+from time import monotonic
+
+# The number of seconds of bandwidth that can be used in a burst after the
+# transfers have been idle
+_BURST_SECONDS = 1.0
+
+
+class TokenBucket:
+    """
+    Class for limiting the rate at which bytes are transferred, shared by any
+    number of threads.
+
+    Every transferred byte takes a token, and tokens are added at the rate of
+    the limit. A transfer that takes more tokens than there are waits until
+    its debt has been paid, in the order that the transfers took their tokens.
+    A rate of 0 means that there is no limit.
+    """
+
+    def __init__(self, rate: int = 0) -> None:
+        """
+        Constructor for the `TokenBucket` class.
+
+        :param rate: The limit in bytes per second. Defaults to 0, no limit
+        :type rate: int, optional
+        """
+        self.rate = rate
+        self.tokens = float(rate * _BURST_SECONDS)
+        self._last_refill = monotonic()
+        self._condition = Condition()
+
+    def _refill(self) -> None:
+        """
+        Add the tokens since the last refill. Must be called while holding the
+        condition.
+        """
+        now = monotonic()
+        self.tokens = min(
+            self.tokens + (now - self._last_refill) * self.rate,
+            self.rate * _BURST_SECONDS,
+        )
+        self._last_refill = now
+
+    def set_rate(self, rate: int) -> None:
+        """
+        Change the limit. Transfers that are waiting when the limit is removed
+        continue right away.
+
+        :param rate: The limit in bytes per second, or 0 for no limit
+        :type rate: int
+        """
+        with self._condition:
+            self._refill()
+            self.rate = rate
+            self.tokens = min(self.tokens, rate * _BURST_SECONDS)
+            self._condition.notify_all()
+
+    def consume(self, nbytes: int) -> None:
+        """
+        Take the tokens of `nbytes` transferred bytes, waiting for as long as
+        the limit requires.
+
+        :param nbytes: The number of bytes
+        :type nbytes: int
+        """
+        with self._condition:
+            if not self.rate:
+                return
+            self._refill()
+            self.tokens -= nbytes
+            if self.tokens >= 0:
+                return
+            deadline = monotonic() - self.tokens / self.rate
+            while self.rate and (remaining := deadline - monotonic()) > 0:
+                self._condition.wait(remaining)
+
+
+class InflightBudget:
+    """
+    Class for limiting the number of bytes that are in flight at a time,
+    shared by any number of threads.
+
+    A reservation that does not fit waits until enough bytes have been
+    released. A reservation that is larger than the whole budget is let
+    through once nothing else is in flight, so that it cannot wait forever.
+    A limit of 0 means that there is no limit.
+    """
+
+    def __init__(self, limit: int = 0) -> None:
+        """
+        Constructor for the `InflightBudget` class.
+
+        :param limit: The limit in bytes. Defaults to 0, no limit
+        :type limit: int, optional
+        """
+        self.limit = limit
+        self.in_flight = 0
+        self._condition = Condition()
+
+    def set_limit(self, limit: int) -> None:
+        """
+        Change the limit. Waiting reservations are reconsidered right away.
+
+        :param limit: The limit in bytes, or 0 for no limit
+        :type limit: int
+        """
+        with self._condition:
+            self.limit = limit
+            self._condition.notify_all()
+
+    @contextmanager
+    def reserve(self, nbytes: int) -> Generator[None, None, None]:
+        """
+        Reserve `nbytes` bytes of the budget for as long as the context is
+        entered.
+
+        :param nbytes: The number of bytes
+        :type nbytes: int
+        """
+        with self._condition:
+            while (
+                self.limit
+                and self.in_flight
+                and self.in_flight + nbytes > self.limit
+            ):
+                self._condition.wait()
+            self.in_flight += nbytes
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= nbytes
+                self._condition.notify_all()
+
+
+class TransferLimiter:
+    """
+    Class for the bandwidth limit and the in-flight byte budget that the
+    transfers of every `HCPHandler` in the process share, see
+    :py:data:`transfer_limiter`.
+    """
+
+    def __init__(self) -> None:
+        """
+        Constructor for the `TransferLimiter` class, without any limits.
+        """
+        self.bandwidth = TokenBucket()
+        self.inflight = InflightBudget()
+
+    def set_limits(
+        self,
+        max_bandwidth: int | None = None,
+        max_inflight: int | None = None,
+    ) -> None:
+        """
+        Change the limits of every transfer in the process, including the
+        transfers that are running.
+
+        :param max_bandwidth:
+            The most bytes per second that are transferred, or 0 for no limit.
+            Defaults to None, which leaves the limit as it is
+        :type max_bandwidth: int | None, optional
+
+        :param max_inflight:
+            The most bytes that are in flight at a time, or 0 for no limit.
+            Defaults to None, which leaves the limit as it is
+        :type max_inflight: int | None, optional
+        """
+        if max_bandwidth is not None:
+            self.bandwidth.set_rate(max_bandwidth)
+        if max_inflight is not None:
+            self.inflight.set_limit(max_inflight)
+
+    def get_limits(self) -> dict[str, int]:
+        """
+        Get the current limits, where 0 means no limit.
+
+        :return: A dictionary with the limits in bytes (per second)
+        :rtype: dict[str, int]
+        """
+        return {
+            "MaxBandwidth": self.bandwidth.rate,
+            "MaxInflight": self.inflight.limit,
+        }
+
+    def throttle(self, nbytes: int) -> None:
+        """
+        Wait for as long as the bandwidth limit requires after `nbytes` bytes
+        have been transferred.
+
+        :param nbytes: The number of bytes
+        :type nbytes: int
+        """
+        self.bandwidth.consume(nbytes)
+
+    def reserve(self, nbytes: int) -> AbstractContextManager[None]:
+        """
+        Reserve `nbytes` bytes of the in-flight budget for as long as the
+        returned context is entered.
+
+        :param nbytes: The number of bytes
+        :type nbytes: int
+        """
+        return self.inflight.reserve(nbytes)
+
+
+# The limiter that every transfer in the process goes through
+transfer_limiter = TransferLimiter()
@@ -0,0 +1,285 @@
+import io
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any
+
+from NGPIris.hcp.limits import TransferLimiter
+
+_MB = 1024 * 1024
+
+# The size of the ranges that are requested. Large enough that sequential
+# reads take few round trips, small enough that reading a header is cheap
+DEFAULT_BLOCK_SIZE = 4 * _MB
+
+# The number of blocks that are kept in memory
+DEFAULT_CACHE_BLOCKS = 16
+
+# The number of blocks that are requested ahead of sequential reads
+DEFAULT_PREFETCH = 2
+
+
+class ObjectReader(io.RawIOBase):
+    """
+    Class for reading an object in the HCP as a seekable, read-only binary
+    file, see :py:meth:`NGPIris.hcp.hcp.HCPHandler.open`.
+
+    The object is read in blocks with ranged GET requests, and the blocks are
+    kept in an LRU cache. When the blocks are read in order, the next blocks
+    are requested in the background before they are needed, so that sequential
+    reads mostly wait for memory rather than for the network. Every range is
+    requested with `If-Match`, so that an object that is replaced while it is
+    read fails rather than mixes two versions.
+
+    Each block goes through the bandwidth limit of the process, see
+    :py:class:`NGPIris.hcp.limits.TransferLimiter`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        s3_client: Any,  # noqa: ANN401
+        bucket_name: str,
+        key: str,
+        size: int,
+        etag: str,
+        *,
+        transfer_limiter: TransferLimiter,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+        prefetch: int = DEFAULT_PREFETCH,
+    ) -> None:
+        """
+        Constructor for the `ObjectReader` class.
+
+        :param s3_client: The S3 client to make the requests with
+        :type s3_client: Any
+
+        :param bucket_name: The bucket of the object
+        :type bucket_name: str
+
+        :param key: The object name
+        :type key: str
+
+        :param size: The size of the object in bytes
+        :type size: int
+
+        :param etag: The ETag of the object, which every range must match
+        :type etag: str
+
+        :param transfer_limiter: The limiter that the blocks go through
+        :type transfer_limiter: TransferLimiter
+
+        :param block_size:
+            The size of each ranged request in bytes. Defaults to 4 MiB
+        :type block_size: int, optional
+
+        :param cache_blocks:
+            The number of blocks that are kept in memory. It is raised to fit
+            the prefetched blocks. Defaults to 16
+        :type cache_blocks: int, optional
+
+        :param prefetch:
+            The number of blocks that are requested ahead of sequential reads,
+            or 0 for no read-ahead. Defaults to 2
+        :type prefetch: int, optional
+
+        :raises ValueError: If `block_size` is not positive
+        """
+        super().__init__()
+        if block_size <= 0:
+            msg = "The block size must be positive"
+            raise ValueError(msg)
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.name = key
+        self.size = size
+        self.etag = etag
+        self.transfer_limiter = transfer_limiter
+        self.block_size = block_size
+        self.prefetch = max(prefetch, 0)
+        self.cache_blocks = max(cache_blocks, self.prefetch + 1)
+        self._position = 0
+        self._last_block = -1
+        self._blocks: OrderedDict[int, Future[bytes]] = OrderedDict()
+        self._lock = Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(self.prefetch, 1),
+            thread_name_prefix="ObjectReader",
+        )
+
+    @property
+    def mode(self) -> str:
+        """
+        The mode of the reader, which is always `"rb"`.
+        """
+        return "rb"
+
+    def readable(self) -> bool:
+        """
+        :return: True, unless the reader is closed
+        :rtype: bool
+        """
+        self._check_closed()
+        return True
+
+    def seekable(self) -> bool:
+        """
+        :return: True, unless the reader is closed
+        :rtype: bool
+        """
+        self._check_closed()
+        return True
+
+    def tell(self) -> int:
+        """
+        :return: The current position in the object
+        :rtype: int
+        """
+        self._check_closed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """
+        Change the position in the object. Seeking does not make any requests,
+        and seeking beyond the end is allowed, after which reads return no
+        bytes.
+
+        :param offset: The offset relative to `whence`
+        :type offset: int
+
+        :param whence:
+            `io.SEEK_SET`, `io.SEEK_CUR` or `io.SEEK_END`. Defaults to
+            `io.SEEK_SET`
+        :type whence: int, optional
+
+        :raises ValueError: If the new position would be negative
+
+        :return: The new position
+        :rtype: int
+        """
+        self._check_closed()
+        match whence:
+            case io.SEEK_SET:
+                position = offset
+            case io.SEEK_CUR:
+                position = self._position + offset
+            case io.SEEK_END:
+                position = self.size + offset
+            case _:
+                msg = "Invalid whence (" + str(whence) + ")"
+                raise ValueError(msg)
+        if position < 0:
+            msg = "Negative seek position " + str(position)
+            raise ValueError(msg)
+        self._position = position
+        return position
+
+    def readinto(self, buffer: Any) -> int:  # noqa: ANN401
+        """
+        Read bytes into a pre-allocated, writable bytes-like object.
+
+        :param buffer: The object to read into
+        :type buffer: Any
+
+        :return: The number of bytes read, which is 0 at the end of the object
+        :rtype: int
+        """
+        self._check_closed()
+        view = memoryview(buffer).cast("B")
+        bytes_read = 0
+        while bytes_read < len(view) and self._position < self.size:
+            block_index, block_offset = divmod(
+                self._position,
+                self.block_size,
+            )
+            block = self._get_block(block_index)
+            n = min(len(view) - bytes_read, len(block) - block_offset)
+            view[bytes_read : bytes_read + n] = block[
+                block_offset : block_offset + n
+            ]
+            bytes_read += n
+            self._position += n
+        return bytes_read
+
+    def readall(self) -> bytes:
+        """
+        Read from the current position to the end of the object.
+
+        :return: The bytes that were read
+        :rtype: bytes
+        """
+        buffer = bytearray(max(self.size - self._position, 0))
+        return bytes(buffer[: self.readinto(buffer)])
+
+    def close(self) -> None:
+        """
+        Close the reader, which cancels the blocks that are being prefetched
+        and empties the cache.
+        """
+        if not self.closed:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            with self._lock:
+                self._blocks.clear()
+        super().close()
+
+    def _check_closed(self) -> None:
+        """
+        Raise `ValueError` if the reader is closed, like other file objects.
+        """
+        if self.closed:
+            msg = "I/O operation on closed file"
+            raise ValueError(msg)
+
+    def _fetch_block(self, block_index: int) -> bytes:
+        """
+        Request one block of the object.
+        """
+        first_byte = block_index * self.block_size
+        last_byte = min(first_byte + self.block_size, self.size) - 1
+        response: dict = self.s3_client.get_object(
+            Bucket=self.bucket_name,
+            Key=self.name,
+            Range="bytes=" + str(first_byte) + "-" + str(last_byte),
+            IfMatch=self.etag,
+        )
+        block = response["Body"].read()
+        self.transfer_limiter.throttle(len(block))
+        return block
+
+    def _schedule(self, block_index: int) -> Future[bytes]:
+        """
+        Get the future of a block, requesting the block if it is not cached.
+        Must be called while holding the lock.
+        """
+        future = self._blocks.get(block_index)
+        # A block that failed or was cancelled is requested again
+        if future is not None and (
+            not future.done()
+            or (not future.cancelled() and future.exception() is None)
+        ):
+            self._blocks.move_to_end(block_index)
+            return future
+
+        future = self._executor.submit(self._fetch_block, block_index)
+        self._blocks[block_index] = future
+        while len(self._blocks) > self.cache_blocks:
+            _, evicted = self._blocks.popitem(last=False)
+            evicted.cancel()
+        return future
+
+    def _get_block(self, block_index: int) -> bytes:
+        """
+        Get one block, from the cache if possible, and request the following
+        blocks if the blocks are read in order.
+        """
+        last_block_index = -(-self.size // self.block_size) - 1  # Ceiling
+        with self._lock:
+            future = self._schedule(block_index)
+            if block_index in {self._last_block, self._last_block + 1}:
+                for next_block_index in range(
+                    block_index + 1,
+                    min(block_index + self.prefetch, last_block_index) + 1,
+                ):
+                    self._schedule(next_block_index)
+            self._last_block = block_index
+        return future.result()
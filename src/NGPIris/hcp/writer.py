@@ -0,0 +1,302 @@
+import io
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from threading import BoundedSemaphore
+from types import TracebackType
+from typing import Any
+
+from botocore.exceptions import ClientError
+
+from NGPIris.hcp.limits import TransferLimiter
+
+_MB = 1024 * 1024
+
+# Every part apart from the last one must be at least 5 MiB
+MIN_PART_SIZE = 5 * _MB
+
+# The number of parts that are kept in memory, one of which is being written
+# while the others are uploaded
+DEFAULT_MAX_BUFFERS = 4
+
+# The most parts that one multipart upload can consist of
+_MAX_PARTS = 10_000
+
+
+class ObjectWriter(io.RawIOBase):
+    """
+    Class for writing an object to the HCP as a write-only binary file, see
+    :py:meth:`NGPIris.hcp.hcp.HCPHandler.open`.
+
+    The written bytes are collected in parts, and every full part is uploaded
+    in the background while the next part is written, as a multipart upload.
+    At most `max_buffers` parts are kept in memory, so that a producer that is
+    faster than the upload waits for a part to finish rather than fill the
+    memory. Nothing has to be staged on disk, and the size of the object does
+    not have to be known up front. An object that is smaller than one part is
+    uploaded with a single request when the writer is closed.
+
+    The object only appears once the writer is closed. If the writer is left
+    by an exception, or :py:meth:`abort` is called, the upload is aborted
+    instead. Since the parts have a fixed size, an object can be at most
+    10,000 parts.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        s3_client: Any,  # noqa: ANN401
+        bucket_name: str,
+        key: str,
+        transfer_limiter: TransferLimiter,
+        part_size: int,
+        *,
+        max_buffers: int = DEFAULT_MAX_BUFFERS,
+        callback: Callable[[int], None] | None = None,
+        extra_args: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Constructor for the `ObjectWriter` class.
+
+        :param s3_client: The S3 client to make the requests with
+        :type s3_client: Any
+
+        :param bucket_name: The bucket of the object
+        :type bucket_name: str
+
+        :param key: The object name
+        :type key: str
+
+        :param transfer_limiter:
+            The limiter whose in-flight budget the parts are reserved in
+        :type transfer_limiter: TransferLimiter
+
+        :param part_size:
+            The size of each part in bytes. It is raised to 5 MiB if smaller
+        :type part_size: int
+
+        :param max_buffers:
+            The number of parts that are kept in memory, which also bounds the
+            number of parts that are uploaded at the same time to one less.
+            Defaults to 4
+        :type max_buffers: int, optional
+
+        :param callback:
+            Function that is called with the number of bytes of every uploaded
+            part, such as the transfer callback of the handler, which updates
+            a progress bar and applies the bandwidth limit. Defaults to None
+        :type callback: Callable[[int], None] | None, optional
+
+        :param extra_args:
+            Extra arguments for the request that creates the object, such as
+            `{"Metadata": {...}}`. Defaults to None
+        :type extra_args: dict[str, Any] | None, optional
+        """
+        super().__init__()
+        self.s3_client = s3_client
+        self.bucket_name = bucket_name
+        self.name = key
+        self.transfer_limiter = transfer_limiter
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self.max_buffers = max(max_buffers, 2)
+        self.callback = callback
+        self.extra_args = extra_args or {}
+        self.upload_id: str | None = None
+        self._position = 0
+        self._buffer = bytearray()
+        self._buffers = BoundedSemaphore(self.max_buffers - 1)
+        self._parts: list[Future[dict[str, Any]]] = []
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_buffers - 1,
+            thread_name_prefix="ObjectWriter",
+        )
+
+    @property
+    def mode(self) -> str:
+        """
+        The mode of the writer, which is always `"wb"`.
+        """
+        return "wb"
+
+    def writable(self) -> bool:
+        """
+        :return: True, unless the writer is closed
+        :rtype: bool
+        """
+        self._check_closed()
+        return True
+
+    def tell(self) -> int:
+        """
+        :return: The number of bytes that have been written
+        :rtype: int
+        """
+        self._check_closed()
+        return self._position
+
+    def write(self, data: Any) -> int:  # noqa: ANN401
+        """
+        Write a bytes-like object. Waits while `max_buffers` parts are in
+        memory.
+
+        :param data: The bytes to write
+        :type data: Any
+
+        :raises Exception: The exception of a part that failed to upload
+
+        :return: The number of bytes written, which is all of them
+        :rtype: int
+        """
+        self._check_closed()
+        view = memoryview(data).cast("B")
+        written = 0
+        while written < len(view):
+            n = min(len(view) - written, self.part_size - len(self._buffer))
+            self._buffer += view[written : written + n]
+            written += n
+            if len(self._buffer) == self.part_size:
+                self._upload_buffer()
+        self._position += written
+        return written
+
+    def close(self) -> None:
+        """
+        Upload the last part and complete the upload, which makes the object
+        appear in the bucket. If the upload fails, it is aborted.
+
+        :raises Exception: The exception of a part that failed to upload
+        """
+        if self.closed:
+            return
+        try:
+            if self.upload_id is None:
+                body = bytes(self._buffer)
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=self.name,
+                    Body=body,
+                    **self.extra_args,
+                )
+                if self.callback is not None:
+                    self.callback(len(body))
+            else:
+                if self._buffer:
+                    self._upload_buffer()
+                parts = [part.result() for part in self._parts]
+                self.s3_client.complete_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=self.name,
+                    UploadId=self.upload_id,
+                    MultipartUpload={"Parts": parts},
+                )
+        except BaseException:
+            self.abort()
+            raise
+        self._buffer = bytearray()
+        self._executor.shutdown()
+        super().close()
+
+    def abort(self) -> None:
+        """
+        Close the writer without creating the object, and abort the upload of
+        the parts.
+        """
+        if self.closed:
+            return
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self.upload_id is not None:
+            with suppress(ClientError):
+                self.s3_client.abort_multipart_upload(
+                    Bucket=self.bucket_name,
+                    Key=self.name,
+                    UploadId=self.upload_id,
+                )
+        self._buffer = bytearray()
+        super().close()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """
+        Close the writer, or abort the upload if the context is left by an
+        exception, so that a partial object is never created.
+        """
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __del__(self) -> None:
+        """
+        Abort the upload of a writer that was never closed, rather than create
+        an object that may be incomplete.
+        """
+        with suppress(Exception):
+            self.abort()
+
+    def _check_closed(self) -> None:
+        """
+        Raise `ValueError` if the writer is closed, like other file objects.
+        """
+        if self.closed:
+            msg = "I/O operation on closed file"
+            raise ValueError(msg)
+
+    def _upload_buffer(self) -> None:
+        """
+        Hand the buffer over to be uploaded as the next part, waiting for a
+        free buffer first.
+        """
+        # A part that failed stops the upload as soon as possible
+        for part in self._parts:
+            if part.done() and part.exception() is not None:
+                part.result()
+        if len(self._parts) == _MAX_PARTS:
+            msg = (
+                "The object is larger than 10,000 parts of "
+                + str(self.part_size)
+                + " bytes. Use a larger part size"
+            )
+            raise ValueError(msg)
+        if self.upload_id is None:
+            self.upload_id = self.s3_client.create_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.name,
+                **self.extra_args,
+            )["UploadId"]
+
+        body = bytes(self._buffer)
+        self._buffer = bytearray()
+        self._buffers.acquire()
+        try:
+            self._parts.append(
+                self._executor.submit(
+                    self._upload_part,
+                    len(self._parts) + 1,
+                    body,
+                ),
+            )
+        except BaseException:
+            self._buffers.release()
+            raise
+
+    def _upload_part(self, part_number: int, body: bytes) -> dict[str, Any]:
+        """
+        Upload one part and release its buffer.
+        """
+        try:
+            with self.transfer_limiter.reserve(len(body)):
+                response = self.s3_client.upload_part(
+                    Bucket=self.bucket_name,
+                    Key=self.name,
+                    UploadId=self.upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+            if self.callback is not None:
+                self.callback(len(body))
+            return {"PartNumber": part_number, "ETag": response["ETag"]}
+        finally:
+            self._buffers.release()
@@ -0,0 +1,221 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Generator
+from filecmp import cmp
+from pathlib import Path
+from typing import Any
+
+from conftest import CustomConfig
+from pytest import fail, fixture, importorskip
+
+importorskip("aiobotocore")
+
+from NGPIris.hcp.async_hcp import AsyncHCPHandler
+
+# ruff: noqa: S101, D103, E722, PT013, INP001
+
+# --------------------------- Constants ---------------------------
+
+# Credentials for the local S3 stand-in, which accepts any of them
+MOTO_CREDENTIALS = {
+    "endpoint": "moto.ngp-fs1000.vgregion.se",
+    "aws_access_key_id": "moto",
+    "aws_secret_access_key": "moto",
+}
+
+MOTO_BUCKET = "moto-bucket"
+
+_MB = 1024 * 1024
+
+# --------------------------- Fixtures ---------------------------------------
+
+
+@fixture(scope="module")
+def moto_endpoint_url() -> Generator[str, Any, None]:
+    """Start a local S3 stand-in with an empty test bucket."""
+    moto_server = importorskip("moto.server")
+    boto3 = importorskip("boto3")
+    server = moto_server.ThreadedMotoServer(
+        ip_address="127.0.0.1",
+        port=0,
+        verbose=False,
+    )
+    server.start()
+    host, port = server.get_host_and_port()
+    endpoint_url = "http://" + host + ":" + str(port)
+    boto3.client(
+        "s3",
+        endpoint_url=endpoint_url,
+        region_name="us-east-1",
+        aws_access_key_id=MOTO_CREDENTIALS["aws_access_key_id"],
+        aws_secret_access_key=MOTO_CREDENTIALS["aws_secret_access_key"],
+    ).create_bucket(Bucket=MOTO_BUCKET)
+    yield endpoint_url
+    server.stop()
+
+
+# --------------------------- Helper functions ---------------------------------
+
+
+def _run(
+    custom_config: CustomConfig,
+    test: Callable[[AsyncHCPHandler], Awaitable[Any]],
+    mount: bool = True,
+) -> Any:  # noqa: ANN401
+    async def _with_handler() -> Any:  # noqa: ANN401
+        async with AsyncHCPHandler(
+            custom_config.parser.get("General", "credentials_path"),
+        ) as hcp_h:
+            if mount:
+                await hcp_h.mount_bucket(custom_config.test_bucket)
+            return await test(hcp_h)
+
+    return asyncio.run(_with_handler())
+
+
+def _run_on_moto(
+    endpoint_url: str,
+    test: Callable[[AsyncHCPHandler], Awaitable[Any]],
+) -> Any:  # noqa: ANN401
+    async def _with_handler() -> Any:  # noqa: ANN401
+        async with AsyncHCPHandler(
+            MOTO_CREDENTIALS,
+            endpoint_url=endpoint_url,
+            use_mapi_cache=False,
+        ) as hcp_h:
+            await hcp_h.mount_bucket(MOTO_BUCKET)
+            # Small enough parts for the multipart path with small test files
+            hcp_h.transfer_config.multipart_threshold = 5 * _MB
+            hcp_h.transfer_config.multipart_chunksize = 5 * _MB
+            return await test(hcp_h)
+
+    return asyncio.run(_with_handler())
+
+
+# --------------------------- Test suite ---------------------------------------
+
+
+# get_users
+def test_get_users(custom_config: CustomConfig) -> None:
+    async def _test(hcp_h: AsyncHCPHandler) -> None:
+        assert isinstance(await hcp_h.get_users(), list)
+
+    _run(custom_config, _test, mount=False)
+
+
+# list_buckets
+def test_list_buckets(custom_config: CustomConfig) -> None:
+    async def _test(hcp_h: AsyncHCPHandler) -> None:
+        bucket_names = [
+            bucket["Bucket"] for bucket in await hcp_h.list_buckets()
+        ]
+        assert custom_config.test_bucket in bucket_names
+
+    _run(custom_config, _test, mount=False)
+
+
+# upload_file, stat and download_file
+def test_upload_stat_and_download_file(custom_config: CustomConfig) -> None:
+    test_file = Path(custom_config.test_file_path)
+    key = "async_" + test_file.name
+    result_file = Path(custom_config.result_path) / key
+    test_file_size = test_file.stat().st_size
+
+    async def _test(hcp_h: AsyncHCPHandler) -> None:
+        await hcp_h.upload_file(custom_config.test_file_path, key)
+        assert (await hcp_h.stat(key))["Size"] == test_file_size
+        await hcp_h.download_file(key, result_file.as_posix())
+        assert cmp(result_file, test_file, shallow=False)
+        await hcp_h.delete_object(key)
+        assert not await hcp_h.object_exists(key)
+
+    _run(custom_config, _test)
+
+
+# stat_many
+def test_stat_many(custom_config: CustomConfig) -> None:
+    async def _test(hcp_h: AsyncHCPHandler) -> None:
+        keys = [hcp_object["Key"] async for hcp_object in hcp_h.list_objects()]
+        stats = await hcp_h.stat_many([*keys, "anObjectThatDoesNotExist"])
+        assert stats["anObjectThatDoesNotExist"] is None
+        assert all(stats[key] for key in keys)
+
+    _run(custom_config, _test)
+
+
+# upload_folder and delete_folder
+def test_upload_and_delete_folder(custom_config: CustomConfig) -> None:
+    async def _test(hcp_h: AsyncHCPHandler) -> None:
+        results = await hcp_h.upload_folder("tests/data/", "async_data/")
+        assert all(not result["Error"] for result in results)
+        deleted = await hcp_h.delete_folder("async_data/", recursive=True)
+        assert deleted["ErrorCount"] == 0
+
+    _run(custom_config, _test)
+
+
+def test_stat_without_mounting(custom_config: CustomConfig) -> None:
+    async def _test(hcp_h: AsyncHCPHandler) -> None:
+        try:
+            await hcp_h.stat(Path(custom_config.test_file_path).name)
+        except:
+            assert True
+        else:  # pragma: no cover
+            fail("Test failed")
+
+    _run(custom_config, _test, mount=False)
+
+
+# ---------------------------- Local S3 stand-in tests ------------------------
+# upload_file, list_objects, stat, download_file and delete_object
+def test_file_round_trip_on_moto(
+    moto_endpoint_url: str,
+    tmp_path: Path,
+) -> None:
+    test_file = tmp_path / "a_file"
+    test_file.write_bytes(bytes(range(256)) * (11 * _MB // 256))
+    result_file = tmp_path / "a_result_file"
+    key = "a_folder/a_file"
+
+    async def _test(hcp_h: AsyncHCPHandler) -> None:
+        await hcp_h.upload_file(test_file.as_posix(), key)
+        keys = [
+            hcp_object["Key"]
+            async for hcp_object in hcp_h.list_objects(
+                "a_folder/",
+                files_only=True,
+            )
+        ]
+        assert keys == [key]
+        assert (await hcp_h.stat(key))["Size"] == test_file.stat().st_size
+        await hcp_h.download_file(key, result_file.as_posix())
+        assert cmp(result_file, test_file, shallow=False)
+        await hcp_h.delete_object(key)
+        assert not await hcp_h.object_exists(key)
+
+    _run_on_moto(moto_endpoint_url, _test)
+
+
+# upload_folder, stat_many and delete_folder
+def test_folder_round_trip_on_moto(
+    moto_endpoint_url: str,
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "small_file").write_bytes(b"data")
+    (tmp_path / "sub" / "large_file").write_bytes(b"\0" * (6 * _MB))
+    keys = ["moto_folder/small_file", "moto_folder/sub/large_file"]
+
+    async def _test(hcp_h: AsyncHCPHandler) -> None:
+        results = await hcp_h.upload_folder(
+            tmp_path.as_posix() + "/",
+            "moto_folder/",
+        )
+        assert sorted(result["Key"] for result in results) == keys
+        assert all(not result["Error"] for result in results)
+        stats = await hcp_h.stat_many(keys)
+        assert stats[keys[1]]["Size"] == 6 * _MB
+        deleted = await hcp_h.delete_folder("moto_folder/", recursive=True)
+        assert deleted["ErrorCount"] == 0
+        assert not any((await hcp_h.stat_many(keys)).values())
+
+    _run_on_moto(moto_endpoint_url, _test)
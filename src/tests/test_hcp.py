@@ -1,12 +1,33 @@
 from collections.abc import Callable
 from filecmp import cmp
+from hashlib import sha256
+from io import SEEK_END
+from json import dumps, loads
+from pathlib import Path
 from typing import Any
 
+from bitmath import Byte
+from boto3.s3.transfer import TransferConfig
 from conftest import CustomConfig
 from icecream import ic
 from pytest import fail
 
 from NGPIris import HCPHandler
+from NGPIris.hcp.autotune import TransferTuner
+from NGPIris.hcp.cache import MAPICache
+from NGPIris.hcp.checkpoint import (
+    CHECKPOINT_SUFFIX,
+    UPLOAD_SUFFIX,
+    UploadCheckpoint,
+)
+from NGPIris.hcp.checksum import MANIFEST_SUFFIX
+from NGPIris.hcp.exceptions import (
+    DownloadLimitReachedError,
+    NoBucketIndexError,
+    ObjectDoesNotExistError,
+    SourceIsDestinationError,
+)
+from NGPIris.hcp.index import BucketIndex
 
 # ruff: noqa: S101, D103, E722, PT013, INP001
 
@@ -14,6 +35,8 @@ from NGPIris import HCPHandler
 
 SUBDIR = "a_sub_directory"
 
+_MB = 1024 * 1024
+
 # --------------------------- Helper functions ---------------------------------
 
 
@@ -56,6 +79,45 @@ def test_is_user_admin(custom_config: CustomConfig) -> None:
     assert is_admin or is_not_admin
 
 
+# get_MAPI_request
+def test_get_MAPI_request_cached(custom_config: CustomConfig) -> None:
+    response = custom_config.hcp_h.get_MAPI_request("/userAccounts")
+    assert custom_config.hcp_h.get_MAPI_request("/userAccounts") == response
+    assert (
+        custom_config.hcp_h.get_MAPI_request("/userAccounts", use_cache=False)
+        == response
+    )
+
+
+# invalidate_MAPI_cache
+def test_invalidate_MAPI_cache(custom_config: CustomConfig) -> None:
+    custom_config.hcp_h.get_MAPI_request("/userAccounts")
+    custom_config.hcp_h.invalidate_MAPI_cache("/userAccounts")
+    assert (
+        custom_config.hcp_h.mapi_cache.get(
+            custom_config.hcp_h._get_MAPI_cache_key("/userAccounts"),  # noqa: SLF001
+        )
+        is None
+    )
+
+
+def test_MAPI_cache_shared_file(custom_config: CustomConfig) -> None:
+    cache_path = custom_config.result_path + "mapi_cache.json"
+    first_cache = MAPICache(cache_path)
+    second_cache = MAPICache(cache_path)
+    first_cache.set("/first", 1, "users")
+    second_cache.set("/second", 2, "users")
+    first_cache.invalidate("/first")
+    second_cache.set("/third", 3, "users")
+
+    cache = MAPICache(cache_path)
+    assert cache.get("/first") is None
+    assert cache.get("/second") == 2  # noqa: PLR2004
+    assert cache.get("/third") == 3  # noqa: PLR2004
+    Path(cache_path).unlink()
+    Path(cache_path + ".lock").unlink()
+
+
 # ---------------------------- Util methods tests ----------------------------
 # test_connection
 def test_test_connection(custom_config: CustomConfig) -> None:
@@ -87,6 +149,26 @@ def test_mount_nonexisting_bucket(custom_config: CustomConfig) -> None:
         fail("Test failed")
 
 
+# bucket
+def test_bucket(custom_config: CustomConfig) -> None:
+    hcp_h = custom_config.hcp_h
+    mounted_bucket = hcp_h.bucket_name
+    bucket = hcp_h.bucket(custom_config.test_bucket)
+    assert bucket.bucket_name == custom_config.test_bucket
+    assert bucket.s3_client is hcp_h.s3_client
+    assert hcp_h.bucket(custom_config.test_bucket) is not bucket
+    assert hcp_h.bucket_name == mounted_bucket
+
+
+def test_bucket_nonexisting(custom_config: CustomConfig) -> None:
+    try:
+        custom_config.hcp_h.bucket("aBucketThatDoesNotExist")
+    except:
+        assert True
+    else:  # pragma: no cover
+        fail("Test failed")
+
+
 # create_bucket
 def test_create_bucket(custom_config: CustomConfig) -> None:
     custom_config.hcp_h.create_bucket(custom_config.test_bucket + "2")
@@ -102,6 +184,18 @@ def test_list_buckets(custom_config: CustomConfig) -> None:
     assert custom_config.hcp_h.list_buckets()
 
 
+def test_list_buckets_output_modes(custom_config: CustomConfig) -> None:
+    bucket_names = [
+        bucket["Bucket"]
+        for bucket in custom_config.hcp_h.list_buckets(
+            HCPHandler.ListBucketsOutputMode.BUCKET_ONLY,
+        )
+    ]
+    for mode in HCPHandler.ListBucketsOutputMode:
+        buckets = custom_config.hcp_h.list_buckets(mode, max_workers=4)
+        assert [bucket["Bucket"] for bucket in buckets] == bucket_names
+
+
 # ---------------------------- Object methods tests ----------------------------
 # list_objects
 def test_list_objects(custom_config: CustomConfig) -> None:
@@ -114,6 +208,33 @@ def test_list_objects_without_mounting(custom_config: CustomConfig) -> None:
     _without_mounting(_hcp_h, HCPHandler.list_objects)
 
 
+# list_objects_parallel
+def test_list_objects_parallel(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        SUBDIR + "/another_dir/a_file",
+    )
+    keys = [
+        hcp_object["Key"]
+        for hcp_object in custom_config.hcp_h.list_objects_parallel(
+            SUBDIR + "/",
+            files_only=True,
+            parallel=4,
+            sort_output=True,
+        )
+    ]
+    assert keys == [SUBDIR + "/another_dir/a_file"]
+    custom_config.hcp_h.delete_object(SUBDIR + "/another_dir/a_file")
+
+
+def test_list_objects_parallel_without_mounting(
+    custom_config: CustomConfig,
+) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.list_objects_parallel)
+
+
 # upload_file
 def test_upload_file(custom_config: CustomConfig) -> None:
     test_mount_bucket(custom_config)
@@ -156,6 +277,149 @@ def test_upload_file(custom_config: CustomConfig) -> None:
         custom_config.hcp_h.delete_object(key)
 
 
+def test_upload_file_resume(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1]
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+        upload_mode=HCPHandler.UploadMode.EQUAL_PARTS,
+        resume=True,
+    )
+    custom_config.hcp_h.download_file(
+        key,
+        custom_config.result_path + "resumed_upload",
+    )
+    assert cmp(
+        custom_config.result_path + "resumed_upload",
+        custom_config.test_file_path,
+    )
+    assert not Path(
+        str(custom_config.test_file_path) + ".upload.checkpoint",
+    ).exists()
+    assert not list(custom_config.hcp_h.list_multipart_uploads(key))
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_upload_file_resume_interrupted(
+    custom_config: CustomConfig,
+    tmp_path: Path,
+) -> None:
+    test_mount_bucket(custom_config)
+    hcp_h = custom_config.hcp_h
+    bucket = str(hcp_h.bucket_name)
+    key = "interrupted_upload"
+    part_size = 5 * _MB
+    local_file = tmp_path / key
+    size = max(3 * part_size, hcp_h.transfer_config.multipart_threshold)
+    local_file.write_bytes(bytes(range(256)) * (size // 256))
+    data = local_file.read_bytes()
+    part_count = -(-len(data) // part_size)  # Ceiling
+
+    # Seed a checkpoint as if an earlier upload stopped after the first part
+    upload_id = hcp_h.s3_client.create_multipart_upload(
+        Bucket=bucket,
+        Key=key,
+    )["UploadId"]
+    checkpoint_path = str(local_file) + UPLOAD_SUFFIX + CHECKPOINT_SUFFIX
+    checkpoint = UploadCheckpoint(checkpoint_path)
+    checkpoint.reset(
+        bucket,
+        key,
+        size=len(data),
+        modified_ns=local_file.stat().st_mtime_ns,
+        part_size=part_size,
+        upload_id=upload_id,
+    )
+    response = hcp_h.s3_client.upload_part(
+        Bucket=bucket,
+        Key=key,
+        UploadId=upload_id,
+        PartNumber=1,
+        Body=data[:part_size],
+    )
+    checkpoint.add(1, response["ETag"])
+
+    sent_part_numbers = []
+
+    def record_part(params: dict[str, Any], **_: object) -> None:
+        sent_part_numbers.append(params["PartNumber"])
+
+    event_name = "before-parameter-build.s3.UploadPart"
+    hcp_h.s3_client.meta.events.register(event_name, record_part)
+    try:
+        hcp_h.upload_file(str(local_file), key, resume=True)
+    finally:
+        hcp_h.s3_client.meta.events.unregister(event_name, record_part)
+
+    assert sorted(sent_part_numbers) == list(range(2, part_count + 1))
+    hcp_h.download_file(key, custom_config.result_path + key)
+    assert cmp(custom_config.result_path + key, local_file)
+    assert not Path(checkpoint_path).exists()
+    assert not list(hcp_h.list_multipart_uploads(key))
+    hcp_h.delete_object(key)
+
+
+def test_upload_file_autotune(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    hcp_h = custom_config.hcp_h
+    hcp_h.transfer_tuner = TransferTuner(
+        hcp_h.endpoint,
+        custom_config.result_path + "autotune.json",
+        hcp_h.transfer_config,
+    )
+    key = str(custom_config.test_file_path).split("/")[-1] + "_autotune"
+    try:
+        hcp_h.upload_file(custom_config.test_file_path, key, resume=True)
+        hcp_h.download_file(
+            key,
+            custom_config.result_path + "autotuned",
+            resume=True,
+        )
+        assert cmp(
+            custom_config.result_path + "autotuned",
+            custom_config.test_file_path,
+        )
+        assert hcp_h.transfer_config.max_concurrency >= 1
+    finally:
+        hcp_h.transfer_tuner = None
+    hcp_h.delete_object(key)
+
+
+def test_transfer_tuner_throughput_drop(custom_config: CustomConfig) -> None:
+    tuner = TransferTuner(
+        custom_config.hcp_h.endpoint,
+        transfer_config=TransferConfig(max_concurrency=1),
+    )
+    tuner._previous_throughput = 1000  # noqa: SLF001
+    tuner._adjust(10.0)  # noqa: SLF001
+    assert tuner.concurrency == 1
+    tuner.record_error()
+    assert tuner.concurrency == 1
+
+
+def test_set_transfer_limits(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    hcp_h = custom_config.hcp_h
+    key = str(custom_config.test_file_path).split("/")[-1] + "_limited"
+    hcp_h.set_transfer_limits(max_bandwidth=100 * 2**20, max_inflight=2**26)
+    try:
+        assert hcp_h.transfer_limiter.get_limits() == {
+            "MaxBandwidth": 100 * 2**20,
+            "MaxInflight": 2**26,
+        }
+        hcp_h.upload_file(custom_config.test_file_path, key)
+        hcp_h.download_file(key, custom_config.result_path + "limited")
+        assert cmp(
+            custom_config.result_path + "limited",
+            custom_config.test_file_path,
+        )
+        assert hcp_h.transfer_limiter.inflight.in_flight == 0
+    finally:
+        hcp_h.set_transfer_limits(max_bandwidth=0, max_inflight=0)
+    hcp_h.delete_object(key)
+
+
 def test_upload_file_without_mounting(custom_config: CustomConfig) -> None:
     _hcp_h = custom_config.hcp_h
     _without_mounting(_hcp_h, HCPHandler.upload_file)
@@ -180,6 +444,49 @@ def test_upload_nonexistent_file(custom_config: CustomConfig) -> None:
         fail("Test failed")
 
 
+# upload_stream
+def test_upload_stream(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = "streamed_" + str(custom_config.test_file_path).split("/")[-1]
+    with Path(custom_config.test_file_path).open("rb") as local_file:
+        custom_config.hcp_h.upload_stream(
+            iter(lambda: local_file.read(_MB), b""),
+            key,
+        )
+    stat = custom_config.hcp_h.stat(key)
+    assert stat["Size"] == Path(custom_config.test_file_path).stat().st_size
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_upload_stream_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.upload_stream)
+
+
+# abort_multipart_uploads
+def test_abort_multipart_uploads(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = "unfinished_upload"
+    upload_id = custom_config.hcp_h.s3_client.create_multipart_upload(
+        Bucket=custom_config.hcp_h.bucket_name,
+        Key=key,
+    )["UploadId"]
+    assert upload_id in [
+        upload["UploadId"]
+        for upload in custom_config.hcp_h.list_multipart_uploads(key)
+    ]
+    aborted = custom_config.hcp_h.abort_multipart_uploads(key)
+    assert [upload["UploadId"] for upload in aborted] == [upload_id]
+    assert not list(custom_config.hcp_h.list_multipart_uploads(key))
+
+
+def test_abort_multipart_uploads_without_mounting(
+    custom_config: CustomConfig,
+) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.abort_multipart_uploads)
+
+
 # upload_folder
 def test_upload_folder(custom_config: CustomConfig) -> None:
     test_mount_bucket(custom_config)
@@ -192,6 +499,42 @@ def test_upload_folder(custom_config: CustomConfig) -> None:
     custom_config.hcp_h.delete_folder(key)
 
 
+def test_upload_folder_twice(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_folder_path).split("/")[-2] + "/"
+    first_results = custom_config.hcp_h.upload_folder(
+        custom_config.test_folder_path,
+        key,
+    )
+    assert all(
+        result["Status"] == HCPHandler.UploadStatus.UPLOADED
+        for result in first_results
+    )
+    second_results = custom_config.hcp_h.upload_folder(
+        custom_config.test_folder_path,
+        key,
+    )
+    assert all(
+        result["Status"] == HCPHandler.UploadStatus.ALREADY_EXISTS
+        for result in second_results
+    )
+    custom_config.hcp_h.delete_folder(key)
+
+
+def test_upload_folder_with_symlink_loop(
+    custom_config: CustomConfig,
+    tmp_path: Path,
+) -> None:
+    test_mount_bucket(custom_config)
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "file").write_bytes(b"data")
+    (tmp_path / "sub" / "parent").symlink_to(tmp_path, target_is_directory=True)
+    key = "symlink_loop/"
+    results = custom_config.hcp_h.upload_folder(str(tmp_path), key)
+    assert [result["Key"] for result in results] == [key + "sub/file"]
+    custom_config.hcp_h.delete_folder(key)
+
+
 def test_upload_folder_without_mounting(custom_config: CustomConfig) -> None:
     _hcp_h = custom_config.hcp_h
     _without_mounting(_hcp_h, HCPHandler.upload_folder)
@@ -226,6 +569,49 @@ def test_get_file_without_mounting(custom_config: CustomConfig) -> None:
     _without_mounting(_hcp_h, HCPHandler.get_object)
 
 
+# stat
+def test_stat(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1]
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+    )
+    stat = custom_config.hcp_h.stat(key)
+    assert stat["Size"] == Path(custom_config.test_file_path).stat().st_size
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_stat_nonexistent_file(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    try:
+        custom_config.hcp_h.stat("aFileThatDoesNotExist")
+    except ObjectDoesNotExistError:
+        assert True
+    else:  # pragma: no cover
+        fail("Test failed")
+
+
+def test_stat_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.stat)
+
+
+# stat_many
+def test_stat_many(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1]
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+    )
+    stats = custom_config.hcp_h.stat_many([key, "aFileThatDoesNotExist"])
+    assert list(stats) == [key, "aFileThatDoesNotExist"]
+    assert stats[key]
+    assert stats["aFileThatDoesNotExist"] is None
+    custom_config.hcp_h.delete_object(key)
+
+
 # object_exists
 def test_object_exists(custom_config: CustomConfig) -> None:
     test_mount_bucket(custom_config)
@@ -243,6 +629,74 @@ def test_object_exists_without_mounting(custom_config: CustomConfig) -> None:
     _without_mounting(_hcp_h, HCPHandler.object_exists)
 
 
+# open
+def test_open(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1]
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+    )
+    with (
+        Path(custom_config.test_file_path).open("rb") as local_file,
+        custom_config.hcp_h.open(key, block_size=_MB) as hcp_file,
+    ):
+        assert hcp_file.read(100) == local_file.read(100)
+        for offset in [5 * _MB - 1, 0, 3 * _MB + 17]:
+            local_file.seek(offset)
+            hcp_file.seek(offset)
+            assert hcp_file.read(2 * _MB) == local_file.read(2 * _MB)
+        local_file.seek(-100, SEEK_END)
+        hcp_file.seek(-100, SEEK_END)
+        assert hcp_file.read() == local_file.read()
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_open_write(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = "written_" + str(custom_config.test_file_path).split("/")[-1]
+    with (
+        Path(custom_config.test_file_path).open("rb") as local_file,
+        custom_config.hcp_h.open(key, "wb", part_size=5 * _MB) as hcp_file,
+    ):
+        while chunk := local_file.read(3 * _MB):
+            hcp_file.write(chunk)
+    result_file = custom_config.result_path + key
+    custom_config.hcp_h.download_file(key, result_file)
+    assert cmp(result_file, custom_config.test_file_path, shallow=False)
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_open_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.open)
+
+
+# stream_object
+def test_stream_object(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1]
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+    )
+    local_bytes = Path(custom_config.test_file_path).read_bytes()
+    streamed_bytes = b"".join(
+        custom_config.hcp_h.stream_object(key, part_size=8 * _MB),
+    )
+    assert streamed_bytes == local_bytes
+    streamed_range = b"".join(
+        custom_config.hcp_h.stream_object(key, 100, 3 * _MB, part_size=_MB),
+    )
+    assert streamed_range == local_bytes[100 : 3 * _MB + 1]
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_stream_object_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.stream_object)
+
+
 # download_file
 def test_download_file(custom_config: CustomConfig) -> None:
     test_mount_bucket(custom_config)
@@ -277,6 +731,102 @@ def test_download_file(custom_config: CustomConfig) -> None:
     custom_config.hcp_h.delete_object(key)
 
 
+def test_download_file_resume(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1]
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+    )
+    local_file_path = custom_config.result_path + "resumed_file"
+
+    # A leftover partial file from another version of the object
+    Path(local_file_path + ".part").write_bytes(b"stale")
+    Path(local_file_path + ".part.checkpoint").write_text(
+        dumps({"Key": key, "ETag": "stale", "Size": 5, "PartSize": 5})
+        + "\n0\n",
+    )
+
+    custom_config.hcp_h.download_file(key, local_file_path, resume=True)
+    assert cmp(local_file_path, custom_config.test_file_path)
+    assert not Path(local_file_path + ".part").exists()
+    assert not Path(local_file_path + ".part.checkpoint").exists()
+
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_download_file_parallel(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1]
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+    )
+    local_file_path = custom_config.result_path + "parallel_file"
+    custom_config.hcp_h.download_file(
+        key,
+        local_file_path,
+        parallel=True,
+        part_size=8 * _MB,
+        max_workers=4,
+    )
+    assert cmp(local_file_path, custom_config.test_file_path, shallow=False)
+    assert not Path(local_file_path + ".part").exists()
+
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_download_file_compressed(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1] + ".gz"
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+        compression=HCPHandler.Compression.GZIP,
+    )
+    metadata = custom_config.hcp_h.stat(key)["Metadata"]
+    assert metadata["ngpiris-compression"] == "gzip"
+    assert int(metadata["ngpiris-uncompressed-size"]) == (
+        Path(custom_config.test_file_path).stat().st_size
+    )
+
+    local_file_path = custom_config.result_path + "decompressed_file"
+    custom_config.hcp_h.download_file(key, local_file_path)
+    assert cmp(local_file_path, custom_config.test_file_path, shallow=False)
+    streamed_bytes = b"".join(
+        custom_config.hcp_h.stream_object(key, decompress=True),
+    )
+    assert streamed_bytes == Path(custom_config.test_file_path).read_bytes()
+
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_download_file_verify(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_file_path).split("/")[-1] + "_verified"
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key,
+        verify=True,
+    )
+
+    local_file_path = custom_config.result_path + "verified_file"
+    custom_config.hcp_h.download_file(
+        key,
+        local_file_path,
+        verify=True,
+        manifest=True,
+    )
+    assert cmp(local_file_path, custom_config.test_file_path, shallow=False)
+    manifest = loads(Path(local_file_path + MANIFEST_SUFFIX).read_text())
+    assert manifest["Key"] == key
+    assert manifest["SHA256"] == (
+        sha256(Path(custom_config.test_file_path).read_bytes()).hexdigest()
+    )
+
+    custom_config.hcp_h.delete_object(key)
+
+
 def test_download_file_without_mounting(custom_config: CustomConfig) -> None:
     _hcp_h = custom_config.hcp_h
     _without_mounting(_hcp_h, HCPHandler.download_file)
@@ -310,12 +860,39 @@ def test_download_folder(custom_config: CustomConfig) -> None:
     custom_config.hcp_h.delete_folder(key)
 
 
+def test_download_folder_with_download_limit(
+    custom_config: CustomConfig,
+) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_folder_path).split("/")[-2] + "/"
+    custom_config.hcp_h.upload_folder(
+        custom_config.test_folder_path,
+        key,
+    )
+    try:
+        custom_config.hcp_h.download_folder(
+            key,
+            custom_config.result_path,
+            use_download_limit=True,
+            download_limit_in_bytes=Byte(1),
+            max_workers=2,
+        )
+    except DownloadLimitReachedError:
+        assert True
+    else:  # pragma: no cover
+        fail("Test failed")
+    finally:
+        custom_config.hcp_h.delete_folder(key)
+
+
 # delete_objects
 def test_delete_nonexistent_files(custom_config: CustomConfig) -> None:
     test_mount_bucket(custom_config)
-    custom_config.hcp_h.delete_objects(
+    result = custom_config.hcp_h.delete_objects(
         ["some", "files", "that", "does", "not", "exist"],
     )
+    assert result["ErrorCount"] == len(result["Errors"])
+    assert result["DeletedCount"] + result["ErrorCount"] == 6
 
 
 # delete_object
@@ -361,6 +938,18 @@ def test_delete_folder_with_sub_directory(custom_config: CustomConfig) -> None:
     custom_config.hcp_h.delete_folder(SUBDIR)
 
 
+def test_delete_folder_recursive(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        SUBDIR + "/another_dir/a_new_file",
+    )
+    result = custom_config.hcp_h.delete_folder(SUBDIR, recursive=True)
+    assert result["ErrorCount"] == 0
+    assert SUBDIR + "/another_dir/a_new_file" in result["Deleted"]
+    assert not custom_config.hcp_h.object_exists(SUBDIR + "/")
+
+
 def test_delete_folder_without_mounting(custom_config: CustomConfig) -> None:
     _hcp_h = custom_config.hcp_h
     _without_mounting(_hcp_h, HCPHandler.delete_folder)
@@ -434,5 +1023,264 @@ def test_move_file_to_other_bucket(custom_config: CustomConfig) -> None:
     custom_config.hcp_h.delete_bucket("TempBucket")
 
 
+# copy_folder
+def test_copy_folder(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_folder_path).split("/")[-2] + "/"
+    custom_config.hcp_h.upload_folder(
+        custom_config.test_folder_path,
+        key,
+    )
+    results = custom_config.hcp_h.copy_folder(key, "copied_folder/")
+    assert all(
+        result["Status"] == HCPHandler.CopyStatus.COPIED for result in results
+    )
+    assert len(
+        list(custom_config.hcp_h.list_objects_parallel("copied_folder/")),
+    ) == len(list(custom_config.hcp_h.list_objects_parallel(key)))
+    custom_config.hcp_h.delete_folder(key, recursive=True)
+    custom_config.hcp_h.delete_folder("copied_folder/", recursive=True)
+
+
+def test_copy_folder_onto_itself(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    try:
+        custom_config.hcp_h.copy_folder(SUBDIR, SUBDIR + "/")
+    except SourceIsDestinationError:
+        assert True
+    else:  # pragma: no cover
+        fail("Test failed")
+
+
+def test_copy_folder_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.copy_folder)
+
+
+# move_folder
+def test_move_folder(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = str(custom_config.test_folder_path).split("/")[-2] + "/"
+    custom_config.hcp_h.upload_folder(
+        custom_config.test_folder_path,
+        key,
+    )
+    results = custom_config.hcp_h.move_folder(key, "moved_folder/")
+    assert all(
+        result["Status"] == HCPHandler.CopyStatus.MOVED for result in results
+    )
+    assert not list(custom_config.hcp_h.list_objects_parallel(key))
+    custom_config.hcp_h.delete_folder("moved_folder/", recursive=True)
+
+
+def test_move_folder_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.move_folder)
+
+
+# ---------------------------- Sync methods tests ----------------------------
+# sync
+def test_sync_upload(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = "synced_folder/"
+    first_plan = custom_config.hcp_h.sync(custom_config.test_folder_path, key)
+    assert first_plan
+    assert all(
+        entry["Action"] == HCPHandler.SyncAction.UPLOAD and not entry["Error"]
+        for entry in first_plan
+    )
+    assert not custom_config.hcp_h.sync(custom_config.test_folder_path, key)
+    assert not custom_config.hcp_h.sync(
+        custom_config.test_folder_path,
+        key,
+        checksum=True,
+    )
+    custom_config.hcp_h.delete_folder(key, recursive=True)
+
+
+def test_sync_download(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = "synced_folder/"
+    local_folder_path = custom_config.result_path + "synced_folder/"
+    custom_config.hcp_h.sync(custom_config.test_folder_path, key)
+    plan = custom_config.hcp_h.sync(
+        local_folder_path,
+        key,
+        direction=HCPHandler.SyncDirection.DOWNLOAD,
+    )
+    assert all(
+        entry["Action"] == HCPHandler.SyncAction.DOWNLOAD and not entry["Error"]
+        for entry in plan
+    )
+    assert not custom_config.hcp_h.sync(
+        local_folder_path,
+        key,
+        direction=HCPHandler.SyncDirection.DOWNLOAD,
+    )
+    custom_config.hcp_h.delete_folder(key, recursive=True)
+
+
+def test_sync_dry_run(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = "synced_folder/"
+    plan = custom_config.hcp_h.sync(
+        custom_config.test_folder_path,
+        key,
+        dry_run=True,
+    )
+    assert plan
+    assert not custom_config.hcp_h.object_exists(plan[0]["Key"])
+
+
+def test_sync_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.sync)
+
+
+# ---------------------------- Verify methods tests ----------------------------
+# verify
+def test_verify(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = "verified_folder/"
+    custom_config.hcp_h.sync(custom_config.test_folder_path, key)
+    results = custom_config.hcp_h.verify(custom_config.test_folder_path, key)
+    assert results
+    assert all(
+        result["Status"] == HCPHandler.VerifyStatus.MATCHED
+        for result in results
+    )
+
+    custom_config.hcp_h.upload_file(
+        custom_config.test_file_path,
+        key + "not_downloaded",
+    )
+    results = custom_config.hcp_h.verify(custom_config.test_folder_path, key)
+    assert [
+        result["Key"]
+        for result in results
+        if result["Status"] == HCPHandler.VerifyStatus.MISSING
+    ] == [key + "not_downloaded"]
+    custom_config.hcp_h.delete_folder(key, recursive=True)
+
+
+def test_verify_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.verify)
+
+
+# ---------------------------- Index methods tests ----------------------------
+# refresh_index
+def test_refresh_index(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    custom_config.hcp_h.bucket_index = BucketIndex(
+        custom_config.result_path + "index.db",
+    )
+    custom_config.hcp_h.refresh_index()
+    assert custom_config.hcp_h.refresh_index() == {
+        "Added": 0,
+        "Changed": 0,
+        "Removed": 0,
+    }
+    assert list(custom_config.hcp_h.list_objects(use_index=True)) == list(
+        custom_config.hcp_h.list_objects(),
+    )
+
+    key = SUBDIR + "/indexed_file"
+    custom_config.hcp_h.upload_file(custom_config.test_file_path, key)
+    assert custom_config.hcp_h.get_folder_size(SUBDIR + "/") == {
+        "Size": Path(custom_config.test_file_path).stat().st_size,
+        "ObjectCount": 1,
+    }
+    assert SUBDIR + "/" in custom_config.hcp_h.get_subfolder_sizes()
+
+    custom_config.hcp_h.delete_object(key)
+    assert custom_config.hcp_h.get_folder_size(SUBDIR + "/")["ObjectCount"] == 0
+    custom_config.hcp_h.bucket_index = None
+
+
+def test_refresh_index_without_index(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    try:
+        custom_config.hcp_h.refresh_index()
+    except NoBucketIndexError:
+        assert True
+    else:  # pragma: no cover
+        fail("Test failed")
+
+
+def test_refresh_index_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.refresh_index)
+
+
 # ---------------------------- Search methods tests ----------------------------
-# N/A
+# search_in_bucket
+def test_search_in_bucket(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = SUBDIR + "/a_searchable_file"
+    custom_config.hcp_h.upload_file(custom_config.test_file_path, key)
+    keys = [
+        hcp_object["Key"]
+        for hcp_object in custom_config.hcp_h.search_in_bucket(
+            "SEARCHABLE",
+            path_key=SUBDIR + "/",
+        )
+    ]
+    assert keys == [key]
+    assert not list(
+        custom_config.hcp_h.search_in_bucket(
+            "SEARCHABLE",
+            case_sensitive=True,
+            path_key=SUBDIR + "/",
+        ),
+    )
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_search_in_bucket_with_substring_index(
+    custom_config: CustomConfig,
+) -> None:
+    test_mount_bucket(custom_config)
+    key = SUBDIR + "/a_searchable_file"
+    custom_config.hcp_h.upload_file(custom_config.test_file_path, key)
+    custom_config.hcp_h.bucket_index = BucketIndex(
+        custom_config.result_path + "index.db",
+    )
+    custom_config.hcp_h.refresh_index(substring_index=True)
+    assert list(
+        custom_config.hcp_h.search_in_bucket("SEARCHABLE", use_index=True),
+    ) == list(custom_config.hcp_h.search_in_bucket("SEARCHABLE"))
+    custom_config.hcp_h.delete_object(key)
+    assert not list(
+        custom_config.hcp_h.search_in_bucket("SEARCHABLE", use_index=True),
+    )
+    custom_config.hcp_h.bucket_index = None
+
+
+def test_search_in_bucket_without_mounting(custom_config: CustomConfig) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.search_in_bucket)
+
+
+# fuzzy_search_in_bucket
+def test_fuzzy_search_in_bucket(custom_config: CustomConfig) -> None:
+    test_mount_bucket(custom_config)
+    key = SUBDIR + "/a_searchable_file"
+    custom_config.hcp_h.upload_file(custom_config.test_file_path, key)
+    matches = list(
+        custom_config.hcp_h.fuzzy_search_in_bucket(
+            "a_serchable_file",
+            path_key=SUBDIR + "/",
+            top_k=1,
+        ),
+    )
+    assert [match["Key"] for match in matches] == [key]
+    assert matches[0]["Score"] >= 80  # noqa: PLR2004
+    custom_config.hcp_h.delete_object(key)
+
+
+def test_fuzzy_search_in_bucket_without_mounting(
+    custom_config: CustomConfig,
+) -> None:
+    _hcp_h = custom_config.hcp_h
+    _without_mounting(_hcp_h, HCPHandler.fuzzy_search_in_bucket)
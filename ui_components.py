@@ -160,10 +160,12 @@ class FileBrowserTree(QTreeWidget):
             
         return selected_keys
 
-    def filter_items(self, text):
+    def filter_items(self, text, matching_keys=None):
         """ 
         Hides nodes that don't match the text. 
         Shows parents if a child matches.
+        If `matching_keys` is given (from the index search), files match by
+        being among them instead of by their name.
         """
         search_text = text.lower()
         
@@ -177,8 +179,12 @@ class FileBrowserTree(QTreeWidget):
                     child_matched = True
 
             # Check self
-            name = item.text(0).lower()
-            match = search_text in name
+            raw_key = item.data(0, Qt.ItemDataRole.UserRole)
+            if matching_keys is not None and raw_key:
+                match = raw_key in matching_keys
+            else:
+                name = item.text(0).lower()
+                match = search_text in name
             
             # Logic: Show if (Self Matches OR Child Matches)
             should_show = match or child_matched